@@ -5,7 +5,7 @@ from sqlalchemy.dialects import postgresql
 
 # Revision identifiers, used by Alembic.
 revision = "791a0d35baa4"
-down_revision = "3aa4f5c402ac"
+down_revision = "8c1f5a2e7b40"
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,432 @@
+"""Create the model tables 0001 left to create_all
+
+Revision ID: 8c1f5a2e7b40
+Revises: 3aa4f5c402ac
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1f5a2e7b40'
+down_revision = '3aa4f5c402ac'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 0001 only created clubs, platform_users, club_members, club_roles and
+    # membership_tiers; everything else came from Base.metadata.create_all.
+    # These are the remaining tables as the models defined them then, so a
+    # fresh database can be built with `alembic upgrade head` alone. Later
+    # revisions add to them. IF NOT EXISTS leaves databases that already got
+    # them from create_all untouched.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            user_id UUID,
+            user_type VARCHAR(50),
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100),
+            resource_id UUID,
+            details JSON,
+            ip_address INET,
+            user_agent TEXT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS booking_services (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            duration_minutes INTEGER NOT NULL,
+            price DECIMAL(10, 2),
+            is_active BOOLEAN,
+            max_advance_days INTEGER,
+            min_advance_hours INTEGER,
+            requires_membership_tier VARCHAR(50),
+            max_participants INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS chat_channels (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            channel_type VARCHAR(50),
+            required_tier VARCHAR(50),
+            is_moderated BOOLEAN,
+            allow_file_uploads BOOLEAN,
+            is_active BOOLEAN,
+            sort_order INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS club_analytics (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            date DATE NOT NULL,
+            metric_name VARCHAR(100) NOT NULL,
+            metric_value DECIMAL(15, 4) NOT NULL,
+            dimensions JSON,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS donations (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            donor_name VARCHAR(255),
+            donor_email VARCHAR(255),
+            donor_message TEXT,
+            amount DECIMAL(10, 2) NOT NULL,
+            is_anonymous BOOLEAN,
+            show_amount BOOLEAN,
+            stripe_payment_intent_id VARCHAR(255),
+            payment_status VARCHAR(50),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS feature_flags (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            flag_name VARCHAR(100) NOT NULL,
+            is_enabled BOOLEAN,
+            rollout_percentage INTEGER,
+            target_tiers JSON,
+            target_members JSON,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS notifications (
+            id UUID NOT NULL,
+            recipient_type VARCHAR(50) NOT NULL,
+            recipient_id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            type VARCHAR(100) NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            action_url VARCHAR(500),
+            action_text VARCHAR(100),
+            is_read BOOLEAN,
+            read_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS platform_subscriptions (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            plan_name VARCHAR(50) NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            billing_cycle VARCHAR(20),
+            status VARCHAR(50),
+            current_period_start TIMESTAMP WITH TIME ZONE NOT NULL,
+            current_period_end TIMESTAMP WITH TIME ZONE NOT NULL,
+            stripe_subscription_id VARCHAR(255),
+            stripe_customer_id VARCHAR(255),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(user_id) REFERENCES platform_users (id) ON DELETE CASCADE,
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS platform_usage (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            api_calls INTEGER,
+            ai_tokens_used INTEGER,
+            storage_bytes BIGINT,
+            bandwidth_bytes BIGINT,
+            date DATE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ai_conversations (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            member_id UUID NOT NULL,
+            context_type VARCHAR(50),
+            title VARCHAR(255),
+            model VARCHAR(50),
+            temperature DECIMAL(3, 2),
+            max_tokens INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS booking_slots (
+            id UUID NOT NULL,
+            service_id UUID NOT NULL,
+            start_time TIMESTAMP WITH TIME ZONE NOT NULL,
+            end_time TIMESTAMP WITH TIME ZONE NOT NULL,
+            is_available BOOLEAN,
+            max_capacity INTEGER,
+            current_bookings INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(service_id) REFERENCES booking_services (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS chat_messages (
+            id UUID NOT NULL,
+            channel_id UUID NOT NULL,
+            member_id UUID NOT NULL,
+            content TEXT NOT NULL,
+            message_type VARCHAR(50),
+            file_url VARCHAR(500),
+            file_name VARCHAR(255),
+            file_size INTEGER,
+            is_edited BOOLEAN,
+            edited_at TIMESTAMP WITH TIME ZONE,
+            is_deleted BOOLEAN,
+            deleted_at TIMESTAMP WITH TIME ZONE,
+            reply_to_message_id UUID,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(channel_id) REFERENCES chat_channels (id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE CASCADE,
+            FOREIGN KEY(reply_to_message_id) REFERENCES chat_messages (id)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS content_pages (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            created_by UUID,
+            title VARCHAR(255) NOT NULL,
+            slug VARCHAR(255) NOT NULL,
+            content TEXT NOT NULL,
+            excerpt TEXT,
+            visibility VARCHAR(50),
+            required_tier VARCHAR(50),
+            meta_title VARCHAR(255),
+            meta_description TEXT,
+            status VARCHAR(50),
+            published_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE,
+            FOREIGN KEY(created_by) REFERENCES club_roles (id) ON DELETE SET NULL
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS media_files (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            uploaded_by UUID,
+            filename VARCHAR(255) NOT NULL,
+            original_filename VARCHAR(255) NOT NULL,
+            file_type VARCHAR(100) NOT NULL,
+            file_size INTEGER NOT NULL,
+            storage_key VARCHAR(500) NOT NULL,
+            storage_url VARCHAR(500) NOT NULL,
+            storage_bucket VARCHAR(100),
+            visibility VARCHAR(50),
+            required_tier VARCHAR(50),
+            title VARCHAR(255),
+            description TEXT,
+            tags JSON,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE,
+            FOREIGN KEY(uploaded_by) REFERENCES club_roles (id) ON DELETE SET NULL
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS member_channel_access (
+            id UUID NOT NULL,
+            member_id UUID NOT NULL,
+            channel_id UUID NOT NULL,
+            access_type VARCHAR(50),
+            granted_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE CASCADE,
+            FOREIGN KEY(channel_id) REFERENCES chat_channels (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS member_subscriptions (
+            id UUID NOT NULL,
+            member_id UUID NOT NULL,
+            tier_id UUID NOT NULL,
+            status VARCHAR(50),
+            billing_cycle VARCHAR(20),
+            amount DECIMAL(10, 2) NOT NULL,
+            starts_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            ends_at TIMESTAMP WITH TIME ZONE,
+            cancelled_at TIMESTAMP WITH TIME ZONE,
+            trial_ends_at TIMESTAMP WITH TIME ZONE,
+            stripe_subscription_id VARCHAR(255),
+            stripe_customer_id VARCHAR(255),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE CASCADE,
+            FOREIGN KEY(tier_id) REFERENCES membership_tiers (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ai_messages (
+            id UUID NOT NULL,
+            conversation_id UUID NOT NULL,
+            role VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            prompt_tokens INTEGER,
+            completion_tokens INTEGER,
+            total_tokens INTEGER,
+            cost_usd DECIMAL(10, 6),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(conversation_id) REFERENCES ai_conversations (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bookings (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            member_id UUID NOT NULL,
+            service_id UUID NOT NULL,
+            slot_id UUID NOT NULL,
+            status VARCHAR(50),
+            notes TEXT,
+            amount DECIMAL(10, 2) NOT NULL,
+            payment_status VARCHAR(50),
+            stripe_payment_intent_id VARCHAR(255),
+            booked_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            cancelled_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE CASCADE,
+            FOREIGN KEY(service_id) REFERENCES booking_services (id) ON DELETE CASCADE,
+            FOREIGN KEY(slot_id) REFERENCES booking_slots (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS content_media (
+            id UUID NOT NULL,
+            content_id UUID NOT NULL,
+            media_id UUID NOT NULL,
+            sort_order INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(content_id) REFERENCES content_pages (id) ON DELETE CASCADE,
+            FOREIGN KEY(media_id) REFERENCES media_files (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS message_reactions (
+            id UUID NOT NULL,
+            message_id UUID NOT NULL,
+            member_id UUID NOT NULL,
+            emoji VARCHAR(10) NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(message_id) REFERENCES chat_messages (id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS payments (
+            id UUID NOT NULL,
+            club_id UUID NOT NULL,
+            member_id UUID,
+            amount DECIMAL(10, 2) NOT NULL,
+            currency VARCHAR(3),
+            payment_type VARCHAR(50) NOT NULL,
+            subscription_id UUID,
+            booking_id UUID,
+            stripe_payment_intent_id VARCHAR(255),
+            stripe_charge_id VARCHAR(255),
+            stripe_customer_id VARCHAR(255),
+            status VARCHAR(50) NOT NULL,
+            failure_reason TEXT,
+            platform_fee_amount DECIMAL(10, 2),
+            club_earnings DECIMAL(10, 2),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(club_id) REFERENCES clubs (id) ON DELETE CASCADE,
+            FOREIGN KEY(member_id) REFERENCES club_members (id) ON DELETE SET NULL,
+            FOREIGN KEY(subscription_id) REFERENCES member_subscriptions (id) ON DELETE SET NULL,
+            FOREIGN KEY(booking_id) REFERENCES bookings (id) ON DELETE SET NULL
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS payments")
+    op.execute("DROP TABLE IF EXISTS message_reactions")
+    op.execute("DROP TABLE IF EXISTS content_media")
+    op.execute("DROP TABLE IF EXISTS bookings")
+    op.execute("DROP TABLE IF EXISTS ai_messages")
+    op.execute("DROP TABLE IF EXISTS member_subscriptions")
+    op.execute("DROP TABLE IF EXISTS member_channel_access")
+    op.execute("DROP TABLE IF EXISTS media_files")
+    op.execute("DROP TABLE IF EXISTS content_pages")
+    op.execute("DROP TABLE IF EXISTS chat_messages")
+    op.execute("DROP TABLE IF EXISTS booking_slots")
+    op.execute("DROP TABLE IF EXISTS ai_conversations")
+    op.execute("DROP TABLE IF EXISTS platform_usage")
+    op.execute("DROP TABLE IF EXISTS platform_subscriptions")
+    op.execute("DROP TABLE IF EXISTS notifications")
+    op.execute("DROP TABLE IF EXISTS feature_flags")
+    op.execute("DROP TABLE IF EXISTS donations")
+    op.execute("DROP TABLE IF EXISTS club_analytics")
+    op.execute("DROP TABLE IF EXISTS chat_channels")
+    op.execute("DROP TABLE IF EXISTS booking_services")
+    op.execute("DROP TABLE IF EXISTS audit_logs")
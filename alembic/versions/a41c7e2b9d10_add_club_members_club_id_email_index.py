@@ -0,0 +1,64 @@
+"""Add unique (club_id, email) index to club_members
+
+Revision ID: a41c7e2b9d10
+Revises: 791a0d35baa4
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c7e2b9d10'
+down_revision = '791a0d35baa4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Emails are stored lowercased from now on (imports, /members/join, checkouts).
+    # Members that already exist twice under different capitalization are merged
+    # into the oldest one first - every foreign key to club_members is re-pointed
+    # at it - or building the unique index below would fail.
+    op.execute("""
+        CREATE TEMP TABLE club_member_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY club_id, lower(email) ORDER BY created_at, id
+            ) AS keep_id
+            FROM club_members
+            WHERE email IS NOT NULL
+        ) members
+        WHERE id <> keep_id
+    """)
+    op.execute("""
+        DO $$
+        DECLARE
+            fk record;
+        BEGIN
+            FOR fk IN
+                SELECT c.conrelid::regclass AS tbl, a.attname AS col
+                FROM pg_constraint c
+                JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+                WHERE c.contype = 'f'
+                  AND c.confrelid = 'club_members'::regclass
+                  AND array_length(c.conkey, 1) = 1
+            LOOP
+                EXECUTE format(
+                    'UPDATE %s t SET %I = d.keep_id FROM club_member_duplicates d WHERE t.%I = d.id',
+                    fk.tbl, fk.col, fk.col
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute("DELETE FROM club_members m USING club_member_duplicates d WHERE m.id = d.id")
+    op.execute("UPDATE club_members SET email = lower(email) WHERE email <> lower(email)")
+
+    # Conflict target for bulk member imports (INSERT ... ON CONFLICT (club_id, email)).
+    # NULL emails stay allowed and never conflict with each other.
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_club_members_club_id_email ON club_members (club_id, email)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_club_members_club_id_email")
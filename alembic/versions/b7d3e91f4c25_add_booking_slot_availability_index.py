@@ -0,0 +1,38 @@
+"""Add booking slot availability index and capacity check
+
+Revision ID: b7d3e91f4c25
+Revises: a41c7e2b9d10
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e91f4c25'
+down_revision = 'a41c7e2b9d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Range scans for "open slots of service X between two dates"
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_booking_slots_service_id_start_time "
+        "ON booking_slots (service_id, start_time)"
+    )
+    # NOT VALID: enforced for new writes without scanning (or failing on) existing rows
+    op.execute("""
+        DO $$
+        BEGIN
+            ALTER TABLE booking_slots ADD CONSTRAINT ck_booking_slots_capacity
+                CHECK (current_bookings >= 0 AND current_bookings <= max_capacity) NOT VALID;
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE booking_slots DROP CONSTRAINT IF EXISTS ck_booking_slots_capacity")
+    op.execute("DROP INDEX IF EXISTS ix_booking_slots_service_id_start_time")
@@ -0,0 +1,62 @@
+"""Add recurring availability rules and exceptions
+
+Revision ID: c2e8a4f61d37
+Revises: b7d3e91f4c25
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e8a4f61d37'
+down_revision = 'b7d3e91f4c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS availability_rules (
+            id UUID PRIMARY KEY,
+            service_id UUID NOT NULL REFERENCES booking_services (id) ON DELETE CASCADE,
+            weekday SMALLINT NOT NULL,
+            start_time TIME WITHOUT TIME ZONE NOT NULL,
+            end_time TIME WITHOUT TIME ZONE NOT NULL,
+            timezone VARCHAR(64) NOT NULL DEFAULT 'UTC',
+            valid_from DATE,
+            valid_until DATE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT ck_availability_rules_weekday CHECK (weekday BETWEEN 0 AND 6),
+            CONSTRAINT ck_availability_rules_hours CHECK (end_time > start_time)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_availability_rules_service_id "
+        "ON availability_rules (service_id)"
+    )
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS availability_exceptions (
+            id UUID PRIMARY KEY,
+            service_id UUID NOT NULL REFERENCES booking_services (id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            start_time TIME WITHOUT TIME ZONE,
+            end_time TIME WITHOUT TIME ZONE,
+            timezone VARCHAR(64) NOT NULL DEFAULT 'UTC',
+            is_available BOOLEAN NOT NULL DEFAULT false,
+            reason VARCHAR(255),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_availability_exceptions_service_id_date "
+        "ON availability_exceptions (service_id, date)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS availability_exceptions")
+    op.execute("DROP TABLE IF EXISTS availability_rules")
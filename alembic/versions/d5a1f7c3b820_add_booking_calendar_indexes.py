@@ -0,0 +1,32 @@
+"""Add GiST time-range index on booking slots and bookings.slot_id index
+
+Revision ID: d5a1f7c3b820
+Revises: c2e8a4f61d37
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1f7c3b820'
+down_revision = 'c2e8a4f61d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Calendar windows: tstzrange(start_time, end_time) && <visible range>.
+    # The expression must match CalendarService's query exactly.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_booking_slots_time_range "
+        "ON booking_slots USING gist (tstzrange(start_time, end_time, '[)'))"
+    )
+    # Slots found by the range scan are joined to their bookings
+    op.execute("CREATE INDEX IF NOT EXISTS ix_bookings_slot_id ON bookings (slot_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_bookings_slot_id")
+    op.execute("DROP INDEX IF EXISTS ix_booking_slots_time_range")
@@ -0,0 +1,51 @@
+"""Add slot holds for open checkout sessions
+
+Revision ID: e9b4c6d2a715
+Revises: d5a1f7c3b820
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4c6d2a715'
+down_revision = 'd5a1f7c3b820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS slot_holds (
+            id UUID PRIMARY KEY,
+            slot_id UUID NOT NULL REFERENCES booking_slots (id) ON DELETE CASCADE,
+            service_id UUID NOT NULL REFERENCES booking_services (id) ON DELETE CASCADE,
+            club_id UUID NOT NULL REFERENCES clubs (id) ON DELETE CASCADE,
+            member_id UUID NOT NULL REFERENCES club_members (id) ON DELETE CASCADE,
+            seats INTEGER NOT NULL DEFAULT 1,
+            amount NUMERIC(10, 2) NOT NULL,
+            notes TEXT,
+            checkout_session_id VARCHAR(255),
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_slot_holds_expires_at ON slot_holds (expires_at)")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_slot_holds_checkout_session_id "
+        "ON slot_holds (checkout_session_id)"
+    )
+
+
+def downgrade() -> None:
+    # Open holds' seats are counted in current_bookings; give them back first
+    op.execute("""
+        UPDATE booking_slots s
+        SET current_bookings = GREATEST(s.current_bookings - h.seats, 0)
+        FROM (SELECT slot_id, sum(seats) AS seats FROM slot_holds GROUP BY slot_id) h
+        WHERE s.id = h.slot_id
+    """)
+    op.execute("DROP TABLE IF EXISTS slot_holds")
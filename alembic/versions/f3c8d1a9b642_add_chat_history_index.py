@@ -0,0 +1,31 @@
+"""Add keyset index for chat history
+
+Revision ID: f3c8d1a9b642
+Revises: e9b4c6d2a715
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8d1a9b642'
+down_revision = 'e9b4c6d2a715'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ChatService.history: WHERE channel_id = ? AND is_deleted = false
+    # AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT n
+    # is a backward range scan of this index, however deep the cursor.
+    # The predicate must match the query's is_deleted filter.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_chat_messages_channel_id_created_at_id "
+        "ON chat_messages (channel_id, created_at, id) WHERE is_deleted = false"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chat_messages_channel_id_created_at_id")
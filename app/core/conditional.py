@@ -0,0 +1,17 @@
+from email.utils import parsedate_to_datetime
+from typing import Iterable
+
+
+def etag_matches(if_none_match: str, etags: Iterable[str]) -> bool:
+    """Weak comparison of an If-None-Match header against our current ETags (RFC 9110 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not candidates.isdisjoint(etag.removeprefix("W/") for etag in etags)
+
+
+def not_modified_since(if_modified_since: str, last_modified_ts: float) -> bool:
+    try:
+        return parsedate_to_datetime(if_modified_since).timestamp() >= int(last_modified_ts)
+    except (TypeError, ValueError):
+        return False
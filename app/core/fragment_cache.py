@@ -0,0 +1,71 @@
+from markupsafe import Markup
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.templates import templates
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentCache:
+    """Per-process cache of rendered template fragments, keyed per club.
+
+    Each club has a write version that callers bump after changing data a
+    fragment shows (new member, import, booking). Fragment keys include that
+    version plus whatever the caller passes (typically ``club.updated_at``),
+    so a bump makes old entries unreachable instead of having to find them.
+    The TTL bounds how long another worker can serve a fragment after a write
+    it didn't see.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 10000):
+        self.name = name
+        self._fragments = TTLCache(name, ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._versions: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, club_id: Hashable) -> int:
+        return self._versions.get(str(club_id), 0)
+
+    def bump(self, club_id: Hashable) -> None:
+        """Invalidate every fragment for this club in this worker"""
+        club_id = str(club_id)
+        self._versions[club_id] = self._versions.get(club_id, 0) + 1
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self._versions.clear()
+
+    async def render(
+        self,
+        club_id: Hashable,
+        fragment: str,
+        template_name: str,
+        build_context: Callable[[], Awaitable[Dict[str, Any]]],
+        version: Tuple = (),
+    ) -> Markup:
+        """Return the rendered fragment, calling build_context only on a miss"""
+        key = (str(club_id), fragment, self.version(club_id), *version)
+        html = self._fragments.get(key)
+        if html is not None:
+            self.hits += 1
+            return html
+
+        self.misses += 1
+        context = await build_context()
+        html = Markup(templates.env.get_template(template_name).render(context))
+        self._fragments.set(key, html)
+        return html
+
+
+# Slow-changing panels of the owner dashboard (club_dashboard.html)
+dashboard_fragments = FragmentCache("dashboard_fragments", ttl_seconds=settings.DASHBOARD_FRAGMENT_CACHE_TTL)
+
+# A club edit, member change or booking in any worker invalidates that club's panels everywhere
+invalidation_bus.subscribe("club", lambda data: dashboard_fragments.bump(data["club_id"]))
+invalidation_bus.subscribe("club_members", lambda data: dashboard_fragments.bump(data["club_id"]))
+invalidation_bus.subscribe("bookings", lambda data: dashboard_fragments.bump(data["club_id"]))
+invalidation_bus.on_reset(dashboard_fragments.clear)
@@ -0,0 +1,203 @@
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker, so it can skip its own messages (already applied locally)
+PROCESS_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+class PostgresTransport:
+    """LISTEN/NOTIFY on a dedicated asyncpg connection (outside the SQLAlchemy pool)"""
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://")
+        self.channel = channel
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self, on_message: Callable[[str], None]) -> None:
+        import asyncpg
+
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.add_listener(self.channel, lambda conn, pid, channel, payload: on_message(payload))
+
+    async def wait_closed(self) -> None:
+        while self._conn is not None and not self._conn.is_closed():
+            await asyncio.sleep(1)
+
+    async def publish(self, payload: str) -> None:
+        async with self._lock:
+            await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class RedisTransport:
+    """Redis pub/sub, for deployments that already run Redis"""
+
+    name = "redis"
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        self._client = None
+        self._pubsub = None
+
+    async def connect(self, on_message: Callable[[str], None]) -> None:
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(self.url)
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._on_message = on_message
+
+    async def wait_closed(self) -> None:
+        async for message in self._pubsub.listen():
+            if message["type"] == "message":
+                self._on_message(message["data"].decode())
+
+    async def publish(self, payload: str) -> None:
+        await self._client.publish(self.channel, payload)
+
+    async def close(self) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class InvalidationBus:
+    """Fans cache invalidations out to every worker.
+
+    Caches subscribe a handler per topic ("club", "club_members", ...).
+    Writers call ``publish`` after committing: handlers run in this worker
+    straight away and the message goes out over the transport, where every
+    other worker's listener runs the same handlers. If the listener loses its
+    connection, messages may have been missed, so reset handlers (clearing
+    whole caches) run once it reconnects.
+
+    Other cross-worker fan-outs (chat) get their own instance on their own
+    channel, so their traffic doesn't queue behind invalidations.
+    """
+
+    def __init__(self, channel: Optional[str] = None):
+        self.channel = channel
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._reset_handlers: List[Callable[[], None]] = []
+        self._transport = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        self.published = 0
+        self.received = 0
+        self.last_lag_ms: Optional[float] = None
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def on_reset(self, handler: Callable[[], None]) -> None:
+        self._reset_handlers.append(handler)
+
+    def _dispatch(self, topic: str, data: Dict[str, Any]) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {topic} failed: {e}")
+
+    async def publish(self, topic: str, **data: Any) -> None:
+        """Apply an invalidation here and broadcast it to the other workers"""
+        self._dispatch(topic, data)
+        self.published += 1
+        if self._transport is None or not self._connected.is_set():
+            return
+        payload = json.dumps({"origin": PROCESS_ID, "topic": topic, "data": data, "sent_at": time.time()}, default=str)
+        try:
+            await self._transport.publish(payload)
+        except Exception as e:
+            # Other workers converge through their cache TTLs
+            logger.warning(f"Failed to publish {topic} invalidation: {e}")
+
+    def _on_message(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation message: {payload[:200]}")
+            return
+        if message.get("origin") == PROCESS_ID:
+            return
+        self.received += 1
+        self.last_lag_ms = (time.time() - message.get("sent_at", time.time())) * 1000
+        self._dispatch(message.get("topic"), message.get("data") or {})
+
+    def _reset(self) -> None:
+        for handler in self._reset_handlers:
+            try:
+                handler()
+            except Exception as e:
+                logger.error(f"Invalidation reset handler failed: {e}")
+
+    async def _listen(self) -> None:
+        backoff = 1
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                await self._transport.connect(self._on_message)
+                self._connected.set()
+                if attempts > 1:
+                    self._reset()
+                backoff = 1
+                logger.info(f"Invalidation bus listening via {self._transport.name}")
+                await self._transport.wait_closed()
+                logger.warning("Invalidation bus connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Invalidation bus connection failed ({e}), retrying in {backoff}s")
+            finally:
+                self._connected.clear()
+                try:
+                    await self._transport.close()
+                except Exception:
+                    pass
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def start(self) -> None:
+        """Start listening in the background (doesn't block startup)"""
+        if self._task is not None:
+            return
+        if settings.INVALIDATION_TRANSPORT == "redis":
+            self._transport = RedisTransport(settings.REDIS_URL, self.channel or settings.INVALIDATION_CHANNEL)
+        else:
+            self._transport = PostgresTransport(settings.DATABASE_URL, self.channel or settings.INVALIDATION_CHANNEL)
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._transport = None
+
+
+invalidation_bus = InvalidationBus()
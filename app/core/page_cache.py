@@ -0,0 +1,107 @@
+from fastapi import Request
+from fastapi.responses import Response
+from email.utils import formatdate
+from typing import Dict, Hashable, Optional
+from app.core.conditional import etag_matches, not_modified_since
+from app.core.config import settings
+from app.core.templates import templates
+import gzip
+import hashlib
+import logging
+import time
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPage:
+    """A rendered page plus everything needed to answer conditional requests"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.last_modified_ts = int(time.time())
+        self.last_modified = formatdate(self.last_modified_ts, usegmt=True)
+        # Compressed once here instead of on every hit
+        self.variants: Dict[str, bytes] = {"gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        # Strong validators are per representation, so each encoding gets its own
+        self.etags: Dict[Optional[str], str] = {None: self.etag}
+        for encoding in self.variants:
+            self.etags[encoding] = f'"{digest}-{encoding}"'
+
+
+def _pick_encoding(accept_encoding: str, page: CachedPage) -> Optional[str]:
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in page.variants:
+            return encoding
+    return None
+
+
+class PageCache:
+    """Per-process cache of fully rendered, request-independent pages.
+
+    Pages are rendered once per worker and served from memory with a strong
+    ETag and Last-Modified. Workers start empty, so a deploy (which restarts
+    them) is what invalidates the cache; ETags are content hashes, so clients
+    holding an old version simply get a 200 with the new one.
+    """
+
+    def __init__(self):
+        self._pages: Dict[Hashable, CachedPage] = {}
+
+    @property
+    def enabled(self) -> bool:
+        if settings.PAGE_CACHE_ENABLED is not None:
+            return settings.PAGE_CACHE_ENABLED
+        return settings.ENVIRONMENT == "production"
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+    def get_page(self, key: Hashable, template_name: str, context: dict) -> CachedPage:
+        page = self._pages.get(key)
+        if page is None:
+            body = templates.env.get_template(template_name).render(context).encode("utf-8")
+            page = CachedPage(body)
+            self._pages[key] = page
+            logger.info(f"Page cache: rendered {template_name} ({len(body)} bytes)")
+        return page
+
+    def render(self, request: Request, template_name: str, context: Optional[dict] = None, key: Hashable = None) -> Response:
+        """Serve a marketing page from cache, answering conditional requests with 304"""
+        context = {"request": request, **(context or {})}
+        if not self.enabled:
+            return templates.TemplateResponse(template_name, context)
+
+        page = self.get_page(key or template_name, template_name, context)
+        encoding = _pick_encoding(request.headers.get("accept-encoding", ""), page)
+        headers = {
+            "ETag": page.etags[encoding],
+            "Last-Modified": page.last_modified,
+            "Cache-Control": f"public, max-age={settings.PAGE_CACHE_MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            if etag_matches(if_none_match, page.etags.values()):
+                return Response(status_code=304, headers=headers)
+        elif if_modified_since and not_modified_since(if_modified_since, page.last_modified_ts):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(content=page.variants[encoding], media_type="text/html; charset=utf-8", headers=headers)
+        return Response(content=page.body, media_type="text/html; charset=utf-8", headers=headers)
+
+
+page_cache = PageCache()
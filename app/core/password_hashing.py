@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password, pwd_context
+import asyncio
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _verify_and_update(password: str, hashed: str):
+    # Runs in a pool worker: returns (valid, new_hash or None)
+    return pwd_context.verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    """bcrypt off the event loop.
+
+    A bcrypt hash or verify costs ~250ms of CPU; run inline it stalls every
+    other request on the worker. Calls go to a small process pool (threads
+    would still contend for the GIL in passlib's Python code) and at most
+    PASSWORD_HASH_MAX_PENDING wait for it, so a login storm queues here
+    instead of piling up unbounded work.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dummy_hash: Optional[str] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_pool(), fn, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM kill etc.) - replace the pool and retry once
+                logger.warning("Password hashing pool broken, restarting it")
+                self._pool = None
+                return await loop.run_in_executor(self._get_pool(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: Optional[str]):
+        """Check a stored password; returns (valid, replacement hash or None).
+
+        A replacement is returned when the stored hash uses outdated settings,
+        or when it is a legacy plaintext value from before hashing was added.
+        With no stored hash a dummy verify still runs, so unknown usernames
+        take as long as wrong passwords.
+        """
+        if not hashed:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("dummy-password-for-timing")
+            await self.verify(password, self._dummy_hash)
+            return False, None
+        if pwd_context.identify(hashed) is None:
+            if hmac.compare_digest(hashed.encode(), password.encode()):
+                return True, await self.hash(password)
+            return False, None
+        return await self._run(_verify_and_update, password, hashed)
+
+    def start(self) -> None:
+        """Spawn the workers up front so the first login doesn't pay for it"""
+        pool = self._get_pool()
+        for _ in range(self.workers):
+            pool.submit(pwd_context.identify, "")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from typing import NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import registry
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+REJECTED = registry.counter("rate_limited_requests_total", "Requests rejected with 429, by limit and key type", ("limit", "scope"))
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class Limit(NamedTuple):
+    capacity: int  # burst size
+    refill_per_second: float
+
+
+def parse_limit(spec: Optional[str]) -> Optional[Limit]:
+    """"10/minute" -> bucket of 10 refilled at 10 per minute; empty or "0/..." disables"""
+    if not spec:
+        return None
+    count, _, period = spec.partition("/")
+    count = int(count)
+    if count <= 0:
+        return None
+    return Limit(count, count / PERIODS[period.strip().rstrip("s") or "minute"])
+
+
+class MemoryBuckets:
+    """Token buckets in this worker's memory; least recently used keys are dropped past max_keys"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take one token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.refill_per_second
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+# Same algorithm as MemoryBuckets, atomically in Redis, on the Redis clock
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * refill)
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  retry_after = (1 - tokens) / refill
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        self.url = url
+        self.prefix = prefix
+        self._script = None
+
+    async def take(self, key: str, limit: Limit) -> float:
+        if self._script is None:
+            import redis.asyncio as redis
+
+            self._script = redis.from_url(self.url).register_script(TOKEN_BUCKET_SCRIPT)
+        result = await self._script(keys=[self.prefix + key], args=[limit.capacity, limit.refill_per_second])
+        return float(result)
+
+
+class RateLimiter:
+    """Per-worker buckets by default; RATE_LIMIT_BACKEND=redis shares them across workers.
+
+    If Redis is unreachable the worker falls back to its own buckets rather
+    than failing requests or letting them through unlimited.
+    """
+
+    def __init__(self):
+        self.memory = MemoryBuckets()
+        self.redis = RedisBuckets(settings.REDIS_URL) if settings.RATE_LIMIT_BACKEND == "redis" else None
+        self._redis_down_until = 0.0
+
+    async def take(self, key: str, limit: Limit) -> float:
+        if self.redis is not None and time.monotonic() >= self._redis_down_until:
+            try:
+                return await self.redis.take(key, limit)
+            except Exception as e:
+                logger.warning(f"Rate limit Redis unavailable ({e}), using per-worker buckets for 30s")
+                self._redis_down_until = time.monotonic() + 30
+        return await self.memory.take(key, limit)
+
+
+rate_limiter = RateLimiter()
+
+
+async def _club_slug(request: Request) -> Optional[str]:
+    slug = request.path_params.get("club_slug")
+    if slug:
+        return slug
+    if request.headers.get("content-type", "").startswith("application/json"):
+        # Starlette caches the body, so the endpoint still gets it
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        if isinstance(body, dict) and isinstance(body.get("club_slug"), str):
+            return body["club_slug"]
+    return None
+
+
+def rate_limit(name: str, per_ip: Optional[str], per_club: Optional[str] = None):
+    """Route dependency enforcing per-client-IP and per-club token buckets.
+
+        @router.post("/chat", dependencies=[Depends(rate_limit("ai_chat", settings.RATE_LIMIT_AI_CHAT))])
+
+    The club comes from a {club_slug} path parameter or a JSON body's
+    "club_slug". The client IP is what uvicorn reports, which is the
+    X-Forwarded-For address for requests from the local nginx.
+    """
+    ip_limit = parse_limit(per_ip)
+    club_limit = parse_limit(per_club)
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        checks = []
+        if ip_limit is not None:
+            client = request.client.host if request.client else "unknown"
+            checks.append(("ip", f"{name}:ip:{client}", ip_limit))
+        if club_limit is not None:
+            slug = await _club_slug(request)
+            if slug:
+                checks.append(("club", f"{name}:club:{slug.lower()}", club_limit))
+        for scope, key, limit in checks:
+            retry_after = await rate_limiter.take(key, limit)
+            if retry_after > 0:
+                REJECTED.inc(name, scope)
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many requests, please try again shortly",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+    return dependency
@@ -0,0 +1,205 @@
+from datetime import datetime
+from fastapi import Request, WebSocket
+from jose import JWTError, jwt
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+from typing import Dict, NamedTuple, Optional, Union
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+import time
+import uuid
+
+# One cookie per kind, so a club owner who is also a member of a club keeps both
+MEMBER_COOKIE = "ezclub_member"
+USER_COOKIE = "ezclub_session"
+
+
+class Principal(NamedTuple):
+    """Who a request is from, as carried in its signed session token"""
+    kind: str  # "member" (club member) or "user" (platform user / club owner)
+    subject_id: str
+    club_id: Optional[str]
+    tier: Optional[str]
+    name: Optional[str]
+    email: Optional[str]
+    joined: Optional[str]  # "%B %Y", for "member since"
+    session_id: str
+    issued_at: int
+    expires_at: int
+
+
+class SessionRevocations:
+    """Revoked sessions, kept only until the tokens would have expired anyway.
+
+    Revocations are shared with the other workers over the invalidation bus.
+    Nothing is persisted: a worker that restarts (or whose bus listener
+    reconnects) forgets earlier revocations, which SESSION_TTL_MINUTES bounds.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, float] = {}  # session id -> token expiry
+        self._subjects: Dict[str, float] = {}  # subject id -> tokens issued before this are revoked
+
+    def add_session(self, session_id: str, expires_at: float) -> None:
+        self._sessions[session_id] = expires_at
+        self._prune()
+
+    def add_subject(self, subject_id: str, revoked_at: float) -> None:
+        self._subjects[subject_id] = max(revoked_at, self._subjects.get(subject_id, 0))
+        self._prune()
+
+    def is_revoked(self, principal: Principal) -> bool:
+        if principal.session_id in self._sessions:
+            return True
+        revoked_at = self._subjects.get(principal.subject_id)
+        return revoked_at is not None and principal.issued_at <= revoked_at
+
+    def _prune(self) -> None:
+        now = time.time()
+        self._sessions = {k: exp for k, exp in self._sessions.items() if exp > now}
+        horizon = now - settings.SESSION_TTL_MINUTES * 60
+        self._subjects = {k: at for k, at in self._subjects.items() if at > horizon}
+
+
+revocations = SessionRevocations()
+invalidation_bus.subscribe("session_revoked", lambda data: revocations.add_session(data["session_id"], data["expires_at"]))
+invalidation_bus.subscribe("subject_revoked", lambda data: revocations.add_subject(data["subject_id"], data["revoked_at"]))
+invalidation_bus.subscribe("subjects_revoked", lambda data: [
+    revocations.add_subject(subject_id, data["revoked_at"]) for subject_id in data["subject_ids"]
+])
+
+# Subject ids per bus message: pg_notify payloads must stay under 8000 bytes
+REVOKE_BATCH = 150
+
+
+def create_session_token(kind: str, subject_id, club_id=None, tier: Optional[str] = None,
+                         name: Optional[str] = None, email: Optional[str] = None,
+                         joined: Union[datetime, str, None] = None) -> str:
+    """Sign a short-lived session token (HS256 with SECRET_KEY)"""
+    now = int(time.time())
+    claims = {
+        "typ": kind,
+        "sub": str(subject_id),
+        "club": str(club_id) if club_id else None,
+        "tier": tier,
+        "name": name,
+        "email": email,
+        "joined": joined.strftime("%B %Y") if isinstance(joined, datetime) else joined,
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + settings.SESSION_TTL_MINUTES * 60,
+    }
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def member_session_token(member) -> str:
+    """Session token for a ClubMember, carrying what member pages show"""
+    return create_session_token(
+        "member", member.id, club_id=member.club_id, tier=member.member_tier,
+        name=member.display_name, email=member.email, joined=member.created_at,
+    )
+
+
+def user_session_token(user) -> str:
+    """Session token for a PlatformUser (club owner)"""
+    return create_session_token("user", user.id, name=user.username, email=user.email, joined=user.created_at)
+
+
+def decode_session_token(token: str, kind: str) -> Optional[Principal]:
+    """Verify signature, expiry, kind and revocation; None if any check fails"""
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if claims.get("typ") != kind:
+        return None
+    principal = Principal(
+        kind=kind,
+        subject_id=claims["sub"],
+        club_id=claims.get("club"),
+        tier=claims.get("tier"),
+        name=claims.get("name"),
+        email=claims.get("email"),
+        joined=claims.get("joined"),
+        session_id=claims["jti"],
+        issued_at=claims["iat"],
+        expires_at=claims["exp"],
+    )
+    if revocations.is_revoked(principal):
+        return None
+    return principal
+
+
+def _cookie_name(kind: str) -> str:
+    return MEMBER_COOKIE if kind == "member" else USER_COOKIE
+
+
+def set_session_cookie(response: Response, kind: str, token: str) -> None:
+    response.set_cookie(
+        _cookie_name(kind),
+        token,
+        max_age=settings.SESSION_TTL_MINUTES * 60,
+        httponly=True,
+        secure=not settings.DEBUG,
+        samesite="lax",
+    )
+
+
+def clear_session_cookie(response: Response, kind: str) -> None:
+    response.delete_cookie(_cookie_name(kind))
+
+
+def refresh_session_cookie(response: Response, principal: Principal) -> None:
+    """Re-issue the token once half its lifetime has passed, so active sessions don't lapse"""
+    if principal.expires_at - time.time() > settings.SESSION_TTL_MINUTES * 30:
+        return
+    token = create_session_token(
+        principal.kind, principal.subject_id, principal.club_id, principal.tier,
+        principal.name, principal.email, principal.joined,
+    )
+    set_session_cookie(response, principal.kind, token)
+
+
+def _session_from_request(request: HTTPConnection, kind: str) -> Optional[Principal]:
+    token = request.cookies.get(_cookie_name(kind))
+    if not token:
+        auth = request.headers.get("authorization", "")
+        if auth.lower().startswith("bearer "):
+            token = auth[7:].strip()
+    if not token:
+        return None
+    return decode_session_token(token, kind)
+
+
+def member_session(request: Request) -> Optional[Principal]:
+    """Dependency: the club member signed in on this request, if any (no DB access)"""
+    return _session_from_request(request, "member")
+
+
+def member_socket_session(websocket: WebSocket) -> Optional[Principal]:
+    """Dependency for WebSocket routes: the member signed in by cookie or bearer header, if any"""
+    return _session_from_request(websocket, "member")
+
+
+def user_session(request: Request) -> Optional[Principal]:
+    """Dependency: the platform user signed in on this request, if any (no DB access)"""
+    return _session_from_request(request, "user")
+
+
+async def revoke_session(principal: Principal) -> None:
+    """Sign one session out, in every worker"""
+    await invalidation_bus.publish("session_revoked", session_id=principal.session_id, expires_at=principal.expires_at)
+
+
+async def revoke_subject(subject_id) -> None:
+    """Sign a member or user out of every session issued so far (removal, tier change)"""
+    await invalidation_bus.publish("subject_revoked", subject_id=str(subject_id), revoked_at=time.time())
+
+
+async def revoke_subjects(subject_ids) -> None:
+    """revoke_subject for many members at once (bulk imports), a batch per bus message"""
+    subject_ids = [str(s) for s in subject_ids]
+    revoked_at = time.time()
+    for start in range(0, len(subject_ids), REVOKE_BATCH):
+        await invalidation_bus.publish("subjects_revoked", subject_ids=subject_ids[start:start + REVOKE_BATCH],
+                                       revoked_at=revoked_at)
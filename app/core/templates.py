@@ -0,0 +1,56 @@
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateError
+from pathlib import Path
+from app.core.config import settings
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates"
+
+
+def create_environment() -> Environment:
+    """Build the Jinja2 environment shared by every router.
+
+    In production templates only change on deploy, so auto-reload (a stat() per
+    render) is off, and compiled bytecode is cached on disk so restarted workers
+    skip parsing. Jinja checks the source checksum, so a deploy invalidates stale
+    bytecode on its own.
+    """
+    auto_reload = settings.TEMPLATE_AUTO_RELOAD
+    if auto_reload is None:
+        auto_reload = settings.ENVIRONMENT != "production"
+
+    bytecode_cache = None
+    if settings.TEMPLATE_BYTECODE_CACHE:
+        cache_dir = settings.TEMPLATE_BYTECODE_CACHE_DIR
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(directory=cache_dir)
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=auto_reload,
+        bytecode_cache=bytecode_cache,
+        cache_size=settings.TEMPLATE_CACHE_SIZE,
+    )
+
+
+def warm_templates() -> int:
+    """Compile every template up front so the first request doesn't pay for it"""
+    started = time.perf_counter()
+    compiled = 0
+    for name in templates.env.list_templates(extensions=["html"]):
+        try:
+            templates.env.get_template(name)
+            compiled += 1
+        except TemplateError as e:
+            logger.error(f"Template {name} failed to compile: {e}")
+    logger.info(f"Precompiled {compiled} templates in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return compiled
+
+
+# Shared templates object - import this instead of creating Jinja2Templates per router
+templates = Jinja2Templates(env=create_environment())
@@ -1,10 +1,17 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy import text
 from app.core.config import settings
+from pathlib import Path
+from typing import Set
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Alembic migration scripts (alembic.ini lives in the project root)
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
@@ -42,20 +49,62 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db():
-    """Initialize database tables"""
+    """Create all tables from the models (development only, opt in with DB_CREATE_ALL).
+
+    Production schemas are managed by Alembic; see check_schema_revision().
+    """
     async with engine.begin() as conn:
         # Import all models to ensure they are registered
-        from app.models.club import Club
-        from app.models.user import PlatformUser, ClubMember, ClubRole
-        from app.models.membership import MembershipTier, MemberSubscription
-        from app.models.booking import BookingService, BookingSlot, Booking
-        from app.models.chat import ChatChannel, ChatMessage, MessageReaction, MemberChannelAccess
-        from app.models.payment import Payment, Donation, PlatformSubscription
-        from app.models.media import MediaFile, ContentPage, ContentMedia
-        from app.models.ai import AIConversation, AIMessage
-        from app.models.analytics import ClubAnalytics, PlatformUsage
-        from app.models.notification import Notification, AuditLog, FeatureFlag
+        import app.models  # noqa: F401
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created successfully")
+
+
+def get_head_revisions() -> Set[str]:
+    """Head revision(s) of the Alembic migration scripts shipped with this code"""
+    from alembic.script import ScriptDirectory
+    
+    return set(ScriptDirectory(str(ALEMBIC_DIR)).get_heads())
+
+
+async def get_current_revisions() -> Set[str]:
+    """Revision(s) recorded in the database's alembic_version table"""
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            # alembic_version doesn't exist yet - database was never migrated
+            return set()
+        return {row[0] for row in result}
+
+
+async def check_schema_revision() -> bool:
+    """Compare the database revision with the migration head in a single query.
+
+    Returns True when the schema is current. With DB_SCHEMA_FAIL_FAST a mismatch
+    (or an unreachable database) raises instead, so a worker never starts
+    serving against a stale schema.
+    """
+    heads = get_head_revisions()
+    try:
+        current = await get_current_revisions()
+    except Exception as e:
+        if settings.DB_SCHEMA_FAIL_FAST:
+            raise
+        logger.error(f"Could not read database schema revision: {e}")
+        return False
+    
+    if current == heads:
+        logger.info(f"Database schema is at head revision {', '.join(sorted(heads))}")
+        return True
+    
+    message = (
+        f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+        f"code expects {', '.join(sorted(heads))}. Run `alembic upgrade head`."
+    )
+    if settings.DB_SCHEMA_FAIL_FAST:
+        raise RuntimeError(message)
+    logger.warning(message)
+    return False
@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request or tracked block ran more statements than it declared, or an N+1 pattern"""
+
+
+def budget_mode() -> str:
+    """"raise", "log" or "off" - defaults to log outside production"""
+    if settings.QUERY_BUDGET_MODE:
+        return settings.QUERY_BUDGET_MODE
+    return "off" if settings.ENVIRONMENT == "production" else "log"
+
+
+class QueryTracker:
+    """Statements issued within one request or ``track_queries`` block.
+
+    Statements are compared on their SQL text, which SQLAlchemy renders with
+    bind placeholders, so the same query for different ids counts as a repeat.
+    """
+
+    def __init__(self, label: str, budget: Optional[int] = None, n_plus_one_threshold: Optional[int] = None, mode: Optional[str] = None):
+        self.label = label
+        self.budget = budget
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.QUERY_N_PLUS_ONE_THRESHOLD
+        self.mode = mode or budget_mode()
+        self.count = 0
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        repeats = self.statements.get(statement, 0) + 1
+        self.statements[statement] = repeats
+        # In raise mode fail at the offending statement, so the traceback points at the loop
+        if self.mode == "raise":
+            if self.budget is not None and self.count > self.budget:
+                raise QueryBudgetExceeded(f"{self.label}: exceeded query budget of {self.budget}")
+            if repeats == self.n_plus_one_threshold:
+                raise QueryBudgetExceeded(
+                    f"{self.label}: possible N+1, same statement run {repeats} times: {_shorten(statement)}"
+                )
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Statements run at least n_plus_one_threshold times, most repeated first"""
+        hits = [(s, n) for s, n in self.statements.items() if n >= self.n_plus_one_threshold]
+        return sorted(hits, key=lambda item: -item[1])
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def report(self) -> None:
+        """Log what went over; called when the request or block ends"""
+        if self.mode == "off":
+            return
+        if self.over_budget:
+            logger.warning(f"Query budget exceeded in {self.label}: {self.count} statements (budget {self.budget})")
+        for statement, repeats in self.repeated():
+            logger.warning(f"Possible N+1 in {self.label}: {repeats}x {_shorten(statement)}")
+
+
+def _shorten(statement: str, length: int = 160) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+current_tracker: ContextVar[Optional[QueryTracker]] = ContextVar("current_query_tracker", default=None)
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    tracker = current_tracker.get()
+    if tracker is not None:
+        tracker.record(statement)
+
+
+def install_query_tracking(engine: Engine) -> None:
+    """Feed statements to the active tracker (pass engine.sync_engine for async engines)"""
+    if not event.contains(engine, "before_cursor_execute", _record_statement):
+        event.listen(engine, "before_cursor_execute", _record_statement)
+
+
+@contextmanager
+def track_queries(budget: Optional[int] = None, label: str = "tracked block", mode: str = "raise") -> Iterator[QueryTracker]:
+    """Track statements in a block - for tests, scripts and benchmarks.
+
+        with track_queries(budget=3) as tracker:
+            await ClubService.get_booking_services(db, club.id, use_cache=False)
+        assert not tracker.repeated()
+
+    Raises QueryBudgetExceeded on exit if the budget was exceeded or a
+    statement repeated (in "log" mode it only logs).
+    """
+    tracker = QueryTracker(label, budget=budget, mode="log")
+    token = current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        current_tracker.reset(token)
+    if mode == "raise" and (tracker.over_budget or tracker.repeated()):
+        problems = []
+        if tracker.over_budget:
+            problems.append(f"{tracker.count} statements (budget {budget})")
+        problems.extend(f"{n}x {_shorten(s)}" for s, n in tracker.repeated())
+        raise QueryBudgetExceeded(f"{label}: " + "; ".join(problems))
+    tracker.report()
+
+
+def query_budget(max_queries: int, n_plus_one_threshold: Optional[int] = None):
+    """Declare how many statements an async route handler may issue.
+
+    QueryBudgetMiddleware applies QUERY_BUDGET_DEFAULT to undecorated routes.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            tracker = current_tracker.get()
+            if tracker is not None:
+                tracker.budget = max_queries
+                if n_plus_one_threshold is not None:
+                    tracker.n_plus_one_threshold = n_plus_one_threshold
+            return await endpoint(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def allow_batch(statements: int) -> None:
+    """Widen the active tracker for one more batch of a bulk operation (e.g. an import chunk).
+
+    The budget grows by the batch's statements and the N+1 threshold by one,
+    so statements run once per batch aren't flagged however many batches
+    there are, while a query repeated within a batch still is.
+    """
+    tracker = current_tracker.get()
+    if tracker is None:
+        return
+    if tracker.budget is not None:
+        tracker.budget += statements
+    tracker.n_plus_one_threshold += 1
@@ -0,0 +1,230 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Iterable, Optional
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Text-like types worth compressing; images, fonts, archives and PDFs are already compressed
+COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "text/calendar",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+class CompressionStats:
+    """Per-process counters for what the compression middleware did.
+
+    cpu_seconds is thread CPU time spent inside the compressors, so it can be
+    weighed against bytes_in - bytes_out.
+    """
+
+    def __init__(self):
+        self.responses: Dict[str, int] = {}
+        self.skipped: Dict[str, int] = {}
+        self.bytes_in: Dict[str, int] = {}
+        self.bytes_out: Dict[str, int] = {}
+        self.cpu_seconds: Dict[str, float] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float) -> None:
+        self.bytes_in[encoding] = self.bytes_in.get(encoding, 0) + bytes_in
+        self.bytes_out[encoding] = self.bytes_out.get(encoding, 0) + bytes_out
+        self.cpu_seconds[encoding] = self.cpu_seconds.get(encoding, 0.0) + cpu_seconds
+
+    def count_response(self, encoding: str) -> None:
+        self.responses[encoding] = self.responses.get(encoding, 0) + 1
+
+    def count_skip(self, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            "responses": dict(self.responses),
+            "skipped": dict(self.skipped),
+            "bytes_in": dict(self.bytes_in),
+            "bytes_out": dict(self.bytes_out),
+            "cpu_seconds": {k: round(v, 6) for k, v in self.cpu_seconds.items()},
+        }
+
+
+compression_stats = CompressionStats()
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        # Sync flush keeps streamed chunks decodable as they arrive
+        return out + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """Pick the client's highest-q encoding we support, preferring br on ties"""
+    explicit: Dict[str, float] = {}
+    wildcard = 0.0
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name == "*":
+            wildcard = q
+        elif name:
+            explicit[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:  # ordered by preference
+        q = explicit.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress text responses with brotli or gzip, based on Accept-Encoding.
+
+    Bodies sent in one piece are compressed only above ``minimum_size``.
+    Streamed bodies (exports, StreamingResponse) are compressed chunk by chunk
+    with a flush after each, so clients still see rows as they are produced.
+    Responses that already carry a Content-Encoding (e.g. precompressed cached
+    pages), partial content and non-text types are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        compressible_types: Iterable[str] = COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compressible_types = tuple(compressible_types)
+        self.available = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def new_stream(self, encoding: str):
+        if encoding == "br":
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+    def skip_reason(self, status: int, headers: Headers) -> Optional[str]:
+        if "content-encoding" in headers:
+            return "already_encoded"
+        if status < 200 or status in (204, 206, 304) or "content-range" in headers:
+            return "status"
+        if "no-transform" in headers.get("cache-control", ""):
+            return "no_transform"
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type not in self.compressible_types:
+            return "content_type"
+        return None
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.stream = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until we've seen the first body chunk
+            self.start_message = message
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None:
+            headers = Headers(raw=self.start_message["headers"])
+            reason = self.middleware.skip_reason(self.start_message["status"], headers)
+            if reason is None and not more_body and len(body) < self.middleware.minimum_size:
+                reason = "below_minimum_size"
+            if reason is not None:
+                compression_stats.count_skip(reason)
+                self.passthrough = True
+                await self._flush_start()
+                await self.downstream(message)
+                return
+
+            self.stream = self.middleware.new_stream(self.encoding)
+            compression_stats.count_response(self.encoding)
+            compressed = self._compress(body, final=not more_body)
+            response_headers = MutableHeaders(raw=self.start_message["headers"])
+            response_headers["Content-Encoding"] = self.encoding
+            response_headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del response_headers["Content-Length"]
+            else:
+                response_headers["Content-Length"] = str(len(compressed))
+            self.start_message["headers"] = response_headers.raw
+            await self._flush_start()
+            await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        compressed = self._compress(body, final=not more_body)
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _compress(self, body: bytes, final: bool) -> bytes:
+        started = time.thread_time()
+        compressed = self.stream.compress(body, final)
+        compression_stats.record(self.encoding, len(body), len(compressed), time.thread_time() - started)
+        return compressed
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            message, self.start_message = self.start_message, None
+            await self.downstream(message)
@@ -0,0 +1,142 @@
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Optional
+from app.core.metrics import registry, Counter, Gauge
+import time
+
+REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Time from request start to the last body byte", ("method", "route")
+)
+IN_PROGRESS = registry.gauge("http_requests_in_progress", "Requests currently being handled", ("method",))
+DB_QUERIES = registry.counter("db_queries_total", "SQL statements executed, by route", ("route",))
+DB_TIME = registry.counter("db_query_duration_seconds_total", "Time spent executing SQL statements, by route", ("route",))
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "http_request_db_queries", "SQL statements issued per request", ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+
+
+class RequestDBStats:
+    """Statement count and DB time for one request"""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set for the duration of a request; SQLAlchemy propagates it into its greenlets
+current_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("current_db_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and DB time per request (pass engine.sync_engine for async engines)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_label(scope: Scope) -> str:
+    # Route templates keep label cardinality bounded ("/community/{club_slug}/members")
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope["path"].startswith("/static/"):
+        return "/static"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record per-route latency, status codes, in-flight requests and DB usage"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        stats = RequestDBStats()
+        token = current_db_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_PROGRESS.dec(method)
+            current_db_stats.reset(token)
+            route = _route_label(scope)
+            REQUESTS.inc(method, route, str(status))
+            LATENCY.observe(elapsed, method, route)
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, route)
+            if stats.queries:
+                DB_QUERIES.inc(route, amount=stats.queries)
+                DB_TIME.inc(route, amount=stats.db_seconds)
+
+
+def _cache_metrics():
+    """Expose the counters kept by the caches, compression and invalidation bus"""
+    from app.core.fragment_cache import dashboard_fragments
+    from app.core.invalidation import invalidation_bus
+    from app.middleware.compression import compression_stats
+
+    fragments = Counter("fragment_cache_requests_total", "Dashboard fragment lookups", ("result",))
+    fragments.inc("hit", amount=dashboard_fragments.hits)
+    fragments.inc("miss", amount=dashboard_fragments.misses)
+
+    bus = Counter("invalidation_messages_total", "Cache invalidation messages", ("direction",))
+    bus.inc("published", amount=invalidation_bus.published)
+    bus.inc("received", amount=invalidation_bus.received)
+    metrics = [fragments, bus]
+    if invalidation_bus.last_lag_ms is not None:
+        lag = Gauge("invalidation_last_lag_seconds", "Delivery delay of the last received invalidation")
+        lag.set(invalidation_bus.last_lag_ms / 1000)
+        metrics.append(lag)
+
+    snapshot = compression_stats.snapshot()
+    responses = Counter("http_compressed_responses_total", "Responses compressed, by encoding", ("encoding",))
+    skipped = Counter("http_compression_skipped_total", "Responses not compressed, by reason", ("reason",))
+    bytes_in = Counter("http_compression_bytes_in_total", "Bytes before compression", ("encoding",))
+    bytes_out = Counter("http_compression_bytes_out_total", "Bytes after compression", ("encoding",))
+    cpu = Counter("http_compression_cpu_seconds_total", "CPU time spent compressing", ("encoding",))
+    for encoding, count in snapshot["responses"].items():
+        responses.inc(encoding, amount=count)
+    for reason, count in snapshot["skipped"].items():
+        skipped.inc(reason, amount=count)
+    for encoding in snapshot["bytes_in"]:
+        bytes_in.inc(encoding, amount=snapshot["bytes_in"][encoding])
+        bytes_out.inc(encoding, amount=snapshot["bytes_out"][encoding])
+        cpu.inc(encoding, amount=snapshot["cpu_seconds"][encoding])
+    return metrics + [responses, skipped, bytes_in, bytes_out, cpu]
+
+
+registry.add_collector(_cache_metrics)
@@ -0,0 +1,33 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.db.query_budget import QueryTracker, budget_mode, current_tracker
+
+
+class QueryBudgetMiddleware:
+    """Track statements per request and flag budget overruns and N+1 patterns.
+
+    Every request starts with QUERY_BUDGET_DEFAULT; handlers decorated with
+    @query_budget(n) declare their own. In "log" mode overruns are logged when
+    the request ends; in "raise" mode the statement that crosses the line
+    raises QueryBudgetExceeded, failing the request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode = budget_mode()
+        if scope["type"] != "http" or mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker(f"{scope['method']} {scope['path']}", budget=settings.QUERY_BUDGET_DEFAULT, mode=mode)
+        token = current_tracker.set(tracker)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tracker.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                tracker.label = f"{scope['method']} {route.path}"
+            tracker.report()
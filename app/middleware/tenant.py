@@ -0,0 +1,54 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.services.tenant_index import TenantIndex
+
+# Platform-wide routes that stay as they are on a club's own host
+PASSTHROUGH_PREFIXES = (
+    "/static/",
+    "/api/",
+    "/community/",
+    "/stripe/",
+    "/webhooks/",
+    "/admin",
+    "/user/",
+    "/booking/",
+    "/health",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+)
+
+
+class TenantMiddleware:
+    """Serve clubs on their custom domain or {slug}.PLATFORM_DOMAIN.
+
+    The Host header is resolved through the in-memory TenantIndex (no query
+    per request). For a club host, paths are rewritten onto the existing
+    /community/{slug} routes, so https://myclub.com/members is handled by
+    /community/{slug}/members, and the club is exposed as request.state.tenant.
+    Platform and unknown hosts pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, index: TenantIndex):
+        self.app = app
+        self.index = index
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        tenant = self.index.resolve(Headers(scope=scope).get("host", ""))
+        if tenant is None:
+            await self.app(scope, receive, send)
+            return
+
+        scope = dict(scope)
+        scope["state"] = {**scope.get("state", {}), "tenant": tenant}
+        path = scope["path"]
+        if not path.startswith(PASSTHROUGH_PREFIXES):
+            prefix = f"/community/{tenant.slug}"
+            scope["path"] = prefix + path
+            scope["raw_path"] = prefix.encode() + (scope.get("raw_path") or path.encode())
+        await self.app(scope, receive, send)
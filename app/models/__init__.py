@@ -2,7 +2,7 @@
 from .club import Club
 from .user import PlatformUser, ClubMember, ClubRole
 from .membership import MembershipTier, MemberSubscription
-from .booking import BookingService, BookingSlot, Booking
+from .booking import BookingService, BookingSlot, Booking, AvailabilityRule, AvailabilityException, SlotHold
 from .chat import ChatChannel, ChatMessage, MessageReaction, MemberChannelAccess
 from .payment import Payment, Donation, PlatformSubscription
 from .media import MediaFile, ContentPage, ContentMedia
@@ -20,6 +20,9 @@ __all__ = [
     "BookingService",
     "BookingSlot", 
     "Booking",
+    "AvailabilityRule",
+    "AvailabilityException",
+    "SlotHold",
     "ChatChannel",
     "ChatMessage",
     "MessageReaction",
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, DECIMAL, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, Date, DateTime, Time, DECIMAL, Integer, SmallInteger, ForeignKey, Index, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db.database import Base
 from app.models.base import BaseModel
 from typing import Optional
@@ -35,6 +35,8 @@ class BookingService(Base, BaseModel):
     club = relationship("Club", back_populates="booking_services")
     slots = relationship("BookingSlot", back_populates="service", cascade="all, delete-orphan")
     bookings = relationship("Booking", back_populates="service", cascade="all, delete-orphan")
+    availability_rules = relationship("AvailabilityRule", back_populates="service", cascade="all, delete-orphan")
+    availability_exceptions = relationship("AvailabilityException", back_populates="service", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<BookingService(id={self.id}, name='{self.name}', club_id={self.club_id})>"
@@ -42,6 +44,14 @@ class BookingService(Base, BaseModel):
 
 class BookingSlot(Base, BaseModel):
     __tablename__ = "booking_slots"
+    __table_args__ = (
+        # Availability lookups: one service, a start_time range
+        Index("ix_booking_slots_service_id_start_time", "service_id", "start_time"),
+        # Calendar windows: overlap (&&) of the slot's time range with the visible range
+        Index("ix_booking_slots_time_range", text("tstzrange(start_time, end_time, '[)')"), postgresql_using="gist"),
+        # Backstop for AvailabilityService.reserve's conditional UPDATE
+        CheckConstraint("current_bookings >= 0 AND current_bookings <= max_capacity", name="ck_booking_slots_capacity"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     service_id = Column(UUID(as_uuid=True), ForeignKey("booking_services.id", ondelete="CASCADE"), nullable=False)
@@ -63,8 +73,70 @@ class BookingSlot(Base, BaseModel):
         return f"<BookingSlot(id={self.id}, service_id={self.service_id}, start_time={self.start_time})>"
 
 
+class AvailabilityRule(Base, BaseModel):
+    """Weekly opening hours of a service; slots are expanded from these on demand"""
+    __tablename__ = "availability_rules"
+    __table_args__ = (
+        CheckConstraint("weekday BETWEEN 0 AND 6", name="ck_availability_rules_weekday"),
+        CheckConstraint("end_time > start_time", name="ck_availability_rules_hours"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    service_id = Column(UUID(as_uuid=True), ForeignKey("booking_services.id", ondelete="CASCADE"), nullable=False, index=True)
+    weekday = Column(SmallInteger, nullable=False)  # 0 = Monday ... 6 = Sunday
+    start_time = Column(Time, nullable=False)  # wall-clock time in `timezone`
+    end_time = Column(Time, nullable=False)
+    timezone = Column(String(64), nullable=False, default="UTC")  # IANA name, e.g. "America/New_York"
+    valid_from = Column(Date, nullable=True)
+    valid_until = Column(Date, nullable=True)  # inclusive
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Relationships
+    service = relationship("BookingService", back_populates="availability_rules")
+    
+    def __repr__(self):
+        return f"<AvailabilityRule(service_id={self.service_id}, weekday={self.weekday}, {self.start_time}-{self.end_time})>"
+
+
+class AvailabilityException(Base, BaseModel):
+    """One-off change to a service's hours on a date.
+
+    is_available=False closes start_time-end_time (the whole day if both are
+    empty); is_available=True opens extra hours that day.
+    """
+    __tablename__ = "availability_exceptions"
+    __table_args__ = (
+        Index("ix_availability_exceptions_service_id_date", "service_id", "date"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    service_id = Column(UUID(as_uuid=True), ForeignKey("booking_services.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=True)
+    end_time = Column(Time, nullable=True)
+    timezone = Column(String(64), nullable=False, default="UTC")
+    is_available = Column(Boolean, nullable=False, default=False)
+    reason = Column(String(255), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Relationships
+    service = relationship("BookingService", back_populates="availability_exceptions")
+    
+    def __repr__(self):
+        return f"<AvailabilityException(service_id={self.service_id}, date={self.date}, is_available={self.is_available})>"
+
+
 class Booking(Base, BaseModel):
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_slot_id", "slot_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     club_id = Column(UUID(as_uuid=True), ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False)
@@ -98,3 +170,36 @@ class Booking(Base, BaseModel):
     
     def __repr__(self):
         return f"<Booking(id={self.id}, member_id={self.member_id}, service_id={self.service_id})>"
+
+
+class SlotHold(Base, BaseModel):
+    """Seats taken on a slot while a Stripe Checkout Session is open.
+
+    The seats are counted in the slot's current_bookings from the moment the
+    hold is created; the webhook turns the hold into a Booking, the sweeper
+    gives the seats back once expires_at passes.
+    """
+    __tablename__ = "slot_holds"
+    __table_args__ = (
+        # The sweeper's scan, oldest first
+        Index("ix_slot_holds_expires_at", "expires_at"),
+        Index("ix_slot_holds_checkout_session_id", "checkout_session_id", unique=True),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    slot_id = Column(UUID(as_uuid=True), ForeignKey("booking_slots.id", ondelete="CASCADE"), nullable=False)
+    service_id = Column(UUID(as_uuid=True), ForeignKey("booking_services.id", ondelete="CASCADE"), nullable=False)
+    club_id = Column(UUID(as_uuid=True), ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False)
+    member_id = Column(UUID(as_uuid=True), ForeignKey("club_members.id", ondelete="CASCADE"), nullable=False)
+    seats = Column(Integer, nullable=False, default=1)
+    amount = Column(DECIMAL(10, 2), nullable=False)
+    notes = Column(Text, nullable=True)
+    checkout_session_id = Column(String(255), nullable=True)  # set once Stripe has created the session
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<SlotHold(id={self.id}, slot_id={self.slot_id}, expires_at={self.expires_at})>"
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db.database import Base
 from app.models.base import BaseModel
 from typing import Optional
@@ -41,6 +41,11 @@ class ChatChannel(Base, BaseModel):
 
 class ChatMessage(Base, BaseModel):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # History pages: one channel, keyset on (created_at, id), live messages only
+        Index("ix_chat_messages_channel_id_created_at_id", "channel_id", "created_at", "id",
+              postgresql_where=text("is_deleted = false")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     channel_id = Column(UUID(as_uuid=True), ForeignKey("chat_channels.id", ondelete="CASCADE"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, JSON, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, DateTime, JSON, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -43,6 +43,10 @@ class PlatformUser(Base, BaseModel):
 
 class ClubMember(Base, BaseModel):
     __tablename__ = "club_members"
+    __table_args__ = (
+        # One membership per email per club; also the conflict target for bulk imports
+        Index("ix_club_members_club_id_email", "club_id", "email", unique=True),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     club_id = Column(UUID(as_uuid=True), ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False)
@@ -1,17 +1,14 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db_session
+from app.core.templates import templates
 from app.services.club_service import ClubService
 from app.schemas.club import ClubCreate
 
 # Create router for admin routes
 router = APIRouter(prefix="/admin", tags=["admin"], include_in_schema=False)
 
-# Setup templates
-templates = Jinja2Templates(directory="templates")
-
 @router.get("/", response_class=HTMLResponse)
 async def admin_dashboard(request: Request, db: AsyncSession = Depends(get_db_session)):
     """Main admin dashboard"""
@@ -5,6 +5,8 @@ from openai import OpenAI
 import os
 from app.core.security import encryption_service
 from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.rate_limit import rate_limit
 from app.db.session import get_db_session
 from app.services.club_service import ClubService
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -116,7 +118,8 @@ Remember: You represent {club_name} and should maintain a professional, welcomin
     
     return context
 
-@router.post("/chat", response_model=ChatResponse)
+@router.post("/chat", response_model=ChatResponse,
+             dependencies=[Depends(rate_limit("ai_chat", settings.RATE_LIMIT_AI_CHAT, settings.RATE_LIMIT_AI_CHAT_CLUB))])
 async def chat_with_ai(request: ChatRequest, db: AsyncSession = Depends(get_db_session)):
     """
     Chat with AI assistant for a specific club using real database data
@@ -285,6 +288,7 @@ async def configure_openai_key(club_slug: str, openai_key: str, db: AsyncSession
         
         await db.commit()
         await db.refresh(club)
+        await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
         
         return {
             "club_slug": club_slug,
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
+from datetime import datetime
+import uuid
+from app.db.query_budget import query_budget
 from app.db.session import get_db_session
 from app.models.club import Club
 from app.schemas.club import ClubCreate, ClubUpdate, ClubResponse
 from app.services.club_service import ClubService
+from app.core.invalidation import invalidation_bus
+from app.core.conditional import etag_matches
+from app.core.sessions import Principal, member_session_token, set_session_cookie, user_session
+from app.core.rate_limit import rate_limit
+from app.core.config import settings
+from app.services.member_import_service import MemberImportService
+from app.services.export_service import ExportService, EXPORT_DATASETS, EXPORT_FORMATS
+from app.schemas.user import MemberImportResult
 
 # Create router for API endpoints
 router = APIRouter(prefix="/api/v1", tags=["api"])
@@ -13,6 +25,24 @@ router = APIRouter(prefix="/api/v1", tags=["api"])
 # Create router for API endpoints
 router = APIRouter(prefix="/api/v1", tags=["api"])
 
+async def _owned_club(db: AsyncSession, club_slug: str, principal: Optional[Principal]) -> Club:
+    """The club, if the signed-in platform user owns it: 401 if nobody is signed in, 403 if not theirs"""
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Sign in to manage this community")
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if not club:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Community '{club_slug}' not found"
+        )
+    if not await ClubService.user_owns_club(db, club, principal):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the community owner can do this")
+    return club
+
+def _revalidate_headers(etag: str) -> dict:
+    # no-cache: clients may store the response but must revalidate before reuse
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
 @router.get("/health")
 async def health_check():
     """API health check"""
@@ -26,21 +56,15 @@ async def create_club(
     """Create a new club"""
     try:
         from app.core.config import settings
-        from sqlalchemy import select, func
-        from app.models.club import Club
+        from app.services.beta_spots import beta_spots
         
         # Check if promo code is valid for beta program
         promo_code = club_data.promo_code
         is_beta_tester = False
         
         if promo_code and promo_code in settings.BETA_PROMO_CODES:
-            # Check beta tester limit
-            result = await db.execute(
-                select(func.count(Club.id)).where(Club.account_type == "lifetime_free")
-            )
-            beta_count = result.scalar() or 0
-            
-            if beta_count >= settings.BETA_TESTER_LIMIT:
+            # Check beta tester limit (cached count, kept current by recount below)
+            if await beta_spots.count() >= settings.BETA_TESTER_LIMIT:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Beta tester limit reached ({settings.BETA_TESTER_LIMIT} spots). Try again later!"
@@ -57,6 +81,8 @@ async def create_club(
             club.promo_code_used = promo_code
             await db.commit()
             await db.refresh(club)
+            await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
+            await beta_spots.recount()
         
         return ClubResponse.from_orm(club)
     except ValueError as e:
@@ -74,7 +100,7 @@ async def create_club(
 async def send_welcome_email(club_slug: str, db: AsyncSession = Depends(get_db_session)):
     """Send beta welcome email to club owner (triggered from launch page)"""
     try:
-        from sqlalchemy import select, func
+        from sqlalchemy import select
         from app.models.club import Club
         from app.services.email_service import EmailService
         import logging
@@ -102,11 +128,9 @@ async def send_welcome_email(club_slug: str, db: AsyncSession = Depends(get_db_s
         # Mark Stripe as complete
         club.stripe_onboarding_complete = True
         
-        # Count beta testers to get their number
-        count_result = await db.execute(
-            select(func.count(Club.id)).where(Club.account_type == "lifetime_free")
-        )
-        beta_number = count_result.scalar() or 1
+        # Beta tester number from the cached count
+        from app.services.beta_spots import beta_spots
+        beta_number = await beta_spots.count() or 1
         
         logger.info(f"API: Sending welcome email to {club.owner_email} (Beta Tester #{beta_number})...")
         
@@ -123,6 +147,7 @@ async def send_welcome_email(club_slug: str, db: AsyncSession = Depends(get_db_s
             club.welcome_email_sent = True
             club.welcome_email_sent_at = datetime.utcnow()
             await db.commit()
+            await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
             logger.info(f"✅ Welcome email sent to {club.owner_email}")
             return {"message": "Welcome email sent successfully"}
         else:
@@ -140,13 +165,22 @@ async def send_welcome_email(club_slug: str, db: AsyncSession = Depends(get_db_s
 
 @router.get("/clubs", response_model=List[ClubResponse])
 async def get_clubs(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db_session)
 ):
-    """Get all clubs with pagination"""
+    """Get all clubs with pagination (supports If-None-Match)"""
     try:
+        # Cheap max(updated_at)/count stamp first; the page itself is only loaded on a change
+        etag = await ClubService.get_clubs_etag(db, skip, limit)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, [etag]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_revalidate_headers(etag))
+        
         clubs = await ClubService.get_all_clubs(db, skip, limit)
+        response.headers.update(_revalidate_headers(etag))
         return [ClubResponse.from_orm(club) for club in clubs]
     except Exception as e:
         raise HTTPException(
@@ -157,16 +191,30 @@ async def get_clubs(
 @router.get("/clubs/{club_slug}", response_model=ClubResponse)
 async def get_club_by_slug(
     club_slug: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db_session)
 ):
-    """Get a club by its slug"""
+    """Get a club by its slug (supports If-None-Match)"""
     try:
+        # Pollers mostly hold the current ETag - answer them without a query
+        if_none_match = request.headers.get("if-none-match")
+        cached_etag = ClubService.cached_club_etag(club_slug)
+        if if_none_match and cached_etag and etag_matches(if_none_match, [cached_etag]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_revalidate_headers(cached_etag))
+        
         club = await ClubService.get_club_by_slug(db, club_slug)
         if not club:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Club with slug '{club_slug}' not found"
             )
+        
+        etag = ClubService.club_etag(club)
+        if if_none_match and etag_matches(if_none_match, [etag]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_revalidate_headers(etag))
+        
+        response.headers.update(_revalidate_headers(etag))
         return ClubResponse.from_orm(club)
     except HTTPException:
         raise
@@ -229,9 +277,11 @@ async def get_users():
     """Get all platform users"""
     return {"message": "Users endpoint - coming soon"}
 
-@router.post("/members/join", status_code=status.HTTP_201_CREATED)
+@router.post("/members/join", status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(rate_limit("member_join", settings.RATE_LIMIT_MEMBER_JOIN, settings.RATE_LIMIT_MEMBER_JOIN_CLUB))])
 async def join_community(
     request: dict,
+    response: Response,
     db: AsyncSession = Depends(get_db_session)
 ):
     """Create a new community member"""
@@ -257,7 +307,8 @@ async def join_community(
         new_member = ClubMember(
             id=uuid.uuid4(),
             club_id=club.id,
-            email=request.get("email"),
+            # Lowercased, like imports, so (club_id, email) is unique whatever the capitalization
+            email=(request.get("email") or "").strip().lower() or None,
             display_name=display_name,
             phone=request.get("phone"),
             member_tier="free",  # Default to free tier
@@ -267,6 +318,10 @@ async def join_community(
         db.add(new_member)
         await db.commit()
         await db.refresh(new_member)
+        await invalidation_bus.publish("club_members", club_id=str(club.id))
+        
+        # Signed in straight away; member pages read the session, not a member_id
+        set_session_cookie(response, "member", member_session_token(new_member))
         
         return {
             "success": True,
@@ -288,3 +343,144 @@ async def join_community(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create member: {str(e)}"
         )
+
+
+@router.get("/clubs/{club_slug}/services/{service_id}/availability")
+async def get_service_availability(
+    club_slug: str,
+    service_id: uuid.UUID,
+    start: datetime,
+    end: datetime,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Open slots of a booking service starting between start and end (ISO 8601; naive = UTC)"""
+    from app.services.availability_service import AvailabilityService
+    
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if not club:
+        raise HTTPException(status_code=404, detail="Club not found")
+    
+    slots = await AvailabilityService.get_available_slots(db, service_id, start, end, club_id=club.id)
+    return {"service_id": str(service_id), "slots": slots}
+
+
+async def _calendar_events(db: AsyncSession, club_slug: str, token: str, start, end, include_cancelled: bool):
+    from app.services.calendar_service import CalendarService
+
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if not club:
+        raise HTTPException(status_code=404, detail="Club not found")
+    if not CalendarService.check_feed_token(club.id, token):
+        raise HTTPException(status_code=403, detail="Invalid calendar token")
+
+    try:
+        start, end = CalendarService.window(start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    events, etag = await CalendarService.get_events(db, club.id, start, end, include_cancelled)
+    return club, start, end, events, etag
+
+
+@router.get("/clubs/{club_slug}/calendar")
+async def get_club_calendar(
+    club_slug: str,
+    request: Request,
+    token: str = "",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_cancelled: bool = False,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """A club's bookings overlapping [start, end) as JSON events (supports If-None-Match)"""
+    club, start, end, events, etag = await _calendar_events(db, club_slug, token, start, end, include_cancelled)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, [etag]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_revalidate_headers(etag))
+
+    return JSONResponse(
+        {"club": club.slug, "start": start.isoformat(), "end": end.isoformat(), "events": events},
+        headers=_revalidate_headers(etag)
+    )
+
+
+@router.get("/clubs/{club_slug}/calendar.ics")
+async def get_club_calendar_ics(
+    club_slug: str,
+    request: Request,
+    token: str = "",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_cancelled: bool = False,
+    db: AsyncSession = Depends(get_db_session)
+):
+    """iCalendar feed of a club's bookings for calendar apps to subscribe to (supports If-None-Match)"""
+    from app.services.calendar_service import CalendarService
+
+    club, start, end, events, etag = await _calendar_events(db, club_slug, token, start, end, include_cancelled)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, [etag]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_revalidate_headers(etag))
+
+    return Response(
+        content=CalendarService.to_ical(club, events, request.url.hostname or "localhost"),
+        media_type="text/calendar; charset=utf-8",
+        headers={**_revalidate_headers(etag), "Content-Disposition": f'inline; filename="{club.slug}-bookings.ics"'}
+    )
+
+
+@router.post("/clubs/{club_slug}/members/import", response_model=MemberImportResult)
+@query_budget(5)  # club, owner role, staging table; each chunk widens it (MemberImportService via allow_batch)
+async def import_members(
+    club_slug: str,
+    file: UploadFile = File(...),
+    principal: Optional[Principal] = Depends(user_session),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Bulk import members from a CSV export (email, display_name/first_name/last_name, phone, tier, status); club owners only"""
+    try:
+        club = await _owned_club(db, club_slug, principal)
+        
+        return await MemberImportService.import_members(db, club, file.file)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CSV file: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import members: {str(e)}"
+        )
+
+@router.get("/clubs/{club_slug}/export/{dataset}")
+async def export_club_data(
+    club_slug: str,
+    dataset: str,
+    format: str = "csv",
+    principal: Optional[Principal] = Depends(user_session),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Stream a club's members, bookings or payments as CSV or NDJSON; club owners only"""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export '{dataset}'. Available: {', '.join(EXPORT_DATASETS)}"
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    
+    club = await _owned_club(db, club_slug, principal)
+    
+    return StreamingResponse(
+        ExportService.stream_export(club.id, dataset, format),
+        media_type=EXPORT_FORMATS[format],
+        headers=ExportService.export_headers(club.slug, dataset, format)
+    )
@@ -0,0 +1,133 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import json
+import logging
+import math
+import uuid
+
+from app.core.config import settings
+from app.core.rate_limit import parse_limit, rate_limiter, REJECTED
+from app.core.sessions import Principal, member_session, member_socket_session
+from app.db.database import AsyncSessionLocal
+from app.db.query_budget import query_budget
+from app.db.session import get_db_session
+from app.services.chat_hub import chat_hub, CLOSE_TRY_AGAIN
+from app.services.chat_service import ChatService, ChatAccessDenied
+from app.services.club_service import ClubService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(include_in_schema=False)
+
+# Close codes the chat page understands (4000-4999 are free for applications)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+CHAT_LIMIT = parse_limit(settings.RATE_LIMIT_CHAT_MESSAGES)
+
+
+def _error(message: str, **extra) -> str:
+    return json.dumps({"type": "error", "detail": message, **extra})
+
+
+@router.websocket("/community/{club_slug}/chat/{channel_id}/ws")
+async def chat_socket(websocket: WebSocket, club_slug: str, channel_id: uuid.UUID,
+                      principal: Optional[Principal] = Depends(member_socket_session)):
+    """A member's live connection to one channel.
+
+    Client -> server: {"content": "...", "reply_to": "<message id>"}
+    Server -> client: message events (ChatService.message_event), {"type": "error"}
+    and {"type": "resync"} when messages may have been missed.
+
+    Database sessions are opened per check/message and never held for the
+    life of the socket, so idle connections cost no pool slots.
+    """
+    # Accept first so the close codes reach the page (a close before accept is a bare 403)
+    await websocket.accept()
+    if principal is None:
+        await websocket.close(code=CLOSE_UNAUTHORIZED, reason="Sign in to chat")
+        return
+
+    try:
+        async with AsyncSessionLocal() as db:
+            club = await ClubService.get_club_by_slug(db, club_slug)
+            if club is None or not (club.features or {}).get("enable_chat", True):
+                raise ChatAccessDenied("Chat is not available")
+            channel, can_post = await ChatService.open_channel(db, club, channel_id, principal)
+    except ChatAccessDenied as e:
+        await websocket.close(code=CLOSE_FORBIDDEN, reason=str(e))
+        return
+
+    connection = chat_hub.connect(websocket, str(channel.id), principal.subject_id)
+    if connection is None:
+        await websocket.close(code=CLOSE_TRY_AGAIN, reason="Chat is busy, try again shortly")
+        return
+    connection.start()
+
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                connection.offer(_error("Messages must be JSON"))
+                continue
+            if not isinstance(data, dict) or not isinstance(data.get("content"), str):
+                connection.offer(_error('Messages must be JSON objects with a "content" string'))
+                continue
+            if not can_post:
+                connection.offer(_error("This channel is read-only"))
+                continue
+
+            if settings.RATE_LIMIT_ENABLED and CHAT_LIMIT is not None:
+                retry_after = await rate_limiter.take(f"chat:member:{principal.subject_id}", CHAT_LIMIT)
+                if retry_after > 0:
+                    REJECTED.inc("chat", "member")
+                    connection.offer(_error("You're sending messages too quickly", retry_after=math.ceil(retry_after)))
+                    continue
+
+            reply_to = data.get("reply_to")
+            try:
+                if reply_to is not None:
+                    reply_to = str(uuid.UUID(str(reply_to)))
+                async with AsyncSessionLocal() as db:
+                    event = await ChatService.post_message(db, channel.id, principal, data.get("content"), reply_to)
+            except ValueError as e:
+                connection.offer(_error(str(e)))
+                continue
+            except Exception as e:
+                logger.error(f"❌ Failed to store chat message in channel {channel.id}: {e}")
+                connection.offer(_error("Message could not be sent, please try again"))
+                continue
+
+            await chat_hub.publish(event)
+    except WebSocketDisconnect:
+        pass
+    except RuntimeError:
+        # Receiving on a socket we already closed (a dropped slow consumer)
+        pass
+    finally:
+        await chat_hub.disconnect(connection)
+
+
+@router.get("/community/{club_slug}/chat/{channel_id}/messages")
+@query_budget(3)  # club, channel access, one page with authors and replies joined
+async def chat_history(club_slug: str, channel_id: uuid.UUID,
+                       before: Optional[str] = None,
+                       limit: int = Query(settings.CHAT_RECENT_MESSAGES, ge=1, le=settings.CHAT_HISTORY_PAGE_MAX),
+                       principal: Optional[Principal] = Depends(member_session),
+                       db: AsyncSession = Depends(get_db_session)):
+    """Older messages, a page at a time: pass the previous page's next_cursor as ?before="""
+    if principal is None:
+        raise HTTPException(status_code=401, detail="Sign in to read chat")
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if club is None:
+        raise HTTPException(status_code=404, detail="Club not found")
+    try:
+        channel, _ = await ChatService.open_channel(db, club, channel_id, principal)
+        return await ChatService.history(db, channel.id, before=before, limit=limit)
+    except ChatAccessDenied as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 from app.services.email_service import EmailService
+from app.core.config import settings
+from app.core.rate_limit import rate_limit
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +17,7 @@ class ContactSubmission(BaseModel):
     message: str
     newsletter: bool = False
 
-@router.post("/submit")
+@router.post("/submit", dependencies=[Depends(rate_limit("contact", settings.RATE_LIMIT_CONTACT))])
 async def submit_contact_form(data: ContactSubmission):
     """Handle contact form submission and send email"""
     try:
@@ -13,6 +13,7 @@ from app.stripe_config import (
     STRIPE_CONNECT_REDIRECT_URI,
 )
 from app.db.session import get_db_session
+from app.core.invalidation import invalidation_bus
 from app.db.crud_platform_users import set_connect_account, get_user_by_stripe_account
 from app.models.club import Club
 
@@ -47,6 +48,7 @@ async def create_express_account(body: CreateExpressAccountIn, db: AsyncSession
                 club.stripe_account_id = acct["id"]
                 await db.commit()
                 await db.refresh(club)
+                await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
         
         return {"account_id": acct["id"]}
     except Exception as e:
@@ -6,9 +6,20 @@ from app.db.session import get_db_session
 from app.db.crud_platform_users import get_user_by_stripe_account
 from app.services.club_service import ClubService
 from app.core.config import settings
+from app.core.rate_limit import rate_limit
+from app.services.availability_service import AvailabilityService, SlotUnavailable
+from app.services.slot_hold_service import SlotHoldService
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import uuid
 
 router = APIRouter(prefix="/stripe", tags=["stripe-payments"])
 
+# Stripe rejects Checkout Sessions expiring sooner than 30 minutes after
+# creation; the extra minute covers the time between computing expires_at
+# and Stripe receiving it
+STRIPE_MIN_CHECKOUT_MINUTES = 31
+
 class OneTimeCheckoutIn(BaseModel):
     price_id: str
     connected_account_id: str
@@ -38,18 +49,17 @@ def create_one_time_checkout(body: OneTimeCheckoutIn):
 # --------- Service Booking Payments ---------
 class ServiceCheckoutIn(BaseModel):
     club_slug: str
-    service_id: int
-    service_name: str
-    price_cents: int
+    service_id: str
     customer_email: str
     customer_name: str
     booking_datetime: str
     notes: str = ""
     metadata: dict = {}
 
-@router.post("/checkout/service")
+@router.post("/checkout/service",
+             dependencies=[Depends(rate_limit("checkout_service", settings.RATE_LIMIT_CHECKOUT, settings.RATE_LIMIT_CHECKOUT_CLUB))])
 async def create_service_checkout(body: ServiceCheckoutIn, db: AsyncSession = Depends(get_db_session)):
-    """Create Stripe checkout session for service booking"""
+    """Create Stripe checkout session for service booking, holding the slot until it expires"""
     try:
         # Get the club and its owner's Stripe account
         club = await ClubService.get_club_by_slug(db, body.club_slug)
@@ -62,55 +72,95 @@ async def create_service_checkout(body: ServiceCheckoutIn, db: AsyncSession = De
         
         connected_account_id = club.stripe_account_id
         
+        try:
+            service = await AvailabilityService.get_service(db, uuid.UUID(body.service_id), club.id)
+            booking_start = datetime.fromisoformat(body.booking_datetime)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid service or booking time")
+        if service is None:
+            raise HTTPException(status_code=404, detail="Service not found")
+        
+        # Charge what the club asks, never what the client sent
+        price_cents = int((Decimal(service.price or 0) * 100).quantize(Decimal(1)))
+        hold_minutes = max(settings.SLOT_HOLD_MINUTES, STRIPE_MIN_CHECKOUT_MINUTES)
+        
+        # Hold the slot for as long as Stripe keeps the session open
+        try:
+            hold = await SlotHoldService.create_hold(
+                db, club, service, booking_start,
+                customer_email=body.customer_email,
+                customer_name=body.customer_name,
+                amount=Decimal(price_cents) / 100,
+                notes=body.notes,
+                checkout_expires_at=datetime.now(timezone.utc) + timedelta(minutes=hold_minutes)
+            )
+        except SlotUnavailable as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        
         # Calculate platform fee using configurable rate
-        platform_fee_cents = int(body.price_cents * (settings.PLATFORM_COMMISSION_PERCENT / 100))
+        platform_fee_cents = int(price_cents * (settings.PLATFORM_COMMISSION_PERCENT / 100))
         
-        # Create Stripe checkout session
-        session = stripe.checkout.Session.create(
-            payment_method_types=['card'],
-            line_items=[{
-                'price_data': {
-                    'currency': 'usd',
-                    'product_data': {
-                        'name': body.service_name,
-                        'description': f'Service booking for {body.club_slug}'
+        # Create Stripe checkout session; expiry computed last so Stripe sees the full lifetime
+        checkout_expires_at = datetime.now(timezone.utc) + timedelta(minutes=hold_minutes)
+        try:
+            session = stripe.checkout.Session.create(
+                payment_method_types=['card'],
+                line_items=[{
+                    'price_data': {
+                        'currency': 'usd',
+                        'product_data': {
+                            'name': service.name,
+                            'description': f'Service booking for {body.club_slug}'
+                        },
+                        'unit_amount': price_cents,
                     },
-                    'unit_amount': body.price_cents,
+                    'quantity': 1,
+                }],
+                mode='payment',
+                customer_email=body.customer_email,
+                client_reference_id=str(hold.id),
+                expires_at=int(checkout_expires_at.timestamp()),
+                payment_intent_data={
+                    'application_fee_amount': platform_fee_cents,
+                    'transfer_data': {'destination': connected_account_id},
+                    'metadata': {
+                        'club_slug': body.club_slug,
+                        'service_id': str(body.service_id),
+                        'booking_datetime': body.booking_datetime,
+                        'customer_name': body.customer_name,
+                        'notes': body.notes,
+                        **body.metadata
+                    }
                 },
-                'quantity': 1,
-            }],
-            mode='payment',
-            customer_email=body.customer_email,
-            payment_intent_data={
-                'application_fee_amount': platform_fee_cents,
-                'transfer_data': {'destination': connected_account_id},
-                'metadata': {
+                success_url=f"https://ezclub.app/booking/success?session_id={{CHECKOUT_SESSION_ID}}",
+                cancel_url=f"https://ezclub.app/community/{body.club_slug}/book",
+                metadata={
                     'club_slug': body.club_slug,
                     'service_id': str(body.service_id),
                     'booking_datetime': body.booking_datetime,
                     'customer_name': body.customer_name,
                     'notes': body.notes,
-                    **body.metadata
+                    'hold_id': str(hold.id)
                 }
-            },
-            success_url=f"https://ezclub.app/booking/success?session_id={{CHECKOUT_SESSION_ID}}",
-            cancel_url=f"https://ezclub.app/community/{body.club_slug}/book",
-            metadata={
-                'club_slug': body.club_slug,
-                'service_id': str(body.service_id),
-                'booking_datetime': body.booking_datetime,
-                'customer_name': body.customer_name,
-                'notes': body.notes
-            }
-        )
+            )
+        except Exception:
+            # No session, no way to pay: give the seat back now rather than at expiry
+            await SlotHoldService.release(db, hold.id)
+            raise
+        
+        await SlotHoldService.attach_session(db, hold.id, session.id, checkout_expires_at)
         
         return {
             "checkout_url": session.url,
             "session_id": session.id,
+            "hold_expires_at": checkout_expires_at.isoformat(),
             "platform_fee_cents": platform_fee_cents,
-            "club_owner_receives_cents": body.price_cents - platform_fee_cents
+            "price_cents": price_cents,
+            "club_owner_receives_cents": price_cents - platform_fee_cents
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.stripe_config import STRIPE_WEBHOOK_SECRET, STRIPE_CONNECT_WEBHOOK_SECRET
 from app.db.session import get_db_session
+from app.core.invalidation import invalidation_bus
 from app.db.crud_platform_users import update_connect_status, get_user_by_stripe_account
 from app.models.club import Club
 from app.models.payment import Payment
@@ -62,9 +63,21 @@ async def webhooks_core(request: Request, db: AsyncSession = Depends(get_db_sess
                 db.add(payment)
                 await db.commit()
                 logger.info(f"✅ Payment recorded: ${payment.amount} for club {club.slug}")
+                
+                # Service checkouts: turn the slot hold into the booking
+                from app.services.slot_hold_service import SlotHoldService
+                await SlotHoldService.confirm_checkout(db, club, data)
             else:
                 logger.warning(f"Club not found for slug: {club_slug}")
 
+    if et == "checkout.session.expired":
+        # Abandoned service checkout: free its slot now instead of at the next sweep
+        from app.services.slot_hold_service import SlotHoldService
+        hold_id = SlotHoldService.hold_id_from_session(data)
+        if hold_id is not None:
+            if await SlotHoldService.release(db, hold_id):
+                logger.info(f"Released slot hold {hold_id} for expired checkout {data.get('id')}")
+
     if et == "invoice.payment_succeeded":
         # Recurring subscription payment succeeded
         invoice_id = data.get("id")
@@ -124,22 +137,20 @@ async def webhooks_connect(request: Request, db: AsyncSession = Depends(get_db_s
             if club:
                 club.stripe_onboarding_complete = True
                 await db.commit()
+                await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
                 
                 # Send beta welcome email to beta testers (only once)
                 if club.account_type == "lifetime_free" and not club.welcome_email_sent:
                     logger.info(f"Club {club.slug} is a beta tester, preparing to send welcome email...")
                     
                     from app.services.email_service import EmailService
-                    from sqlalchemy import func
                     
                     if not club.owner_email:
                         logger.warning(f"Cannot send welcome email to {club.slug} - no owner_email set")
                     else:
-                        # Count beta testers to get their number
-                        count_result = await db.execute(
-                            select(func.count(Club.id)).where(Club.account_type == "lifetime_free")
-                        )
-                        beta_number = count_result.scalar() or 1
+                        # Beta tester number from the cached count
+                        from app.services.beta_spots import beta_spots
+                        beta_number = await beta_spots.count() or 1
                         
                         logger.info(f"Sending beta welcome email to {club.owner_email} (Beta Tester #{beta_number})...")
                         
@@ -156,6 +167,7 @@ async def webhooks_connect(request: Request, db: AsyncSession = Depends(get_db_s
                             club.welcome_email_sent = True
                             club.welcome_email_sent_at = datetime.utcnow()
                             await db.commit()
+                            await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
                             logger.info(f"✅ Beta welcome email sent successfully to {club.owner_email} for club {club.slug}")
                         else:
                             logger.error(f"❌ Failed to send beta welcome email to {club.owner_email}")
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Request, Depends, HTTPException, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db_session
+from app.core.templates import templates
+from app.core.password_hashing import password_hasher
+from app.core.sessions import Principal, user_session, user_session_token, set_session_cookie, clear_session_cookie, revoke_session
 from app.services.club_service import ClubService
 from app.models.user import PlatformUser, ClubMember
 from app.models.club import Club
@@ -12,9 +14,6 @@ from typing import Optional
 # Create router for user routes
 router = APIRouter(prefix="/user", tags=["users"], include_in_schema=False)
 
-# Setup templates
-templates = Jinja2Templates(directory="templates")
-
 @router.get("/{username}/profile", response_class=HTMLResponse)
 async def user_profile(request: Request, username: str, db: AsyncSession = Depends(get_db_session)):
     """Dynamic user profile page - ONE route serves ALL users"""
@@ -259,11 +258,11 @@ async def create_user(
                 "error": "Username or email already exists"
             })
         
-        # Create new user (password should be hashed in production)
+        # Create new user (bcrypt runs in the hashing pool, off the event loop)
         new_user = PlatformUser(
             username=username,
             email=email,
-            password_hash=password,  # TODO: Hash password properly
+            password_hash=await password_hasher.hash(password),
             first_name=first_name,
             last_name=last_name,
             is_active=True
@@ -273,7 +272,9 @@ async def create_user(
         await db.commit()
         await db.refresh(new_user)
         
-        return RedirectResponse(url=f"/user/{username}/dashboard", status_code=302)
+        response = RedirectResponse(url=f"/user/{username}/dashboard", status_code=302)
+        set_session_cookie(response, "user", user_session_token(new_user))
+        return response
         
     except Exception as e:
         return templates.TemplateResponse("user_signup.html", {
@@ -302,18 +303,33 @@ async def login_user(
         )
         user = result.scalar_one_or_none()
         
-        # Simple password check (use proper hashing in production)
-        if not user or user.password_hash != password:
+        # Verified in the hashing pool; legacy plaintext or outdated hashes get replaced
+        valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash if user else None)
+        if not valid:
             return templates.TemplateResponse("user_login.html", {
                 "request": request,
                 "error": "Invalid username or password"
             })
         
-        # In production, set up proper session management
-        return RedirectResponse(url=f"/user/{username}/dashboard", status_code=302)
+        if new_hash:
+            user.password_hash = new_hash
+            await db.commit()
+        
+        response = RedirectResponse(url=f"/user/{username}/dashboard", status_code=302)
+        set_session_cookie(response, "user", user_session_token(user))
+        return response
         
     except Exception as e:
         return templates.TemplateResponse("user_login.html", {
             "request": request,
             "error": f"Login failed: {str(e)}"
-        })
\ No newline at end of file
+        })
+
+@router.get("/logout")
+async def logout_user(principal: Optional[Principal] = Depends(user_session)):
+    """Sign out (in every worker) and clear the session cookie"""
+    if principal is not None:
+        await revoke_session(principal)
+    response = RedirectResponse(url="/user/login", status_code=302)
+    clear_session_cookie(response, "user")
+    return response
@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.session import get_db_session
+from app.db.query_budget import query_budget
+from app.core.templates import templates
+from app.core.page_cache import page_cache
+from app.core.fragment_cache import dashboard_fragments
+from app.core.invalidation import invalidation_bus
+from app.core.config import settings
+from app.core.sessions import (
+    Principal, member_session, user_session, member_session_token, set_session_cookie,
+    clear_session_cookie, refresh_session_cookie, revoke_session,
+)
 from app.services.club_service import ClubService
 from app.schemas.club import ClubCreate
 import random
@@ -16,73 +25,56 @@ logger = logging.getLogger(__name__)
 # Create router for web pages
 router = APIRouter(include_in_schema=False)
 
-# Setup templates
-templates = Jinja2Templates(directory="templates")
+# Plans accepted by /signup?plan=...
+SIGNUP_PLANS = ("starter", "pro", "enterprise")
 
 @router.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Main sales/landing page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return page_cache.render(request, "index.html")
 
 @router.get("/pricing", response_class=HTMLResponse)
 async def pricing(request: Request):
     """Pricing page"""
-    return templates.TemplateResponse("pricing.html", {"request": request})
+    return page_cache.render(request, "pricing.html")
 
 @router.get("/demo", response_class=HTMLResponse)
 async def demo(request: Request):
     """Demo page"""
-    return templates.TemplateResponse("demo.html", {"request": request})
+    return page_cache.render(request, "demo.html")
 
 @router.get("/features", response_class=HTMLResponse)
 async def features(request: Request):
     """Features page"""
-    return templates.TemplateResponse("features.html", {"request": request})
+    return page_cache.render(request, "features.html")
 
 @router.get("/about", response_class=HTMLResponse)
 async def about(request: Request):
     """About page for Webwise Solutions"""
-    return templates.TemplateResponse("about.html", {"request": request})
+    return page_cache.render(request, "about.html")
 
 @router.get("/contact", response_class=HTMLResponse)
 async def contact(request: Request):
     """Contact page"""
-    return templates.TemplateResponse("contact.html", {"request": request})
+    return page_cache.render(request, "contact.html")
 
 @router.get("/sitemap", response_class=HTMLResponse)
 async def sitemap(request: Request):
     """HTML Sitemap page"""
-    return templates.TemplateResponse("sitemap.html", {"request": request})
+    return page_cache.render(request, "sitemap.html")
 
 @router.get("/beta", response_class=HTMLResponse)
 async def beta_signup_page(request: Request):
     """Beta tester signup page"""
-    return templates.TemplateResponse("beta-signup.html", {"request": request})
+    return page_cache.render(request, "beta-signup.html")
 
 @router.get("/api/v1/beta/remaining-spots")
-async def get_remaining_beta_spots(db: AsyncSession = Depends(get_db_session)):
-    """API endpoint to check remaining beta tester spots"""
-    from sqlalchemy import select, func
-    from app.models.club import Club
-    from app.core.config import settings
+async def get_remaining_beta_spots():
+    """API endpoint to check remaining beta tester spots (cached; see BetaSpots)"""
+    from app.services.beta_spots import beta_spots
     
     try:
-        # Count current beta testers
-        result = await db.execute(
-            select(func.count(Club.id)).where(Club.account_type == "lifetime_free")
-        )
-        current_count = result.scalar() or 0
-        
-        # Calculate remaining
-        limit = getattr(settings, 'BETA_TESTER_LIMIT', 10)
-        remaining = max(0, limit - current_count)
-        
-        return {
-            "limit": limit,
-            "current": current_count,
-            "remaining": remaining,
-            "is_full": remaining == 0
-        }
+        return await beta_spots.get()
     except Exception as e:
         logger.error(f"Error fetching beta spots: {e}")
         # Return default values on error
@@ -93,18 +85,35 @@ async def get_remaining_beta_spots(db: AsyncSession = Depends(get_db_session)):
             "is_full": False
         }
 
+@router.get("/api/v1/beta/remaining-spots/stream")
+async def stream_remaining_beta_spots():
+    """Server-sent events with the remaining beta spots, pushed when a spot is taken"""
+    from fastapi.responses import StreamingResponse
+    from app.services.beta_spots import beta_spots
+    
+    queue = beta_spots.open_stream()
+    if queue is None:
+        # The page falls back to polling
+        raise HTTPException(status_code=503, detail="Too many open streams", headers={"Retry-After": "60"})
+    
+    return StreamingResponse(
+        beta_spots.events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/login", response_class=HTMLResponse)
 async def login(request: Request):
     """Login page"""
-    return templates.TemplateResponse("login.html", {"request": request})
+    return page_cache.render(request, "login.html")
 
 @router.get("/signup", response_class=HTMLResponse)
 async def signup(request: Request, plan: str = None):
     """Signup page with optional plan parameter"""
-    return templates.TemplateResponse("signup.html", {
-        "request": request,
-        "selected_plan": plan
-    })
+    # Only known plans get their own cache entry; anything else renders the default page
+    if plan not in SIGNUP_PLANS:
+        plan = None
+    return page_cache.render(request, "signup.html", {"selected_plan": plan}, key=("signup.html", plan))
 
 @router.get("/onboarding", response_class=HTMLResponse)
 async def onboarding(request: Request):
@@ -112,16 +121,18 @@ async def onboarding(request: Request):
     return templates.TemplateResponse("onboarding.html", {"request": request})
 
 @router.get("/stripe-setup", response_class=HTMLResponse)
-async def stripe_setup(request: Request):
+async def stripe_setup(request: Request, principal: Optional[Principal] = Depends(user_session)):
     """Stripe setup page"""
-    # For now, we'll pass a test user_id - in production this would come from session/auth
-    # TODO: Implement proper user session management
-    test_user_id = "test-user-123"  # This should be replaced with real user session
+    # The Connect account is attached to the signed-in platform user
+    if principal is None:
+        return RedirectResponse(url="/user/login", status_code=302)
     
-    return templates.TemplateResponse("stripe-setup.html", {
+    response = templates.TemplateResponse("stripe-setup.html", {
         "request": request,
-        "user_id": test_user_id
+        "user_id": principal.subject_id
     })
+    refresh_session_cookie(response, principal)
+    return response
 
 @router.get("/launch", response_class=HTMLResponse)
 async def launch(request: Request, db: AsyncSession = Depends(get_db_session)):
@@ -133,7 +144,7 @@ async def launch(request: Request, db: AsyncSession = Depends(get_db_session)):
         club_slug = request.query_params.get('club_slug')
         
         if club_slug:
-            from sqlalchemy import select, func
+            from sqlalchemy import select
             from app.models.club import Club
             from app.services.email_service import EmailService
             
@@ -147,11 +158,9 @@ async def launch(request: Request, db: AsyncSession = Depends(get_db_session)):
                 # Mark Stripe as complete
                 club.stripe_onboarding_complete = True
                 
-                # Count beta testers to get number
-                count_result = await db.execute(
-                    select(func.count(Club.id)).where(Club.account_type == "lifetime_free")
-                )
-                beta_number = count_result.scalar() or 1
+                # Beta tester number from the cached count
+                from app.services.beta_spots import beta_spots
+                beta_number = await beta_spots.count() or 1
                 
                 # Send email
                 email_sent = EmailService.send_beta_welcome_email(
@@ -168,6 +177,7 @@ async def launch(request: Request, db: AsyncSession = Depends(get_db_session)):
                     logger.info(f"✅ Welcome email sent to {club.owner_email} on launch page")
                 
                 await db.commit()
+                await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
                 
     except Exception as e:
         logger.error(f"Error sending welcome email on launch: {str(e)}")
@@ -198,19 +208,16 @@ MOCK_CLUBS = {
 }
 
 @router.get("/community/{club_slug}/", response_class=HTMLResponse)
+@query_budget(10)  # club (+3 if created on first visit), 4 analytics counts, 2 panel queries on fragment misses
 async def club_dashboard(request: Request, club_slug: str, db: AsyncSession = Depends(get_db_session)):
     """Community owner dashboard with real database data"""
     
     # Get or create club from database
     club = await ClubService.get_or_create_club(db, club_slug)
     
-    # Get club analytics
+    # Live counters - a handful of aggregate queries, never cached
     analytics = await ClubService.get_club_analytics(db, club)
     
-    # Get recent members and bookings
-    recent_members_db = await ClubService.get_recent_members(db, club, 5)
-    recent_bookings_db = await ClubService.get_recent_bookings(db, club, 5)
-    
     # Convert club to dictionary format for template
     club_data = {
         "id": str(club.id),
@@ -251,105 +258,146 @@ async def club_dashboard(request: Request, club_slug: str, db: AsyncSession = De
         "new_members_this_month": analytics["new_members_this_month"],
         "conversion_rate": analytics["conversion_rate"]
     }
-    
-    # Mock membership tiers (TODO: Get from database)
     total_members = analytics["total_members"]
-    membership_tiers = [
-        {
-            "name": "Basic",
-            "price": 29,
-            "interval": "month",
-            "member_count": int(total_members * 0.7),
-            "percentage": 70
-        },
-        {
-            "name": "Premium",
-            "price": 59,
-            "interval": "month", 
-            "member_count": int(total_members * 0.25),
-            "percentage": 25
-        },
-        {
-            "name": "VIP",
-            "price": 99,
-            "interval": "month",
-            "member_count": int(total_members * 0.05),
-            "percentage": 5
-        }
-    ]
     
-    # Convert recent members to template format
-    recent_members = []
-    for member in recent_members_db:
-        recent_members.append({
-            "name": member.display_name or member.email.split('@')[0],
-            "avatar_url": None,
-            "joined_date": member.created_at.strftime("%B %d, %Y"),
-            "tier": member.member_tier or "Basic"
-        })
-    
-    # Add mock members if we don't have enough real ones
-    mock_names = ["John Doe", "Jane Smith", "Mike Johnson", "Alice Brown", "Bob Davis"]
-    while len(recent_members) < 3:
-        recent_members.append({
-            "name": mock_names[len(recent_members)],
-            "avatar_url": None,
-            "joined_date": "Recently",
-            "tier": "Basic"
-        })
-    
-    # Convert recent bookings to template format
-    upcoming_bookings = []
-    for booking in recent_bookings_db:
-        upcoming_bookings.append({
-            "member_name": f"Member {str(booking.id)[:8]}",  # TODO: Get actual member name
-            "service_name": "Service",  # TODO: Get service name from booking_services
-            "date_time": booking.booking_time.strftime("%B %d, %I:%M %p") if booking.booking_time else "TBD",
-            "amount": int(booking.price / 100) if booking.price else 0
-        })
+    # Slow-changing panels are rendered from the fragment cache. The builders
+    # below only run (and only query) on a miss; club and member writes publish on
+    # the invalidation bus, which bumps the club's fragment version in every worker.
+    recent_members = None
     
-    # Only show real bookings - no mock data
+    async def get_recent_members():
+        nonlocal recent_members
+        if recent_members is None:
+            recent_members_db = await ClubService.get_recent_members(db, club, 5)
+            
+            # Convert recent members to template format
+            recent_members = []
+            for member in recent_members_db:
+                recent_members.append({
+                    "name": member.display_name or member.email.split('@')[0],
+                    "avatar_url": None,
+                    "joined_date": member.created_at.strftime("%B %d, %Y"),
+                    "tier": member.member_tier or "Basic"
+                })
+            
+            # Add mock members if we don't have enough real ones
+            mock_names = ["John Doe", "Jane Smith", "Mike Johnson", "Alice Brown", "Bob Davis"]
+            while len(recent_members) < 3:
+                recent_members.append({
+                    "name": mock_names[len(recent_members)],
+                    "avatar_url": None,
+                    "joined_date": "Recently",
+                    "tier": "Basic"
+                })
+        return recent_members
     
-    # Real recent activities - only show actual member joins for now
-    recent_activities = []
-    if recent_members:
-        for member in recent_members[:2]:  # Show max 2 recent member joins
+    async def activity_context():
+        # Real recent activities - only show actual member joins for now
+        recent_activities = []
+        for member in (await get_recent_members())[:2]:  # Show max 2 recent member joins
             recent_activities.append({
                 "icon": "fa-user-plus",
                 "description": f"{member['name']} joined",
                 "timestamp": member.get('joined_date', 'Recent'),
                 "amount": None
             })
+        
+        # If no real activities, show a helpful message
+        if not recent_activities:
+            recent_activities = [
+                {
+                    "icon": "fa-info-circle",
+                    "description": "No recent activity yet",
+                    "timestamp": "Welcome!",
+                    "amount": None
+                }
+            ]
+        return {"recent_activities": recent_activities}
     
-    # If no real activities, show a helpful message
-    if not recent_activities:
-        recent_activities = [
+    async def bookings_context():
+        recent_bookings_db = await ClubService.get_recent_bookings(db, club, 5)
+        
+        # Convert recent bookings to template format - only real bookings, no mock data
+        upcoming_bookings = []
+        for booking in recent_bookings_db:
+            upcoming_bookings.append({
+                "member_name": f"Member {str(booking.id)[:8]}",  # TODO: Get actual member name
+                "service_name": "Service",  # TODO: Get service name from booking_services
+                "date_time": booking.booking_time.strftime("%B %d, %I:%M %p") if booking.booking_time else "TBD",
+                "amount": int(booking.price / 100) if booking.price else 0
+            })
+        return {"club": club_data, "upcoming_bookings": upcoming_bookings}
+    
+    async def tiers_context():
+        # Mock membership tiers (TODO: Get from database)
+        membership_tiers = [
             {
-                "icon": "fa-info-circle",
-                "description": "No recent activity yet",
-                "timestamp": "Welcome!",
-                "amount": None
+                "name": "Basic",
+                "price": 29,
+                "interval": "month",
+                "member_count": int(total_members * 0.7),
+                "percentage": 70
+            },
+            {
+                "name": "Premium",
+                "price": 59,
+                "interval": "month", 
+                "member_count": int(total_members * 0.25),
+                "percentage": 25
+            },
+            {
+                "name": "VIP",
+                "price": 99,
+                "interval": "month",
+                "member_count": int(total_members * 0.05),
+                "percentage": 5
             }
         ]
+        return {"membership_tiers": membership_tiers}
     
-    # Real notifications based on club data
-    notifications = [
-        {
-            "icon": "fa-bell",
-            "message": f"Club {club.name} dashboard loaded successfully",
-            "timestamp": "Now"
-        },
-        {
-            "icon": "fa-chart-line",
-            "message": f"Total members: {analytics['total_members']}",
-            "timestamp": "Now"
-        },
-        {
-            "icon": "fa-database",
-            "message": f"Club created: {club.created_at.strftime('%B %d, %Y')}",
-            "timestamp": club.created_at.strftime("%B %d")
-        }
-    ]
+    async def members_context():
+        return {"recent_members": await get_recent_members()}
+    
+    async def notifications_context():
+        # Real notifications based on club data
+        notifications = [
+            {
+                "icon": "fa-bell",
+                "message": f"Club {club.name} dashboard loaded successfully",
+                "timestamp": "Now"
+            },
+            {
+                "icon": "fa-chart-line",
+                "message": f"Total members: {total_members}",
+                "timestamp": "Now"
+            },
+            {
+                "icon": "fa-database",
+                "message": f"Club created: {club.created_at.strftime('%B %d, %Y')}",
+                "timestamp": club.created_at.strftime("%B %d")
+            }
+        ]
+        return {"notifications": notifications}
+    
+    version = (club.updated_at,)
+    fragments = {
+        "activity": await dashboard_fragments.render(
+            club.id, "activity", "dashboard_activity_panel.html", activity_context, version
+        ),
+        "bookings": await dashboard_fragments.render(
+            club.id, "bookings", "dashboard_bookings_panel.html", bookings_context, version
+        ),
+        # Panels derived from the live member count are keyed on it as well
+        "tiers": await dashboard_fragments.render(
+            club.id, "tiers", "dashboard_tiers_panel.html", tiers_context, version + (total_members,)
+        ),
+        "members": await dashboard_fragments.render(
+            club.id, "members", "dashboard_members_panel.html", members_context, version
+        ),
+        "notifications": await dashboard_fragments.render(
+            club.id, "notifications", "dashboard_notifications_panel.html", notifications_context, version + (total_members,)
+        ),
+    }
     
     # Mock chart data (TODO: Get real revenue data by month)
     revenue_chart_labels = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
@@ -370,11 +418,7 @@ async def club_dashboard(request: Request, club_slug: str, db: AsyncSession = De
         "avg_session_time": analytics_data["avg_session_time"],
         "new_members_this_month": analytics_data["new_members_this_month"],
         "conversion_rate": analytics_data["conversion_rate"],
-        "membership_tiers": membership_tiers,
-        "recent_activities": recent_activities,
-        "upcoming_bookings": upcoming_bookings,
-        "recent_members": recent_members,
-        "notifications": notifications,
+        "fragments": fragments,
         "revenue_chart_labels": revenue_chart_labels,
         "revenue_chart_data": revenue_chart_data,
         "current_time": current_time
@@ -427,45 +471,62 @@ async def club_members_list(request: Request, club_slug: str, db: AsyncSession =
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading members: {str(e)}")
 
+async def _member_link_login(db: AsyncSession, club, member_id: str, next_url: str):
+    """Exchange a pre-session ?member_id= link for a session cookie, then drop the id from the URL"""
+    from app.models.user import ClubMember
+    import uuid
+    
+    try:
+        member_uuid = uuid.UUID(member_id)
+    except ValueError:
+        return RedirectResponse(url=f"/community/{club.slug}/join")
+    
+    result = await db.execute(
+        select(ClubMember).where(
+            ClubMember.id == member_uuid,
+            ClubMember.club_id == club.id,
+            ClubMember.status == "active"
+        )
+    )
+    member = result.scalar_one_or_none()
+    if not member:
+        return RedirectResponse(url=f"/community/{club.slug}/join")
+    
+    response = RedirectResponse(url=next_url, status_code=302)
+    set_session_cookie(response, "member", member_session_token(member))
+    return response
+
+def _signed_in_member(principal: Optional[Principal], club) -> Optional[Principal]:
+    # Member sessions are per club
+    if principal is not None and principal.club_id == str(club.id):
+        return principal
+    return None
+
 # Member-specific routes (MUST come before the generic {member_id} route)
 @router.get("/community/{club_slug}/member/dashboard", response_class=HTMLResponse)
-async def member_dashboard(request: Request, club_slug: str, member_id: str = None, db: AsyncSession = Depends(get_db_session)):
+@query_budget(2)  # club, bookings - the member comes from the session token
+async def member_dashboard(request: Request, club_slug: str, member_id: str = None,
+                           principal: Optional[Principal] = Depends(member_session),
+                           db: AsyncSession = Depends(get_db_session)):
     """Member dashboard - personalized view for community members"""
     try:
-        from app.models.user import ClubMember
         from app.models.booking import Booking
-        from datetime import datetime
         
         # Get club
         club = await ClubService.get_club_by_slug(db, club_slug)
         if not club:
             raise HTTPException(status_code=404, detail="Community not found")
         
-        # Get member - for now using member_id from query param or session
-        # Later: Get from authentication session
-        if not member_id:
-            member_id = request.query_params.get('member_id')
-        
-        if not member_id:
-            # Redirect to join page if no member_id
+        member = _signed_in_member(principal, club)
+        if member is None:
+            if member_id and settings.SESSION_ALLOW_MEMBER_ID_LINKS:
+                return await _member_link_login(db, club, member_id, f"/community/{club_slug}/member/dashboard")
             return RedirectResponse(url=f"/community/{club_slug}/join")
         
-        # Get member from database
-        result = await db.execute(
-            select(ClubMember).where(
-                ClubMember.id == member_id,
-                ClubMember.club_id == club.id
-            )
-        )
-        member = result.scalar_one_or_none()
-        
-        if not member:
-            raise HTTPException(status_code=404, detail="Member not found")
-        
         # Get member's bookings
         bookings_result = await db.execute(
             select(Booking).where(
-                Booking.member_id == member.id,
+                Booking.member_id == member.subject_id,
                 Booking.club_id == club.id
             ).order_by(Booking.created_at.desc())
         )
@@ -500,24 +561,26 @@ async def member_dashboard(request: Request, club_slug: str, member_id: str = No
             }
         }
         
-        # Member data
+        # Member data (sessions are only issued to active members)
         member_data = {
-            "id": str(member.id),
-            "display_name": member.display_name or "Member",
+            "id": member.subject_id,
+            "display_name": member.name or "Member",
             "email": member.email,
-            "phone": member.phone,
-            "member_tier": member.member_tier,
-            "status": member.status
+            "phone": None,
+            "member_tier": member.tier,
+            "status": "active"
         }
         
-        return templates.TemplateResponse("member_dashboard.html", {
+        response = templates.TemplateResponse("member_dashboard.html", {
             "request": request,
             "club": club_data,
             "member": member_data,
             "upcoming_bookings": upcoming_bookings,
             "total_bookings": len(all_bookings),
-            "member_since": member.created_at.strftime("%B %Y")
+            "member_since": member.joined
         })
+        refresh_session_cookie(response, member)
+        return response
         
     except HTTPException:
         raise
@@ -526,7 +589,9 @@ async def member_dashboard(request: Request, club_slug: str, member_id: str = No
         raise HTTPException(status_code=500, detail="Error loading dashboard")
 
 @router.get("/community/{club_slug}/member/profile", response_class=HTMLResponse)
-async def member_profile_edit(request: Request, club_slug: str, member_id: str = None, db: AsyncSession = Depends(get_db_session)):
+async def member_profile_edit(request: Request, club_slug: str, member_id: str = None,
+                              principal: Optional[Principal] = Depends(member_session),
+                              db: AsyncSession = Depends(get_db_session)):
     """Member profile edit page"""
     try:
         from app.models.user import ClubMember
@@ -536,17 +601,16 @@ async def member_profile_edit(request: Request, club_slug: str, member_id: str =
         if not club:
             raise HTTPException(status_code=404, detail="Community not found")
         
-        # Get member_id from query param
-        if not member_id:
-            member_id = request.query_params.get('member_id')
-        
-        if not member_id:
+        signed_in = _signed_in_member(principal, club)
+        if signed_in is None:
+            if member_id and settings.SESSION_ALLOW_MEMBER_ID_LINKS:
+                return await _member_link_login(db, club, member_id, f"/community/{club_slug}/member/profile")
             return RedirectResponse(url=f"/community/{club_slug}/join")
         
-        # Get member from database
+        # The edit form shows current values, so read the row rather than the token
         result = await db.execute(
             select(ClubMember).where(
-                ClubMember.id == member_id,
+                ClubMember.id == signed_in.subject_id,
                 ClubMember.club_id == club.id
             )
         )
@@ -574,12 +638,14 @@ async def member_profile_edit(request: Request, club_slug: str, member_id: str =
             "status": member.status
         }
         
-        return templates.TemplateResponse("member_profile.html", {
+        response = templates.TemplateResponse("member_profile.html", {
             "request": request,
             "club": club_data,
             "member": member_data,
             "member_since": member.created_at.strftime("%B %Y")
         })
+        refresh_session_cookie(response, signed_in)
+        return response
         
     except HTTPException:
         raise
@@ -587,6 +653,15 @@ async def member_profile_edit(request: Request, club_slug: str, member_id: str =
         logger.error(f"Error loading member profile edit for {club_slug}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error loading profile page")
 
+@router.get("/community/{club_slug}/member/logout")
+async def member_logout(club_slug: str, principal: Optional[Principal] = Depends(member_session)):
+    """Sign the member out (in every worker) and clear the cookie"""
+    if principal is not None:
+        await revoke_session(principal)
+    response = RedirectResponse(url=f"/community/{club_slug}/join", status_code=302)
+    clear_session_cookie(response, "member")
+    return response
+
 @router.get("/community/{club_slug}/member/{member_id}", response_class=HTMLResponse)
 async def club_member_profile(request: Request, club_slug: str, member_id: str, db: AsyncSession = Depends(get_db_session)):
     """Individual member profile within a club (for owner viewing member details)"""
@@ -634,14 +709,8 @@ async def booking_management(request: Request, club_slug: str, db: AsyncSession
             "logo_url": club.logo_url
         }
     
-        # Get booking services from database
-        booking_services = await ClubService.get_booking_services(db, club.id)
-        
-        # Filter out deleted services (same logic as public booking)
-        deleted_service_ids = request.cookies.get('deleted_services', '')
-        if deleted_service_ids:
-            deleted_ids = [int(x) for x in deleted_service_ids.split(',') if x.isdigit()]
-            booking_services = [s for s in booking_services if s['id'] not in deleted_ids]
+        # Get booking services from database (uncached so the owner sees their own edits)
+        booking_services = await ClubService.get_booking_services(db, club.id, use_cache=False)
         
         # Mock recent bookings
         all_recent_bookings = [
@@ -699,15 +768,24 @@ async def booking_management(request: Request, club_slug: str, db: AsyncSession
         logger.error(f"Error loading booking management page for club {club_slug}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error loading booking management page")
 
+async def _owned_club(db: AsyncSession, club_slug: str, principal: Optional[Principal]):
+    """The club, if the signed-in platform user owns it: 401 if nobody is signed in, 403 if not theirs"""
+    if principal is None:
+        raise HTTPException(status_code=401, detail="Sign in to manage this community")
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if not club:
+        raise HTTPException(status_code=404, detail="Club not found")
+    if not await ClubService.user_owns_club(db, club, principal):
+        raise HTTPException(status_code=403, detail="Only the community owner can do this")
+    return club
+
 @router.post("/community/{club_slug}/services")
-async def create_booking_service(request: Request, club_slug: str, db: AsyncSession = Depends(get_db_session)):
+async def create_booking_service(request: Request, club_slug: str,
+                                 principal: Optional[Principal] = Depends(user_session),
+                                 db: AsyncSession = Depends(get_db_session)):
     """Create a new booking service"""
+    club = await _owned_club(db, club_slug, principal)
     try:
-        # Get the club
-        club = await ClubService.get_club_by_slug(db, club_slug)
-        if not club:
-            raise HTTPException(status_code=404, detail="Club not found")
-        
         # Get the service data from request body
         service_data = await request.json()
         
@@ -716,33 +794,81 @@ async def create_booking_service(request: Request, club_slug: str, db: AsyncSess
         
         return {"success": True, "service": new_service}
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error creating service for club {club_slug}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error creating service")
 
 @router.delete("/community/{club_slug}/services/{service_id}")
-async def delete_booking_service(request: Request, club_slug: str, service_id: int):
+async def delete_booking_service(request: Request, club_slug: str, service_id: str,
+                                 principal: Optional[Principal] = Depends(user_session),
+                                 db: AsyncSession = Depends(get_db_session)):
     """Delete a booking service"""
-    # In production, this would delete from database
-    # For demo, we'll use cookies to track deleted services
+    from fastapi.responses import JSONResponse
+    import uuid
     
-    # Get current deleted services from cookies
-    deleted_services = request.cookies.get('deleted_services', '')
-    deleted_ids = [int(x) for x in deleted_services.split(',') if x.isdigit()]
+    club = await _owned_club(db, club_slug, principal)
     
-    # Add the new service ID to deleted list
-    if service_id not in deleted_ids:
-        deleted_ids.append(service_id)
+    try:
+        service_uuid = uuid.UUID(service_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Service not found")
     
-    # Convert back to cookie string
-    deleted_services_str = ','.join(map(str, deleted_ids))
+    deleted = await ClubService.delete_booking_service(db, club.id, service_uuid)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Service not found")
     
-    # Return response with updated cookie
-    from fastapi.responses import JSONResponse
     response = JSONResponse({"success": True, "message": "Service deleted successfully"})
-    response.set_cookie("deleted_services", deleted_services_str)
+    # Clear the cookie older versions used to hide deleted services
+    response.delete_cookie("deleted_services")
     return response
 
+async def _owned_club_service(db: AsyncSession, club_slug: str, service_id: str, principal: Optional[Principal]):
+    """The club's service, if the signed-in platform user owns the club: 401/403 otherwise"""
+    import uuid
+    from app.services.availability_service import AvailabilityService
+
+    club = await _owned_club(db, club_slug, principal)
+    try:
+        service_uuid = uuid.UUID(service_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Service not found")
+    service = await AvailabilityService.get_service(db, service_uuid, club.id)
+    if service is None:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return service
+
+@router.get("/community/{club_slug}/services/{service_id}/availability-rules")
+async def get_availability_rules(club_slug: str, service_id: str,
+                                 principal: Optional[Principal] = Depends(user_session),
+                                 db: AsyncSession = Depends(get_db_session)):
+    """Weekly hours and date exceptions a service's bookable slots are generated from"""
+    from app.services.availability_service import AvailabilityService
+
+    service = await _owned_club_service(db, club_slug, service_id, principal)
+    return await AvailabilityService.get_rules(db, service.id)
+
+@router.put("/community/{club_slug}/services/{service_id}/availability-rules")
+async def set_availability_rules(request: Request, club_slug: str, service_id: str,
+                                 principal: Optional[Principal] = Depends(user_session),
+                                 db: AsyncSession = Depends(get_db_session)):
+    """Replace a service's weekly hours and exceptions.
+
+    Body: {"rules": [{"weekday": 0, "start_time": "09:00", "end_time": "17:00", "timezone": "America/New_York"}],
+           "exceptions": [{"date": "2026-12-25", "is_available": false, "reason": "Closed"}]}
+    """
+    from app.services.availability_service import AvailabilityService
+
+    service = await _owned_club_service(db, club_slug, service_id, principal)
+    data = await request.json()
+    try:
+        await AvailabilityService.set_rules(db, service.id, data.get("rules") or [], data.get("exceptions") or [])
+    except (ValueError, KeyError, TypeError) as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Invalid availability: {e}")
+    return {"success": True, **await AvailabilityService.get_rules(db, service.id)}
+
 @router.delete("/community/{club_slug}/bookings/{booking_id}")
 async def delete_booking(request: Request, club_slug: str, booking_id: int):
     """Delete a booking"""
@@ -767,21 +893,38 @@ async def delete_booking(request: Request, club_slug: str, booking_id: int):
     return response
 
 @router.get("/community/{club_slug}/calendar", response_class=HTMLResponse)
-async def calendar_view(request: Request, club_slug: str):
-    """Calendar view for club bookings"""
-    # Mock club data
+async def calendar_view(request: Request, club_slug: str,
+                        principal: Optional[Principal] = Depends(user_session),
+                        db: AsyncSession = Depends(get_db_session)):
+    """Calendar view for club bookings (the page loads each visible month from the calendar feed).
+
+    Owners only: the page carries the feed token, which reads every booking.
+    """
+    from app.services.calendar_service import CalendarService
+
+    if principal is None:
+        return RedirectResponse(url="/user/login", status_code=302)
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if not club:
+        raise HTTPException(status_code=404, detail="Club not found")
+    if not await ClubService.user_owns_club(db, club, principal):
+        raise HTTPException(status_code=403, detail="Only the community owner can view the booking calendar")
+
     club_data = {
-        "name": f"Club {club_slug.title()}",
-        "slug": club_slug,
+        "name": club.name,
+        "slug": club.slug,
         "description": "View all your bookings in calendar format",
-        "primary_color": "#0075c4",
-        "secondary_color": "#0267C1",
-        "logo_url": None
+        "primary_color": club.primary_color or "#0075c4",
+        "secondary_color": club.secondary_color or "#0267C1",
+        "logo_url": club.logo_url
     }
-    
+
+    feed_token = CalendarService.feed_token(club.id)
     return templates.TemplateResponse("calendar.html", {
         "request": request,
-        "club": club_data
+        "club": club_data,
+        "feed_token": feed_token,
+        "ical_url": f"{str(request.base_url).rstrip('/')}/api/v1/clubs/{club.slug}/calendar.ics?token={feed_token}"
     })
 
 @router.get("/community/{club_slug}/settings", response_class=HTMLResponse)
@@ -818,44 +961,54 @@ async def club_settings(request: Request, club_slug: str, db: AsyncSession = Dep
         raise HTTPException(status_code=500, detail=f"Error loading settings: {str(e)}")
 
 @router.get("/community/{club_slug}/chat", response_class=HTMLResponse)
-async def chat_view(request: Request, club_slug: str):
-    """Chat interface for club members"""
-    # Mock club data
+async def chat_view(request: Request, club_slug: str, channel: Optional[str] = None,
+                    principal: Optional[Principal] = Depends(member_session),
+                    db: AsyncSession = Depends(get_db_session)):
+    """Chat interface for club members; new messages arrive over the channel's WebSocket"""
+    from app.services.chat_service import ChatService
+    
+    club = await ClubService.get_club_by_slug(db, club_slug)
+    if not club:
+        raise HTTPException(status_code=404, detail="Club not found")
+    member = _signed_in_member(principal, club)
+    if member is None:
+        return RedirectResponse(url=f"/community/{club_slug}/join")
+    
+    channels = [c for c in await ChatService.get_channels(db, club.id) if ChatService.can_read(c, member)]
+    if not channels:
+        raise HTTPException(status_code=403, detail="No chat channels available")
+    current = next((c for c in channels if str(c.id) == channel), channels[0])
+    page = await ChatService.history(db, current.id)
+    
     club_data = {
-        "name": f"Club {club_slug.title()}",
-        "slug": club_slug,
-        "description": "Connect and chat with your community",
-        "primary_color": "#0075c4",
-        "secondary_color": "#0267C1",
-        "logo_url": None
+        "name": club.name,
+        "slug": club.slug,
+        "description": club.description,
+        "primary_color": club.primary_color,
+        "secondary_color": club.secondary_color,
+        "logo_url": club.logo_url
     }
-    
-    # Empty chat channels (no fake data)
-    channels = [
+    channel_data = [
         {
-            "id": "general",
-            "name": "General",
-            "description": "General community chat",
-            "unread_count": 0,
-            "last_message": "No messages yet",
-            "last_message_time": "",
-            "last_message_author": ""
+            "id": str(c.id),
+            "name": c.name,
+            "description": c.description or "",
+            "unread_count": 0
         }
+        for c in channels
     ]
     
-    # Empty online members list (no fake members)
-    online_members = []
-    
-    # Empty recent messages (no fake messages)
-    recent_messages = []
-    
     return templates.TemplateResponse("chat.html", {
         "request": request,
         "club": club_data,
-        "channels": channels,
-        "online_members": online_members,
-        "recent_messages": recent_messages,
-        "current_channel": "general"
+        "channels": channel_data,
+        "current": next(c for c in channel_data if c["id"] == str(current.id)),
+        "online_members": [],
+        "recent_messages": page["messages"],
+        "history_cursor": page["next_cursor"],
+        "current_channel": str(current.id),
+        "member_id": member.subject_id,
+        "ws_path": f"/community/{club_slug}/chat/{current.id}/ws"
     })
 
 @router.get("/community/{club_slug}/ai-terminal", response_class=HTMLResponse)
@@ -1036,12 +1189,6 @@ async def public_booking(request: Request, club_slug: str, db: AsyncSession = De
         # Get booking services from database
         booking_services = await ClubService.get_booking_services(db, club.id)
         
-        # Filter out deleted services (same logic as booking management)
-        deleted_service_ids = request.cookies.get('deleted_services', '')
-        if deleted_service_ids:
-            deleted_ids = [int(x) for x in deleted_service_ids.split(',') if x.isdigit()]
-            booking_services = [s for s in booking_services if s.id not in deleted_ids]
-        
         # Convert club to dictionary format for template
         club_data = {
             "id": str(club.id),
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
@@ -44,3 +44,25 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+
+
+class MemberImportRow(BaseModel):
+    email: EmailStr
+    display_name: Optional[str] = Field(None, max_length=100)
+    phone: Optional[str] = Field(None, max_length=20)
+    member_tier: Optional[str] = Field(default=None, pattern="^(free|basic|premium|vip)$")  # None: keep / default
+    status: Optional[str] = Field(default=None, pattern="^(active|suspended|banned)$")
+
+
+class MemberImportError(BaseModel):
+    row: int
+    error: str
+
+
+class MemberImportResult(BaseModel):
+    total_rows: int = 0
+    imported: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[MemberImportError] = Field(default_factory=list)
+    errors_truncated: bool = False
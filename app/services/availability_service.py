@@ -0,0 +1,434 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, insert, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import uuid
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.models.booking import AvailabilityException, AvailabilityRule, BookingService, BookingSlot
+
+# Widest window one availability query may ask for
+MAX_AVAILABILITY_RANGE = timedelta(days=92)
+
+# Windows kept per service in the expansion cache
+MAX_CACHED_WINDOWS = 64
+
+# Rule expansions per service: {(window_start, window_end, duration): (slot starts, ...)}
+_expansion_cache = TTLCache("availability_expansion", ttl_seconds=settings.AVAILABILITY_EXPANSION_CACHE_TTL)
+
+invalidation_bus.subscribe("availability_rules", lambda data: _expansion_cache.delete(data["service_id"]))
+invalidation_bus.on_reset(_expansion_cache.clear)
+
+
+class SlotUnavailable(ValueError):
+    """The slot is full, closed, already started or doesn't exist"""
+
+
+def _aware(value: datetime) -> datetime:
+    # Naive datetimes from query strings are taken as UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def slot_id_for(service_id: uuid.UUID, start: datetime) -> uuid.UUID:
+    """Stable id of the slot a service's rules produce at `start`.
+
+    Virtual slots are listed under this id and materialized with it, so a
+    client can book an id it was shown whether or not the row exists yet.
+    """
+    return uuid.uuid5(service_id, _aware(start).astimezone(timezone.utc).isoformat())
+
+
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+def _local_interval(day: date, start: Optional[time], end: Optional[time], zone: ZoneInfo) -> Tuple[datetime, datetime]:
+    """Wall-clock hours on a local date as a UTC interval; no times means the whole day"""
+    begin = datetime.combine(day, start or time.min, tzinfo=zone)
+    finish = datetime.combine(day, end, tzinfo=zone) if end else datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+    return begin.astimezone(timezone.utc), finish.astimezone(timezone.utc)
+
+
+def expand_rules(
+    rules: Iterable[AvailabilityRule], exceptions: Iterable[AvailabilityException],
+    duration: timedelta, window_start: datetime, window_end: datetime
+) -> List[datetime]:
+    """Back-to-back slot starts (UTC) in [window_start, window_end) from weekly rules.
+
+    Open exceptions add hours on their date, closed ones remove any slot that
+    overlaps them. Pure: no I/O, so results can be cached and reused.
+    """
+    # Local dates can straddle UTC days, so look one day either side
+    first_day = window_start.date() - timedelta(days=1)
+    days = (window_end.date() - first_day).days + 2
+    open_intervals: List[Tuple[datetime, datetime]] = []
+    closed_intervals: List[Tuple[datetime, datetime]] = []
+
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        for rule in rules:
+            if rule.weekday != day.weekday():
+                continue
+            if (rule.valid_from and day < rule.valid_from) or (rule.valid_until and day > rule.valid_until):
+                continue
+            open_intervals.append(_local_interval(day, rule.start_time, rule.end_time, _zone(rule.timezone)))
+
+    last_day = first_day + timedelta(days=days)
+    for exception in exceptions:
+        if not first_day <= exception.date < last_day:
+            continue
+        interval = _local_interval(exception.date, exception.start_time, exception.end_time, _zone(exception.timezone))
+        (open_intervals if exception.is_available else closed_intervals).append(interval)
+
+    starts = set()
+    for begin, finish in open_intervals:
+        slot = begin
+        while slot + duration <= finish:
+            if window_start <= slot < window_end and not any(
+                slot < closed_end and slot + duration > closed_start
+                for closed_start, closed_end in closed_intervals
+            ):
+                starts.add(slot)
+            slot += duration
+    return sorted(starts)
+
+
+class AvailabilityService:
+    """Slot availability and capacity reservations.
+
+    Capacity lives on the slot row (current_bookings / max_capacity). It is
+    only ever changed with a single conditional UPDATE, so concurrent
+    checkouts can't both take the last seat: Postgres re-checks the WHERE
+    clause against the committed row after waiting on the row lock.
+    """
+
+    @staticmethod
+    async def get_slot_starts(
+        db: AsyncSession, service: BookingService, start: datetime, end: datetime
+    ) -> List[datetime]:
+        """Starts of the service's rule-based slots in [start, end).
+
+        Expansions are cached per service for whole UTC days, so neighbouring
+        requests for the same week share one expansion (and skip loading the
+        rules). set_rules evicts the service in every worker.
+        """
+        start, end = _aware(start), _aware(end)
+        window_start = datetime.combine(start.astimezone(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+        window_end = datetime.combine(end.astimezone(timezone.utc).date() + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        duration = timedelta(minutes=service.duration_minutes)
+        key = (window_start, window_end, duration)
+
+        windows = _expansion_cache.get(str(service.id))
+        if windows is None:
+            windows = {}
+            _expansion_cache.set(str(service.id), windows)
+        starts = windows.get(key)
+        if starts is None:
+            rules = (await db.execute(
+                select(AvailabilityRule).where(AvailabilityRule.service_id == service.id)
+            )).scalars().all()
+            exceptions = (await db.execute(
+                select(AvailabilityException).where(
+                    and_(
+                        AvailabilityException.service_id == service.id,
+                        AvailabilityException.date >= window_start.date() - timedelta(days=1),
+                        AvailabilityException.date <= window_end.date() + timedelta(days=1)
+                    )
+                )
+            )).scalars().all()
+            starts = tuple(expand_rules(rules, exceptions, duration, window_start, window_end)) if rules or exceptions else ()
+            if len(windows) >= MAX_CACHED_WINDOWS:
+                windows.pop(next(iter(windows)))
+            windows[key] = starts
+        return [slot for slot in starts if start <= slot < end]
+
+    @staticmethod
+    async def get_service(db: AsyncSession, service_id: uuid.UUID, club_id: uuid.UUID = None) -> Optional[BookingService]:
+        conditions = [BookingService.id == service_id, BookingService.is_active == True]
+        if club_id is not None:
+            conditions.append(BookingService.club_id == club_id)
+        result = await db.execute(select(BookingService).where(and_(*conditions)))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _bookable_window(service: BookingService, start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+        # The service's own booking horizon: no sooner than min_advance_hours, no further than max_advance_days
+        now = datetime.now(timezone.utc)
+        start = max(_aware(start), now + timedelta(hours=service.min_advance_hours or 0))
+        end = min(_aware(end), start + MAX_AVAILABILITY_RANGE)
+        if service.max_advance_days:
+            end = min(end, now + timedelta(days=service.max_advance_days))
+        return start, end
+
+    @staticmethod
+    async def get_available_slots(
+        db: AsyncSession, service_id: uuid.UUID, start: datetime, end: datetime,
+        club_id: uuid.UUID = None, limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """Open slots for a service starting in [start, end), earliest first.
+
+        Slots come from the service's availability rules (virtual until booked)
+        plus any stored BookingSlot rows, which carry the booking counts. With
+        club_id the service must also be an active service of that club.
+        """
+        service = await AvailabilityService.get_service(db, service_id, club_id)
+        if service is None:
+            return []
+        start, end = AvailabilityService._bookable_window(service, start, end)
+        if end <= start:
+            return []
+
+        # Stored rows, full ones included, so they override their virtual twins
+        result = await db.execute(
+            select(
+                BookingSlot.id,
+                BookingSlot.start_time,
+                BookingSlot.end_time,
+                BookingSlot.is_available,
+                BookingSlot.max_capacity,
+                BookingSlot.current_bookings,
+            )
+            .where(
+                and_(
+                    BookingSlot.service_id == service_id,
+                    BookingSlot.start_time >= start,
+                    BookingSlot.start_time < end
+                )
+            )
+        )
+        stored = {row.start_time: row for row in result}
+
+        slots = [
+            {
+                "start": row.start_time,
+                "id": row.id,
+                "end": row.end_time,
+                "capacity": row.max_capacity,
+                "remaining": row.max_capacity - row.current_bookings,
+            }
+            for row in stored.values()
+            if row.is_available and row.current_bookings < row.max_capacity
+        ]
+        capacity = service.max_participants or 1
+        duration = timedelta(minutes=service.duration_minutes)
+        for slot_start in await AvailabilityService.get_slot_starts(db, service, start, end):
+            if slot_start not in stored:
+                slots.append({
+                    "start": slot_start,
+                    "id": slot_id_for(service.id, slot_start),
+                    "end": slot_start + duration,
+                    "capacity": capacity,
+                    "remaining": capacity,
+                })
+
+        slots.sort(key=lambda slot: slot["start"])
+        return [
+            {
+                "id": str(slot["id"]),
+                "start_time": slot["start"].isoformat(),
+                "end_time": slot["end"].isoformat(),
+                "capacity": slot["capacity"],
+                "remaining": slot["remaining"],
+            }
+            for slot in slots[:limit]
+        ]
+
+    @staticmethod
+    async def reserve_at(db: AsyncSession, service: BookingService, start: datetime, seats: int = 1) -> Dict[str, Any]:
+        """Take seats on the service's slot at `start`, materializing it first if it's virtual.
+
+        The row is inserted under slot_id_for(...) with ON CONFLICT DO NOTHING,
+        so two first bookings of the same slot end up on one row.
+        """
+        start = _aware(start).astimezone(timezone.utc)
+        result = await db.execute(
+            select(BookingSlot.id).where(
+                and_(BookingSlot.service_id == service.id, BookingSlot.start_time == start)
+            ).limit(1)
+        )
+        slot_id = result.scalar()
+        if slot_id is None:
+            window_start, window_end = AvailabilityService._bookable_window(service, start, start + timedelta(seconds=1))
+            if window_start != start or window_end <= start or \
+                    start not in await AvailabilityService.get_slot_starts(db, service, start, window_end):
+                raise SlotUnavailable("This time slot is no longer available")
+            slot_id = slot_id_for(service.id, start)
+            await db.execute(
+                pg_insert(BookingSlot)
+                .values(
+                    id=slot_id,
+                    service_id=service.id,
+                    start_time=start,
+                    end_time=start + timedelta(minutes=service.duration_minutes),
+                    is_available=True,
+                    max_capacity=service.max_participants or 1,
+                    current_bookings=0,
+                )
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+        return await AvailabilityService.reserve(db, slot_id, seats)
+
+    @staticmethod
+    async def reserve(db: AsyncSession, slot_id: uuid.UUID, seats: int = 1) -> Dict[str, Any]:
+        """Take seats on a slot, or raise SlotUnavailable.
+
+        Holds the slot's row lock until the caller commits or rolls back, so
+        commit promptly (and roll back if what follows fails).
+        """
+        result = await db.execute(
+            update(BookingSlot)
+            .where(
+                and_(
+                    BookingSlot.id == slot_id,
+                    BookingSlot.is_available == True,
+                    BookingSlot.start_time > func.now(),
+                    BookingSlot.current_bookings + seats <= BookingSlot.max_capacity
+                )
+            )
+            .values(current_bookings=BookingSlot.current_bookings + seats, updated_at=func.now())
+            .returning(BookingSlot.id, BookingSlot.service_id, BookingSlot.start_time,
+                       BookingSlot.end_time, BookingSlot.max_capacity, BookingSlot.current_bookings)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            raise SlotUnavailable("This time slot is no longer available")
+        return {
+            "slot_id": str(row.id),
+            "service_id": str(row.service_id),
+            "start_time": row.start_time.isoformat(),
+            "end_time": row.end_time.isoformat(),
+            "remaining": row.max_capacity - row.current_bookings,
+        }
+
+    @staticmethod
+    async def release(db: AsyncSession, slot_id: uuid.UUID, seats: int = 1) -> bool:
+        """Give seats back (cancellation, expired hold); never goes below zero"""
+        result = await db.execute(
+            update(BookingSlot)
+            .where(and_(BookingSlot.id == slot_id, BookingSlot.current_bookings >= seats))
+            .values(current_bookings=BookingSlot.current_bookings - seats, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    async def create_slots(
+        db: AsyncSession, service: BookingService, starts: Iterable[datetime], capacity: int = None
+    ) -> int:
+        """Bulk-insert slots of the service's duration; the caller commits"""
+        capacity = capacity or service.max_participants or 1
+        duration = timedelta(minutes=service.duration_minutes)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "service_id": service.id,
+                "start_time": _aware(start),
+                "end_time": _aware(start) + duration,
+                "is_available": True,
+                "max_capacity": capacity,
+                "current_bookings": 0,
+            }
+            for start in starts
+        ]
+        if rows:
+            await db.execute(insert(BookingSlot), rows)
+        return len(rows)
+
+    @staticmethod
+    async def get_rules(db: AsyncSession, service_id: uuid.UUID) -> Dict[str, List[Dict[str, Any]]]:
+        """A service's weekly rules and upcoming exceptions, in set_rules' format"""
+        rules = (await db.execute(
+            select(AvailabilityRule)
+            .where(AvailabilityRule.service_id == service_id)
+            .order_by(AvailabilityRule.weekday, AvailabilityRule.start_time)
+        )).scalars().all()
+        exceptions = (await db.execute(
+            select(AvailabilityException)
+            .where(
+                and_(
+                    AvailabilityException.service_id == service_id,
+                    AvailabilityException.date >= date.today() - timedelta(days=1)
+                )
+            )
+            .order_by(AvailabilityException.date)
+        )).scalars().all()
+        return {
+            "rules": [
+                {
+                    "weekday": rule.weekday,
+                    "start_time": rule.start_time.strftime("%H:%M"),
+                    "end_time": rule.end_time.strftime("%H:%M"),
+                    "timezone": rule.timezone,
+                    "valid_from": rule.valid_from.isoformat() if rule.valid_from else None,
+                    "valid_until": rule.valid_until.isoformat() if rule.valid_until else None,
+                }
+                for rule in rules
+            ],
+            "exceptions": [
+                {
+                    "date": exception.date.isoformat(),
+                    "start_time": exception.start_time.strftime("%H:%M") if exception.start_time else None,
+                    "end_time": exception.end_time.strftime("%H:%M") if exception.end_time else None,
+                    "timezone": exception.timezone,
+                    "is_available": exception.is_available,
+                    "reason": exception.reason,
+                }
+                for exception in exceptions
+            ],
+        }
+
+    @staticmethod
+    async def set_rules(
+        db: AsyncSession, service_id: uuid.UUID,
+        rules: List[Dict[str, Any]], exceptions: List[Dict[str, Any]]
+    ) -> None:
+        """Replace a service's rules and exceptions; raises ValueError on bad input.
+
+        Already materialized slots are left alone - they may hold bookings.
+        """
+        def parse_time(value) -> Optional[time]:
+            return time.fromisoformat(value) if value else None
+
+        def parse_date(value) -> Optional[date]:
+            return date.fromisoformat(value) if value else None
+
+        new_rules = []
+        for rule in rules:
+            weekday = int(rule["weekday"])
+            start, end = parse_time(rule.get("start_time")), parse_time(rule.get("end_time"))
+            if not 0 <= weekday <= 6 or start is None or end is None or end <= start:
+                raise ValueError(f"Invalid availability rule: {rule}")
+            tz = rule.get("timezone") or "UTC"
+            _zone(tz)
+            new_rules.append(AvailabilityRule(
+                service_id=service_id, weekday=weekday, start_time=start, end_time=end, timezone=tz,
+                valid_from=parse_date(rule.get("valid_from")), valid_until=parse_date(rule.get("valid_until"))
+            ))
+
+        new_exceptions = []
+        for exception in exceptions:
+            start, end = parse_time(exception.get("start_time")), parse_time(exception.get("end_time"))
+            is_available = bool(exception.get("is_available", False))
+            if (start is None) != (end is None) or (start and end <= start) or (is_available and start is None):
+                raise ValueError(f"Invalid availability exception: {exception}")
+            tz = exception.get("timezone") or "UTC"
+            _zone(tz)
+            new_exceptions.append(AvailabilityException(
+                service_id=service_id, date=date.fromisoformat(exception["date"]), start_time=start, end_time=end,
+                timezone=tz, is_available=is_available, reason=exception.get("reason")
+            ))
+
+        await db.execute(delete(AvailabilityRule).where(AvailabilityRule.service_id == service_id))
+        await db.execute(delete(AvailabilityException).where(AvailabilityException.service_id == service_id))
+        db.add_all(new_rules + new_exceptions)
+        await db.commit()
+
+        await invalidation_bus.publish("availability_rules", service_id=str(service_id))
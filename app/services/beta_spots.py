@@ -0,0 +1,103 @@
+from sqlalchemy import select, func
+from typing import Dict, Optional, Set
+import asyncio
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.db.database import AsyncSessionLocal
+from app.models.club import Club
+
+logger = logging.getLogger(__name__)
+
+
+class BetaSpots:
+    """Cached count of beta-tester (lifetime_free) clubs.
+
+    Readers - the signup page's stream and poll endpoints, the limit check in
+    create_club, the welcome email's "Beta Tester #N" - get the cached number,
+    so their cost doesn't grow with visitors. Only the beta signup path
+    recounts, then publishes the new number over the invalidation bus; every
+    worker stores it and pushes it to its open SSE streams. BETA_SPOTS_CACHE_TTL
+    bounds drift from anything that changes clubs behind the app's back.
+    """
+
+    def __init__(self):
+        self._count: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._streams: Set[asyncio.Queue] = set()
+
+    def snapshot(self, count: int) -> Dict:
+        limit = settings.BETA_TESTER_LIMIT
+        remaining = max(0, limit - count)
+        return {"limit": limit, "current": count, "remaining": remaining, "is_full": remaining == 0}
+
+    async def _query(self) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(func.count(Club.id)).where(Club.account_type == "lifetime_free"))
+            return result.scalar() or 0
+
+    async def count(self) -> int:
+        if self._count is not None and time.monotonic() - self._loaded_at < settings.BETA_SPOTS_CACHE_TTL:
+            return self._count
+        async with self._lock:
+            # Another request may have loaded it while we waited
+            if self._count is None or time.monotonic() - self._loaded_at >= settings.BETA_SPOTS_CACHE_TTL:
+                self.set_count(await self._query())
+        return self._count
+
+    async def get(self) -> Dict:
+        return self.snapshot(await self.count())
+
+    async def recount(self) -> int:
+        """Recount after a beta club is created and tell every worker"""
+        count = await self._query()
+        await invalidation_bus.publish("beta_spots", count=count)
+        return count
+
+    def set_count(self, count: int) -> None:
+        changed = self._count is not None and count != self._count
+        self._count = count
+        self._loaded_at = time.monotonic()
+        if changed:
+            event = self.snapshot(count)
+            for queue in self._streams:
+                queue.put_nowait(event)
+
+    def expire(self) -> None:
+        self._loaded_at = 0.0
+
+    def open_stream(self) -> Optional[asyncio.Queue]:
+        """Register an SSE listener; None once BETA_SPOTS_MAX_STREAMS are open in this worker"""
+        if len(self._streams) >= settings.BETA_SPOTS_MAX_STREAMS:
+            return None
+        queue: asyncio.Queue = asyncio.Queue()
+        self._streams.add(queue)
+        return queue
+
+    def close_stream(self, queue: asyncio.Queue) -> None:
+        self._streams.discard(queue)
+
+    async def events(self, queue: asyncio.Queue):
+        """Server-sent events: the current numbers, then every change, with keep-alive comments"""
+        try:
+            yield f"retry: 5000\ndata: {json.dumps(await self.get())}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.BETA_SPOTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Also refreshes the count if nothing was published within the TTL
+                    await self.count()
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            self.close_stream(queue)
+
+
+beta_spots = BetaSpots()
+invalidation_bus.subscribe("beta_spots", lambda data: beta_spots.set_count(int(data["count"])))
+invalidation_bus.on_reset(beta_spots.expire)
@@ -0,0 +1,183 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, literal_column
+from typing import List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
+import uuid
+
+from app.core.config import settings
+from app.models.booking import Booking, BookingService, BookingSlot
+from app.models.club import Club
+from app.models.user import ClubMember
+
+# Widest window one feed request may ask for
+MAX_CALENDAR_RANGE = timedelta(days=400)
+
+# Window served to subscribed iCal clients, which don't send one
+FEED_PAST = timedelta(days=30)
+FEED_AHEAD = timedelta(days=180)
+
+MAX_CALENDAR_EVENTS = 2000
+
+ICS_STATUS = {"confirmed": "CONFIRMED", "completed": "CONFIRMED", "pending": "TENTATIVE", "cancelled": "CANCELLED"}
+
+
+def _tstzrange(start, end):
+    # Must match the expression of ix_booking_slots_time_range for the GiST index to be used
+    return func.tstzrange(start, end, literal_column("'[)'"))
+
+
+def _ics_text(value: str) -> str:
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def _ics_time(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _ics_fold(line: str) -> str:
+    """Fold a content line to 75 octets (RFC 5545 3.1)"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, start, width = [], 0, 75
+    while start < len(data):
+        end = min(start + width, len(data))
+        # Don't split a UTF-8 sequence
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start, width = end, 74
+    return "\r\n ".join(parts)
+
+
+class CalendarService:
+    """A club's bookings over a time window, as JSON events or an iCalendar feed.
+
+    Only the requested window is read: slots are found with an overlap test
+    on tstzrange(start_time, end_time), served by the GiST index
+    ix_booking_slots_time_range, so a month view costs the same however much
+    booking history the club has.
+    """
+
+    @staticmethod
+    def feed_token(club_id: uuid.UUID) -> str:
+        """Secret for a club's feed URLs; calendar apps can't send the owner's cookies"""
+        return hmac.new(settings.SECRET_KEY.encode(), f"calendar:{club_id}".encode(), hashlib.sha256).hexdigest()[:32]
+
+    @staticmethod
+    def check_feed_token(club_id: uuid.UUID, token: str) -> bool:
+        return bool(token) and hmac.compare_digest(CalendarService.feed_token(club_id), token)
+
+    @staticmethod
+    def window(start: datetime = None, end: datetime = None) -> Tuple[datetime, datetime]:
+        """The requested window with naive times taken as UTC, defaulting to the feed window and capped.
+
+        Raises ValueError if it ends before it starts.
+        """
+        # Whole days, so the default window (and so the ETag) is stable between polls
+        now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        start = start or now - FEED_PAST
+        end = end or now + FEED_AHEAD
+        start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+        end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+        if start >= end:
+            raise ValueError("start must be before end")
+        return start, min(end, start + MAX_CALENDAR_RANGE)
+
+    @staticmethod
+    async def get_events(
+        db: AsyncSession, club_id: uuid.UUID, start: datetime, end: datetime, include_cancelled: bool = False
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Bookings whose slot overlaps [start, end), earliest first, and a weak ETag for them"""
+        conditions = [
+            _tstzrange(BookingSlot.start_time, BookingSlot.end_time).op("&&")(_tstzrange(start, end)),
+            Booking.club_id == club_id,
+        ]
+        if not include_cancelled:
+            conditions.append(Booking.status != "cancelled")
+        result = await db.execute(
+            select(
+                Booking.id,
+                Booking.status,
+                Booking.amount,
+                Booking.notes,
+                Booking.updated_at,
+                BookingSlot.start_time,
+                BookingSlot.end_time,
+                BookingService.id.label("service_id"),
+                BookingService.name.label("service_name"),
+                ClubMember.display_name,
+                ClubMember.email,
+                ClubMember.phone,
+            )
+            .select_from(BookingSlot)
+            .join(Booking, Booking.slot_id == BookingSlot.id)
+            .join(BookingService, BookingService.id == BookingSlot.service_id)
+            .outerjoin(ClubMember, ClubMember.id == Booking.member_id)
+            .where(and_(*conditions))
+            .order_by(BookingSlot.start_time, Booking.id)
+            .limit(MAX_CALENDAR_EVENTS)
+        )
+        rows = result.all()
+
+        # Any change to a booking bumps its updated_at; a rescheduled slot moves its start_time
+        digest = hashlib.sha1(f"{start.isoformat()}|{end.isoformat()}|{include_cancelled}".encode())
+        for row in rows:
+            digest.update(f"|{row.id}:{row.updated_at.timestamp()}:{row.start_time.timestamp()}".encode())
+        etag = f'W/"cal-{digest.hexdigest()[:20]}"'
+
+        events = [
+            {
+                "id": str(row.id),
+                "service_id": str(row.service_id),
+                "service_name": row.service_name,
+                "start": row.start_time.isoformat(),
+                "end": row.end_time.isoformat(),
+                "status": row.status,
+                "amount": float(row.amount or 0),
+                "client_name": row.display_name or row.email or "Member",
+                "email": row.email,
+                "phone": row.phone,
+                "notes": row.notes,
+                "updated_at": row.updated_at.isoformat(),
+            }
+            for row in rows
+        ]
+        return events, etag
+
+    @staticmethod
+    def to_ical(club: Club, events: List[Dict[str, Any]], host: str) -> str:
+        """Render events as an RFC 5545 VCALENDAR"""
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//EZClub//Club Bookings//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_ics_text(club.name)} bookings",
+            "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+            "X-PUBLISHED-TTL:PT15M",
+        ]
+        for event in events:
+            details = [f"Client: {event['client_name']}"]
+            if event["email"]:
+                details.append(f"Email: {event['email']}")
+            if event["phone"]:
+                details.append(f"Phone: {event['phone']}")
+            if event["notes"]:
+                details.append(event["notes"])
+            lines += [
+                "BEGIN:VEVENT",
+                f"UID:{event['id']}@{host}",
+                f"DTSTAMP:{_ics_time(datetime.fromisoformat(event['updated_at']))}",
+                f"DTSTART:{_ics_time(datetime.fromisoformat(event['start']))}",
+                f"DTEND:{_ics_time(datetime.fromisoformat(event['end']))}",
+                f"SUMMARY:{_ics_text(event['service_name'])} - {_ics_text(event['client_name'])}",
+                f"DESCRIPTION:{_ics_text(chr(10).join(details))}",
+                f"STATUS:{ICS_STATUS.get(event['status'], 'CONFIRMED')}",
+                "END:VEVENT",
+            ]
+        lines.append("END:VCALENDAR")
+        return "\r\n".join(_ics_fold(line) for line in lines) + "\r\n"
@@ -0,0 +1,180 @@
+from typing import Any, Dict, Optional, Set
+import asyncio
+import json
+import logging
+
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus
+from app.core.metrics import registry
+from app.db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+CONNECTIONS = registry.gauge("chat_connections", "Open chat sockets in this worker")
+DELIVERED = registry.counter("chat_messages_delivered_total", "Chat messages queued to sockets in this worker")
+DROPPED = registry.counter("chat_slow_consumers_dropped_total", "Chat sockets closed because their send queue filled up")
+
+# pg_notify payloads must stay under 8000 bytes; bigger messages go out by id
+# and each worker loads them from the database
+MAX_INLINE_PAYLOAD = 7000
+
+# Close codes the page understands: reconnect (and reload what was missed)
+CLOSE_TRY_AGAIN = 1013
+
+
+class ChatConnection:
+    """One member's socket on one channel, with a bounded outgoing queue.
+
+    Messages are queued without waiting; a sender task drains the queue into
+    the socket. A consumer that can't keep up fills its queue and is closed
+    with CLOSE_TRY_AGAIN instead of holding up everyone else's delivery or
+    growing memory without bound.
+    """
+
+    def __init__(self, websocket, channel_id: str, member_id: str):
+        self.websocket = websocket
+        self.channel_id = channel_id
+        self.member_id = member_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHAT_SEND_QUEUE)
+        self.closing = False
+        self._sender: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._sender = asyncio.create_task(self._send_loop())
+
+    def offer(self, text: str) -> bool:
+        """Queue a message; False (and the socket is being closed) if the consumer is too slow"""
+        if self.closing:
+            return False
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            self.closing = True
+            DROPPED.inc()
+            logger.info(f"Dropping slow chat consumer {self.member_id} on channel {self.channel_id}")
+            asyncio.create_task(self._close(CLOSE_TRY_AGAIN, "Too slow, reconnect"))
+            return False
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Disconnected; the receive loop notices and cleans up
+            self.closing = True
+
+    async def _close(self, code: int, reason: str) -> None:
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    async def stop(self) -> None:
+        self.closing = True
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+
+
+class ChatHub:
+    """This worker's chat sockets, by channel.
+
+    A posted message is published on chat_bus: this worker delivers it to its
+    own sockets straight away, and every other worker gets it over the same
+    Postgres LISTEN/NOTIFY or Redis pub/sub transport as cache invalidations
+    (on CHAT_CHANNEL) and delivers it to theirs. Each message is serialized
+    once per worker, whatever the number of sockets.
+    """
+
+    def __init__(self):
+        self._channels: Dict[str, Set[ChatConnection]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def connect(self, websocket, channel_id: str, member_id: str) -> Optional[ChatConnection]:
+        """Register a socket; None once CHAT_MAX_CONNECTIONS are open in this worker"""
+        if self._count >= settings.CHAT_MAX_CONNECTIONS:
+            return None
+        connection = ChatConnection(websocket, channel_id, member_id)
+        self._channels.setdefault(channel_id, set()).add(connection)
+        self._count += 1
+        CONNECTIONS.set(self._count)
+        return connection
+
+    async def disconnect(self, connection: ChatConnection) -> None:
+        members = self._channels.get(connection.channel_id)
+        if members is not None and connection in members:
+            members.discard(connection)
+            if not members:
+                del self._channels[connection.channel_id]
+            self._count -= 1
+            CONNECTIONS.set(self._count)
+        await connection.stop()
+
+    def deliver(self, channel_id: str, event: Dict[str, Any]) -> int:
+        """Queue an event to every socket on the channel in this worker; returns how many took it"""
+        connections = self._channels.get(channel_id)
+        if not connections:
+            return 0
+        text = json.dumps(event)
+        delivered = 0
+        for connection in list(connections):
+            if connection.offer(text):
+                delivered += 1
+        DELIVERED.inc(amount=delivered)
+        return delivered
+
+    def broadcast(self, event: Dict[str, Any]) -> None:
+        """Queue an event to every socket in this worker"""
+        text = json.dumps(event)
+        for connections in list(self._channels.values()):
+            for connection in list(connections):
+                connection.offer(text)
+
+    async def publish(self, event: Dict[str, Any]) -> None:
+        """Deliver a stored message here and in every other worker"""
+        if len(json.dumps(event)) > MAX_INLINE_PAYLOAD:
+            await chat_bus.publish("message_ref", channel_id=event["channel_id"], id=event["id"])
+        else:
+            await chat_bus.publish("message", **event)
+
+    def _on_message(self, data: Dict[str, Any]) -> None:
+        self.deliver(data["channel_id"], data)
+
+    def _on_message_ref(self, data: Dict[str, Any]) -> None:
+        if data["channel_id"] in self._channels:
+            asyncio.create_task(self._load_and_deliver(data["channel_id"], data["id"]))
+
+    async def _load_and_deliver(self, channel_id: str, message_id: str) -> None:
+        import uuid
+        from app.services.chat_service import ChatService
+
+        try:
+            async with AsyncSessionLocal() as db:
+                event = await ChatService.get_message_event(db, uuid.UUID(message_id))
+        except Exception as e:
+            logger.warning(f"Could not load chat message {message_id}: {e}")
+            return
+        if event is not None:
+            self.deliver(channel_id, event)
+
+    def _on_reset(self) -> None:
+        # The listener reconnected and may have missed messages: pages reload recent history
+        self.broadcast({"type": "resync"})
+
+
+chat_bus = InvalidationBus(channel=settings.CHAT_CHANNEL)
+chat_hub = ChatHub()
+chat_bus.subscribe("message", chat_hub._on_message)
+chat_bus.subscribe("message_ref", chat_hub._on_message_ref)
+chat_bus.on_reset(chat_hub._on_reset)
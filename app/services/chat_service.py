@@ -0,0 +1,255 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, tuple_
+from sqlalchemy.orm import aliased
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+import base64
+import uuid
+
+from app.core.config import settings
+from app.core.sessions import Principal
+from app.models.chat import ChatChannel, ChatMessage, MemberChannelAccess
+from app.models.club import Club
+from app.models.user import ClubMember
+
+# Lowest to highest, for tier_restricted channels. A channel requiring any other
+# tier (a club's own MembershipTier slug) admits only members on exactly that tier.
+TIER_ORDER = ("free", "premium", "vip")
+
+# Replies carry this much of the message they answer
+REPLY_PREVIEW_LENGTH = 140
+
+ReplyTarget = aliased(ChatMessage, name="reply_target")
+ReplyAuthor = aliased(ClubMember, name="reply_author")
+
+
+class ChatAccessDenied(Exception):
+    """The member may not read (or post in) this channel"""
+
+
+def _tier_rank(tier: Optional[str]) -> int:
+    # Members on a tier outside TIER_ORDER rank as free
+    tier = (tier or "").lower()
+    return TIER_ORDER.index(tier) if tier in TIER_ORDER else 0
+
+
+class ChatService:
+    """Chat channels and messages in the database; delivery is ChatHub's job"""
+
+    @staticmethod
+    def message_event(message: ChatMessage, author: str, reply: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """The JSON shape of a message, on the socket, in the page and in history pages"""
+        return {
+            "type": "message",
+            "id": str(message.id),
+            "channel_id": str(message.channel_id),
+            "member_id": str(message.member_id),
+            "author": author,
+            "content": message.content,
+            "message_type": message.message_type,
+            "reply_to": str(message.reply_to_message_id) if message.reply_to_message_id else None,
+            "reply": reply,
+            "created_at": message.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def _reply_preview(message_id, author: Optional[str], content: Optional[str], is_deleted: Optional[bool]) -> Optional[Dict[str, Any]]:
+        if message_id is None:
+            return None
+        if is_deleted:
+            return {"id": str(message_id), "author": None, "content": None, "deleted": True}
+        return {"id": str(message_id), "author": author or "Member",
+                "content": (content or "")[:REPLY_PREVIEW_LENGTH], "deleted": False}
+
+    @staticmethod
+    def _messages_query():
+        """Messages with their author's name and reply target (text and author) joined in.
+
+        Every join is on a primary key, so a page costs one query however
+        many authors and replies it holds.
+        """
+        return (
+            select(ChatMessage, ClubMember.display_name, ReplyTarget.id, ReplyAuthor.display_name,
+                   ReplyTarget.content, ReplyTarget.is_deleted)
+            .outerjoin(ClubMember, ClubMember.id == ChatMessage.member_id)
+            .outerjoin(ReplyTarget, and_(
+                ReplyTarget.id == ChatMessage.reply_to_message_id,
+                ReplyTarget.channel_id == ChatMessage.channel_id
+            ))
+            .outerjoin(ReplyAuthor, ReplyAuthor.id == ReplyTarget.member_id)
+        )
+
+    @staticmethod
+    def _event_from_row(row) -> Dict[str, Any]:
+        message, author, reply_id, reply_author, reply_content, reply_deleted = row
+        return ChatService.message_event(
+            message, author or "Member",
+            ChatService._reply_preview(reply_id, reply_author, reply_content, reply_deleted)
+        )
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, message_id) -> str:
+        """Opaque history cursor: the (created_at, id) of the oldest message on a page"""
+        raw = f"{created_at.isoformat()}|{message_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+        """Raises ValueError for anything encode_cursor didn't produce"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, message_id = raw.split("|")
+            created_at, message_id = datetime.fromisoformat(created_at), uuid.UUID(message_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError("Invalid history cursor") from e
+        if created_at.tzinfo is None:
+            raise ValueError("Invalid history cursor")
+        return created_at, message_id
+
+    @staticmethod
+    async def get_channels(db: AsyncSession, club_id: uuid.UUID) -> List[ChatChannel]:
+        """A club's active channels; clubs that have none get a General channel"""
+        result = await db.execute(
+            select(ChatChannel)
+            .where(and_(ChatChannel.club_id == club_id, ChatChannel.is_active == True))
+            .order_by(ChatChannel.sort_order, ChatChannel.created_at)
+        )
+        channels = result.scalars().all()
+        if not channels:
+            general = ChatChannel(
+                id=uuid.uuid4(), club_id=club_id, name="General",
+                description="General community chat", channel_type="public"
+            )
+            db.add(general)
+            await db.commit()
+            await db.refresh(general)
+            channels = [general]
+        return list(channels)
+
+    @staticmethod
+    def can_read(channel: ChatChannel, principal: Principal) -> bool:
+        if channel.channel_type == "tier_restricted" and channel.required_tier:
+            required = channel.required_tier.lower()
+            if required not in TIER_ORDER:
+                return (principal.tier or "").lower() == required
+            return _tier_rank(principal.tier) >= TIER_ORDER.index(required)
+        return True
+
+    @staticmethod
+    async def open_channel(
+        db: AsyncSession, club: Club, channel_id: uuid.UUID, principal: Principal
+    ) -> Tuple[ChatChannel, bool]:
+        """The channel a signed-in member is joining, and whether they may post in it.
+
+        Raises ChatAccessDenied for other clubs' members, closed or
+        tier-restricted channels, private channels without a grant, and bans.
+        """
+        if principal.club_id != str(club.id):
+            raise ChatAccessDenied("Not a member of this community")
+        result = await db.execute(
+            select(ChatChannel, MemberChannelAccess.access_type)
+            .outerjoin(MemberChannelAccess, and_(
+                MemberChannelAccess.channel_id == ChatChannel.id,
+                MemberChannelAccess.member_id == principal.subject_id
+            ))
+            .where(and_(
+                ChatChannel.id == channel_id,
+                ChatChannel.club_id == club.id,
+                ChatChannel.is_active == True
+            ))
+        )
+        row = result.first()
+        if row is None:
+            raise ChatAccessDenied("Channel not found")
+        channel, access_type = row
+        if access_type == "banned" or not ChatService.can_read(channel, principal):
+            raise ChatAccessDenied("No access to this channel")
+        if channel.channel_type == "private" and access_type is None:
+            raise ChatAccessDenied("No access to this channel")
+        return channel, access_type != "read_only"
+
+    @staticmethod
+    async def history(
+        db: AsyncSession, channel_id: uuid.UUID, before: Optional[str] = None, limit: int = None
+    ) -> Dict[str, Any]:
+        """One page of a channel's messages older than the `before` cursor (the latest if None).
+
+        Returns {"messages": [...oldest first], "next_cursor": cursor for the
+        page before this one, or None at the start of the channel}. Keyset
+        pagination on (created_at, id) is a range scan of
+        ix_chat_messages_channel_id_created_at_id, so page 1000 costs what
+        page 1 does. Raises ValueError for a bad cursor.
+        """
+        limit = min(limit or settings.CHAT_RECENT_MESSAGES, settings.CHAT_HISTORY_PAGE_MAX)
+        query = ChatService._messages_query().where(and_(
+            ChatMessage.channel_id == channel_id,
+            ChatMessage.is_deleted == False
+        ))
+        if before:
+            created_at, message_id = ChatService.decode_cursor(before)
+            query = query.where(tuple_(ChatMessage.created_at, ChatMessage.id) < tuple_(created_at, message_id))
+        # One extra row says whether there is an older page
+        result = await db.execute(
+            query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit + 1)
+        )
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            oldest = rows[-1][0]
+            next_cursor = ChatService.encode_cursor(oldest.created_at, oldest.id)
+        return {
+            "messages": [ChatService._event_from_row(row) for row in reversed(rows)],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    async def recent_messages(db: AsyncSession, channel_id: uuid.UUID, limit: int = None) -> List[Dict[str, Any]]:
+        """The channel's latest messages, oldest first"""
+        page = await ChatService.history(db, channel_id, limit=limit)
+        return page["messages"]
+
+    @staticmethod
+    async def get_message_event(db: AsyncSession, message_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        result = await db.execute(ChatService._messages_query().where(ChatMessage.id == message_id))
+        row = result.first()
+        return ChatService._event_from_row(row) if row else None
+
+    @staticmethod
+    async def post_message(
+        db: AsyncSession, channel_id: uuid.UUID, principal: Principal, content: str, reply_to: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Store a text message and return its event.
+
+        Raises ValueError for empty or oversized content, or a reply to a
+        message that isn't in this channel.
+        """
+        content = (content or "").strip()
+        if not content:
+            raise ValueError("Message is empty")
+        if len(content) > settings.CHAT_MAX_MESSAGE_LENGTH:
+            raise ValueError(f"Messages are limited to {settings.CHAT_MAX_MESSAGE_LENGTH} characters")
+        reply = None
+        if reply_to:
+            result = await db.execute(
+                select(ChatMessage.id, ClubMember.display_name, ChatMessage.content, ChatMessage.is_deleted)
+                .outerjoin(ClubMember, ClubMember.id == ChatMessage.member_id)
+                .where(and_(ChatMessage.id == uuid.UUID(reply_to), ChatMessage.channel_id == channel_id))
+            )
+            row = result.first()
+            if row is None:
+                raise ValueError("The message you replied to is not in this channel")
+            reply = ChatService._reply_preview(*row)
+        message = ChatMessage(
+            id=uuid.uuid4(),
+            channel_id=channel_id,
+            member_id=uuid.UUID(principal.subject_id),
+            content=content,
+            message_type="text",
+            reply_to_message_id=uuid.UUID(reply_to) if reply_to else None,
+            # Set here rather than by the server default, so no refresh round-trip is needed
+            created_at=datetime.now(timezone.utc),
+        )
+        db.add(message)
+        await db.commit()
+        return ChatService.message_event(message, principal.name or "Member", reply)
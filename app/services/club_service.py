@@ -1,16 +1,40 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, update, func, and_
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
 import uuid
 import re
 
 from app.models.club import Club
-from app.models.user import ClubMember
-from app.models.booking import Booking
+from app.models.user import ClubMember, ClubRole
+from app.models.booking import Booking, BookingService
 from app.models.payment import Payment
 from app.schemas.club import ClubCreate, ClubUpdate, ClubResponse
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.services.tenant_index import tenant_index
+
+# Per-club booking service catalogs, shared by the public booking pages
+_booking_catalog_cache = TTLCache("booking_catalog", ttl_seconds=settings.BOOKING_CATALOG_CACHE_TTL)
+
+# ETags for the club API, so revalidations can be answered without a query
+_club_etag_cache = TTLCache("club_etag", ttl_seconds=settings.CLUB_ETAG_CACHE_TTL)
+_CLUB_LIST_STAMP = "__club_list__"
+
+
+def _evict_club_etags(data: Dict[str, Any]) -> None:
+    _club_etag_cache.delete(data.get("slug"))
+    _club_etag_cache.delete(_CLUB_LIST_STAMP)
+
+
+# Writers publish on the invalidation bus; every worker evicts its own copies
+invalidation_bus.subscribe("club", _evict_club_etags)
+invalidation_bus.subscribe("booking_catalog", lambda data: _booking_catalog_cache.delete(data["club_id"]))
+invalidation_bus.on_reset(_club_etag_cache.clear)
+invalidation_bus.on_reset(_booking_catalog_cache.clear)
 
 
 class ClubService:
@@ -66,6 +90,8 @@ class ClubService:
         db.add(new_club)
         await db.commit()
         await db.refresh(new_club)
+        await invalidation_bus.publish("club", club_id=str(new_club.id), slug=new_club.slug)
+        tenant_index.upsert(new_club)
         
         return new_club
 
@@ -80,6 +106,22 @@ class ClubService:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def user_owns_club(db: AsyncSession, club: Club, principal) -> bool:
+        """Whether a signed-in platform user owns the club: the club's owner email, or an owner role"""
+        if principal is None or principal.kind != "user":
+            return False
+        if club.owner_email and principal.email and club.owner_email.strip().lower() == principal.email.strip().lower():
+            return True
+        result = await db.execute(
+            select(ClubRole.id).where(and_(
+                ClubRole.club_id == club.id,
+                ClubRole.user_id == uuid.UUID(principal.subject_id),
+                ClubRole.role == "owner"
+            )).limit(1)
+        )
+        return result.scalar() is not None
+
     @staticmethod
     async def get_or_create_club(db: AsyncSession, club_slug: str) -> Club:
         """Get existing club or create a new one for demo purposes"""
@@ -195,6 +237,8 @@ class ClubService:
         
         await db.commit()
         await db.refresh(club)
+        await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
+        tenant_index.upsert(club)
         
         return club
 
@@ -203,98 +247,148 @@ class ClubService:
         """Soft delete a club"""
         club.deleted_at = datetime.now()
         await db.commit()
+        await invalidation_bus.publish("club", club_id=str(club.id), slug=club.slug)
+        tenant_index.remove(club.id)
 
-    # Simple in-memory storage for demo purposes
-    _services_storage = {}
-    
     @staticmethod
-    async def get_booking_services(db: AsyncSession, club_id: uuid.UUID) -> List[Dict[str, Any]]:
-        """Get booking services for a club"""
-        club_id_str = str(club_id)
-        
-        # Check if we have custom services for this club
-        if club_id_str in ClubService._services_storage:
-            return ClubService._services_storage[club_id_str]
-        
-        # Return empty list - no placeholder services
-        # Club owners need to create their own services
-        return []
-        
-        # Old placeholder services (commented out)
+    def club_etag(club: Club) -> str:
+        """Weak ETag for a club's API representation, derived from updated_at"""
+        stamp = int(club.updated_at.timestamp() * 1_000_000)
+        etag = f'W/"{club.id.hex}-{stamp}"'
+        _club_etag_cache.set(club.slug, etag)
+        return etag
+
+    @staticmethod
+    def cached_club_etag(club_slug: str) -> Optional[str]:
+        """Last ETag this worker served for the club, if still fresh"""
+        return _club_etag_cache.get(club_slug)
+
+    @staticmethod
+    async def get_clubs_etag(db: AsyncSession, skip: int, limit: int) -> str:
+        """Weak ETag for a page of the club list, from max(updated_at) and the club count"""
+        stamp = _club_etag_cache.get(_CLUB_LIST_STAMP)
+        if stamp is None:
+            result = await db.execute(
+                select(func.max(Club.updated_at), func.count(Club.id)).where(Club.deleted_at.is_(None))
+            )
+            max_updated_at, club_count = result.one()
+            stamp = f"{int(max_updated_at.timestamp() * 1_000_000) if max_updated_at else 0}-{club_count}"
+            _club_etag_cache.set(_CLUB_LIST_STAMP, stamp)
+        return f'W/"clubs-{stamp}-{skip}-{limit}"'
+
+    @staticmethod
+    def _service_to_dict(service: BookingService, bookings_count: int = 0, revenue: Any = 0) -> Dict[str, Any]:
+        """Convert a BookingService row to the dict shape the booking templates use"""
+        return {
+            "id": str(service.id),
+            "name": service.name,
+            "price": float(service.price or 0),
+            "duration": service.duration_minutes,
+            "description": service.description or "",
+            "bookings_count": bookings_count or 0,
+            "revenue": float(revenue or 0),
+            "status": "active" if service.is_active else "inactive",
+            "max_participants": service.max_participants or 1,
+            "allow_non_members": service.requires_membership_tier is None
+        }
+
+    @staticmethod
+    async def get_booking_services(db: AsyncSession, club_id: uuid.UUID, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Get the active booking services for a club, with booking counts and revenue.
+
+        The catalog is cached per club for BOOKING_CATALOG_CACHE_TTL seconds;
+        pass use_cache=False where the caller must see its own writes (owner pages).
         """
-        default_services = [
-            {
-                "id": 1,
-                "name": "Personal Training",
-                "price": 75.00,
-                "duration": 60,
-                "description": "One-on-one personal training session with certified trainer",
-                "bookings_count": 23,
-                "revenue": 1725.00,
-                "status": "active",
-                "max_participants": 1,
-                "allow_non_members": True
-            },
-            {
-                "id": 2,
-                "name": "Nutrition Consultation", 
-                "price": 120.00,
-                "duration": 90,
-                "description": "Comprehensive nutrition planning and meal prep guidance",
-                "bookings_count": 8,
-                "revenue": 960.00,
-                "status": "active",
-                "max_participants": 1,
-                "allow_non_members": True
-            },
-            {
-                "id": 3,
-                "name": "Group Yoga Class",
-                "price": 35.00,
-                "duration": 60,
-                "description": "Relaxing yoga class for all skill levels",
-                "bookings_count": 45,
-                "revenue": 1575.00,
-                "status": "active",
-                "max_participants": 12,
-                "allow_non_members": False
-            }
+        if use_cache:
+            cached = _booking_catalog_cache.get(str(club_id))
+            if cached is not None:
+                return cached
+        
+        # Per-service booking stats in the same round-trip as the catalog
+        booking_stats = (
+            select(
+                Booking.service_id,
+                func.count(Booking.id).label("bookings_count"),
+                func.sum(Booking.amount).label("revenue")
+            )
+            .where(
+                and_(
+                    Booking.club_id == club_id,
+                    Booking.status != "cancelled"
+                )
+            )
+            .group_by(Booking.service_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(BookingService, booking_stats.c.bookings_count, booking_stats.c.revenue)
+            .outerjoin(booking_stats, booking_stats.c.service_id == BookingService.id)
+            .where(
+                and_(
+                    BookingService.club_id == club_id,
+                    BookingService.is_active == True
+                )
+            )
+            .order_by(BookingService.created_at)
+        )
+        services = [
+            ClubService._service_to_dict(service, bookings_count, revenue)
+            for service, bookings_count, revenue in result.all()
         ]
-        """
         
-        # No default services - commented out above
-        # return default_services
+        _booking_catalog_cache.set(str(club_id), services)
+        return services
     
     @staticmethod
     async def add_booking_service(db: AsyncSession, club_id: uuid.UUID, service_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Add a new booking service"""
-        club_id_str = str(club_id)
-        
-        # Get current services
-        current_services = ClubService._services_storage.get(club_id_str, [])
+        """Add a new booking service; ValueError for a bad price, duration or participant count"""
+        try:
+            price = Decimal(str(service_data.get("price") or 0))
+            duration_minutes = int(service_data.get("duration") or 60)
+            max_participants = int(service_data.get("max_participants") or 1)
+        except (InvalidOperation, TypeError, ValueError):
+            raise ValueError("price, duration and max_participants must be numbers")
+        if not price.is_finite() or price < 0 or duration_minutes <= 0 or max_participants <= 0:
+            raise ValueError("price can't be negative; duration and max_participants must be positive")
         
-        # Generate new ID
-        new_id = max([s.get("id", 0) for s in current_services], default=0) + 1
+        new_service = BookingService(
+            id=uuid.uuid4(),
+            club_id=club_id,
+            name=service_data.get("name") or "New Service",
+            price=price,
+            duration_minutes=duration_minutes,
+            description=service_data.get("description", ""),
+            max_participants=max_participants,
+            # Services closed to non-members require at least a (free) membership
+            requires_membership_tier=None if service_data.get("allow_non_members", True) else "free",
+            is_active=True
+        )
         
-        # Create new service
-        new_service = {
-            "id": new_id,
-            "name": service_data.get("name", "New Service"),
-            "price": float(service_data.get("price", 0)),
-            "duration": int(service_data.get("duration", 60)),
-            "description": service_data.get("description", ""),
-            "bookings_count": 0,
-            "revenue": 0.00,
-            "status": "active",
-            "max_participants": int(service_data.get("max_participants", 1)),
-            "allow_non_members": service_data.get("allow_non_members", True)
-        }
+        db.add(new_service)
+        await db.commit()
+        await db.refresh(new_service)
         
-        # Add to storage
-        current_services.append(new_service)
-        ClubService._services_storage[club_id_str] = current_services
+        await invalidation_bus.publish("booking_catalog", club_id=str(club_id))
+        return ClubService._service_to_dict(new_service)
+
+    @staticmethod
+    async def delete_booking_service(db: AsyncSession, club_id: uuid.UUID, service_id: uuid.UUID) -> bool:
+        """Deactivate a booking service (existing bookings keep pointing at it)"""
+        result = await db.execute(
+            update(BookingService)
+            .where(
+                and_(
+                    BookingService.id == service_id,
+                    BookingService.club_id == club_id,
+                    BookingService.is_active == True
+                )
+            )
+            .values(is_active=False)
+        )
+        await db.commit()
         
-        return new_service
+        await invalidation_bus.publish("booking_catalog", club_id=str(club_id))
+        return result.rowcount > 0
 
     @staticmethod
     async def get_all_clubs(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Club]:
@@ -0,0 +1,165 @@
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+import csv
+import io
+import json
+import uuid
+import logging
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.user import ClubMember
+from app.models.booking import Booking, BookingService, BookingSlot
+from app.models.payment import Payment
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _members_query(club_id: uuid.UUID) -> Select:
+    return (
+        select(
+            ClubMember.id,
+            ClubMember.email,
+            ClubMember.display_name,
+            ClubMember.phone,
+            ClubMember.member_tier,
+            ClubMember.status,
+            ClubMember.created_at,
+        )
+        .where(ClubMember.club_id == club_id)
+        .order_by(ClubMember.created_at)
+    )
+
+
+def _bookings_query(club_id: uuid.UUID) -> Select:
+    return (
+        select(
+            Booking.id,
+            Booking.member_id,
+            ClubMember.email.label("member_email"),
+            Booking.service_id,
+            BookingService.name.label("service_name"),
+            BookingSlot.start_time,
+            BookingSlot.end_time,
+            Booking.status,
+            Booking.amount,
+            Booking.payment_status,
+            Booking.stripe_payment_intent_id,
+            Booking.booked_at,
+            Booking.cancelled_at,
+        )
+        .outerjoin(ClubMember, ClubMember.id == Booking.member_id)
+        .outerjoin(BookingService, BookingService.id == Booking.service_id)
+        .outerjoin(BookingSlot, BookingSlot.id == Booking.slot_id)
+        .where(Booking.club_id == club_id)
+        .order_by(Booking.booked_at)
+    )
+
+
+def _payments_query(club_id: uuid.UUID) -> Select:
+    return (
+        select(
+            Payment.id,
+            Payment.member_id,
+            Payment.booking_id,
+            Payment.amount,
+            Payment.currency,
+            Payment.payment_type,
+            Payment.status,
+            Payment.platform_fee_amount,
+            Payment.club_earnings,
+            Payment.stripe_payment_intent_id,
+            Payment.stripe_charge_id,
+            Payment.created_at,
+        )
+        .where(Payment.club_id == club_id)
+        .order_by(Payment.created_at)
+    )
+
+
+EXPORT_DATASETS = {
+    "members": _members_query,
+    "bookings": _bookings_query,
+    "payments": _payments_query,
+}
+
+
+def _to_cell(value: Any) -> Any:
+    """Convert DB values to plain JSON/CSV-friendly values"""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+class ExportService:
+    """Streaming exports of club data as CSV or NDJSON"""
+
+    @staticmethod
+    def encode_csv(rows: Sequence, header: List[str] = None) -> str:
+        """Encode a batch of rows (optionally preceded by a header) as CSV text"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(header)
+        for row in rows:
+            writer.writerow([_to_cell(v) for v in row])
+        return buffer.getvalue()
+
+    @staticmethod
+    def encode_ndjson(rows: Sequence, columns: List[str]) -> str:
+        """Encode a batch of rows as newline-delimited JSON objects"""
+        return "".join(
+            json.dumps({c: _to_cell(v) for c, v in zip(columns, row)}) + "\n"
+            for row in rows
+        )
+
+    @staticmethod
+    async def stream_export(club_id: uuid.UUID, dataset: str, fmt: str) -> AsyncIterator[str]:
+        """Yield encoded chunks of a club export.
+
+        Uses its own session so the server-side cursor outlives the request's
+        dependency session, and reads in yield_per batches so memory stays flat
+        regardless of how many rows the club has.
+        """
+        query = EXPORT_DATASETS[dataset](club_id)
+        columns = [c.name for c in query.selected_columns]
+        batch_size = settings.EXPORT_BATCH_SIZE
+
+        if fmt == "csv":
+            # Header goes out before the first query round-trip
+            yield ExportService.encode_csv([], header=columns)
+
+        row_count = 0
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+            async for rows in result.partitions(batch_size):
+                row_count += len(rows)
+                if fmt == "csv":
+                    yield ExportService.encode_csv(rows)
+                else:
+                    yield ExportService.encode_ndjson(rows, columns)
+
+        logger.info(f"Exported {row_count} {dataset} rows for club {club_id} as {fmt}")
+
+    @staticmethod
+    def export_headers(club_slug: str, dataset: str, fmt: str) -> Dict[str, str]:
+        """Response headers for a downloadable, unbuffered export"""
+        filename = f"{club_slug}-{dataset}-{datetime.utcnow():%Y%m%d}.{fmt}"
+        return {
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            # Let nginx pass chunks straight through instead of buffering the whole export
+            "X-Accel-Buffering": "no",
+            "Cache-Control": "no-store",
+        }
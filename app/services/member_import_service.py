@@ -0,0 +1,236 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+import codecs
+import csv
+import itertools
+import uuid
+import logging
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.sessions import revoke_subjects
+from app.db.query_budget import allow_batch
+from app.models.club import Club
+from app.schemas.user import MemberImportRow, MemberImportError, MemberImportResult
+
+logger = logging.getLogger(__name__)
+
+# Temporary staging table, one per import transaction
+STAGING_TABLE = "club_member_import_staging"
+STAGING_COLUMNS = ["row_number", "id", "email", "display_name", "phone", "member_tier", "status"]
+
+# Header aliases accepted from other platforms' exports
+HEADER_ALIASES = {
+    "email": "email",
+    "email_address": "email",
+    "e-mail": "email",
+    "display_name": "display_name",
+    "name": "display_name",
+    "full_name": "display_name",
+    "first_name": "first_name",
+    "firstname": "first_name",
+    "last_name": "last_name",
+    "lastname": "last_name",
+    "phone": "phone",
+    "phone_number": "phone",
+    "member_tier": "member_tier",
+    "tier": "member_tier",
+    "status": "status",
+}
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        row_number INTEGER NOT NULL,
+        id UUID NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        display_name VARCHAR(100),
+        phone VARCHAR(20),
+        member_tier VARCHAR(50),
+        status VARCHAR(50)
+    ) ON COMMIT DROP
+"""
+
+# Later rows win when a file repeats an email, matching what a row-by-row import would do.
+# Columns a row leaves empty (NULL in staging) keep the existing member's value: a file
+# without tier/status columns must not reset paying members to free or unban anyone.
+# New members get the column defaults instead. Emails are stored lowercased, so the
+# (club_id, email) index matches however the file capitalizes them; a member inserted
+# concurrently between the two steps is left to that writer (DO NOTHING). Members whose
+# tier or status changed come back in `changed` so their sessions can be revoked.
+MERGE_SQL = f"""
+    WITH latest AS (
+        SELECT DISTINCT ON (email) id, email, display_name, phone, member_tier, status
+        FROM {STAGING_TABLE}
+        ORDER BY email, row_number DESC
+    ),
+    updated AS (
+        UPDATE club_members m SET
+            display_name = COALESCE(l.display_name, m.display_name),
+            phone = COALESCE(l.phone, m.phone),
+            member_tier = COALESCE(l.member_tier, m.member_tier),
+            status = COALESCE(l.status, m.status),
+            updated_at = now()
+        FROM latest l, club_members o
+        WHERE m.club_id = CAST(:club_id AS UUID) AND m.email = l.email AND o.id = m.id
+        RETURNING m.id, m.email,
+                  m.member_tier IS DISTINCT FROM o.member_tier OR m.status IS DISTINCT FROM o.status AS changed
+    ),
+    inserted AS (
+        INSERT INTO club_members (id, club_id, email, display_name, phone, member_tier, status)
+        SELECT l.id, CAST(:club_id AS UUID), l.email, l.display_name, l.phone,
+               COALESCE(l.member_tier, 'free'), COALESCE(l.status, 'active')
+        FROM latest l
+        WHERE NOT EXISTS (SELECT 1 FROM updated u WHERE u.email = l.email)
+        ON CONFLICT (club_id, email) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM inserted) AS inserted, (SELECT count(*) FROM updated) AS updated,
+           ARRAY(SELECT id FROM updated WHERE changed) AS changed
+"""
+
+
+class MemberImportService:
+    """Bulk member import: streamed CSV parsing, COPY into staging, set-based merge"""
+
+    @staticmethod
+    def _iter_csv_rows(upload: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Yield (line_number, normalized_row) from an uploaded CSV without reading it all into memory"""
+        upload.seek(0)
+        reader = csv.reader(codecs.iterdecode(upload, "utf-8-sig"))
+        header = next(reader, None)
+        if not header:
+            return
+        columns = [HEADER_ALIASES.get(h.strip().lower().replace(" ", "_")) for h in header]
+        if "email" not in columns:
+            raise ValueError("CSV must include an 'email' column")
+
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            row = {}
+            for column, value in zip(columns, values):
+                if column and value.strip():
+                    row[column] = value.strip()
+            yield reader.line_num, row
+
+    @staticmethod
+    def _validate_row(row: Dict[str, str]) -> MemberImportRow:
+        """Validate one CSV row, building display_name the same way /members/join does"""
+        display_name = row.get("display_name")
+        if not display_name:
+            display_name = f"{row.get('first_name', '')} {row.get('last_name', '')}".strip() or None
+
+        return MemberImportRow(
+            email=row.get("email", "").lower(),
+            display_name=display_name,
+            phone=row.get("phone"),
+            # None = not in the file: keep an existing member's value (see MERGE_SQL)
+            member_tier=row["member_tier"].lower() if row.get("member_tier") else None,
+            status=row["status"].lower() if row.get("status") else None,
+        )
+
+    @staticmethod
+    def validate_chunk(rows: List[Tuple[int, Dict[str, str]]]) -> Tuple[List[tuple], List[MemberImportError]]:
+        """Validate a chunk of rows, returning COPY-ready records and per-row errors"""
+        records = []
+        errors = []
+        for line_number, row in rows:
+            try:
+                member = MemberImportService._validate_row(row)
+            except ValidationError as e:
+                first = e.errors()[0]
+                field = ".".join(str(loc) for loc in first.get("loc", ())) or "row"
+                errors.append(MemberImportError(row=line_number, error=f"{field}: {first.get('msg')}"))
+                continue
+            records.append((
+                line_number,
+                uuid.uuid4(),
+                str(member.email),
+                member.display_name,
+                member.phone,
+                member.member_tier,
+                member.status,
+            ))
+        return records, errors
+
+    @staticmethod
+    def _read_chunk(rows: Iterator, chunk_size: int) -> Tuple[int, List[tuple], List[MemberImportError]]:
+        """Pull the next chunk from the row iterator and validate it"""
+        chunk = list(itertools.islice(rows, chunk_size))
+        records, errors = MemberImportService.validate_chunk(chunk)
+        return len(chunk), records, errors
+
+    @staticmethod
+    async def _copy_records(db: AsyncSession, records: List[tuple]) -> None:
+        """COPY a batch of validated records into the staging table via the asyncpg connection"""
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+        )
+
+    @staticmethod
+    async def import_members(db: AsyncSession, club: Club, upload: BinaryIO) -> MemberImportResult:
+        """Import members from a CSV file object into a club.
+
+        Rows are parsed and validated chunk by chunk in a worker thread; valid rows are
+        COPY'd into a temp staging table and merged into club_members with
+        ON CONFLICT (club_id, email), so existing members are updated instead of duplicated.
+        The whole import runs in one transaction.
+        """
+        chunk_size = settings.MEMBER_IMPORT_CHUNK_SIZE
+        max_errors = settings.MEMBER_IMPORT_MAX_ERRORS
+        result = MemberImportResult()
+        changed_members = []
+        rows = MemberImportService._iter_csv_rows(upload)
+
+        try:
+            await db.execute(text(CREATE_STAGING_SQL))
+
+            while True:
+                # Parsing and validation are CPU-bound, keep them off the event loop
+                chunk_rows, records, errors = await run_in_threadpool(
+                    MemberImportService._read_chunk, rows, chunk_size
+                )
+                if not chunk_rows:
+                    break
+
+                result.total_rows += chunk_rows
+                result.skipped += len(errors)
+                for error in errors:
+                    if len(result.errors) < max_errors:
+                        result.errors.append(error)
+                    else:
+                        result.errors_truncated = True
+
+                if not records:
+                    continue
+
+                # COPY bypasses the cursor; the merge and truncate are this chunk's statements
+                allow_batch(2)
+                await MemberImportService._copy_records(db, records)
+                merged = await db.execute(text(MERGE_SQL), {"club_id": club.id})
+                inserted, updated, changed = merged.one()
+                changed_members.extend(changed)
+                result.imported += inserted
+                result.updated += updated
+                # Rows for emails repeated within the chunk collapse into one merge row
+                result.skipped += len(records) - len({r[2] for r in records})
+                await db.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        await invalidation_bus.publish("club_members", club_id=str(club.id))
+        # Sessions carry the member's tier, which the chat access checks trust
+        await revoke_subjects(changed_members)
+
+        logger.info(
+            f"Member import for club {club.slug}: {result.imported} imported, "
+            f"{result.updated} updated, {result.skipped} skipped of {result.total_rows} rows"
+        )
+        return result
@@ -0,0 +1,280 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import asyncio
+import logging
+import uuid
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.db.database import AsyncSessionLocal
+from app.models.booking import Booking, BookingService, SlotHold
+from app.models.club import Club
+from app.models.user import ClubMember
+from app.services.availability_service import AvailabilityService, SlotUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Hold -> booking in one statement: the DELETE only returns a row if the hold
+# still exists, so a hold is converted at most once (webhook retries, a
+# concurrent sweep) and its seats simply stay taken by the booking.
+CONFIRM_SQL = """
+WITH hold AS (
+    DELETE FROM slot_holds WHERE id = :hold_id
+    RETURNING club_id, member_id, service_id, slot_id, notes, amount
+)
+INSERT INTO bookings (id, club_id, member_id, service_id, slot_id, status, notes, amount,
+                      payment_status, stripe_payment_intent_id)
+SELECT CAST(:booking_id AS uuid), club_id, member_id, service_id, slot_id, 'confirmed', notes, amount,
+       'paid', :payment_intent_id
+FROM hold
+RETURNING id, club_id
+"""
+
+# Deletes the selected holds and gives their seats back, per slot, in one statement
+_RELEASE_SQL = """gone AS (
+    DELETE FROM slot_holds h USING doomed WHERE h.id = doomed.id
+    RETURNING h.slot_id, h.seats
+),
+released AS (
+    UPDATE booking_slots s
+    SET current_bookings = GREATEST(s.current_bookings - g.seats, 0), updated_at = now()
+    FROM (SELECT slot_id, sum(seats) AS seats FROM gone GROUP BY slot_id) g
+    WHERE s.id = g.slot_id
+)
+SELECT count(*) FROM gone
+"""
+
+RELEASE_HOLD_SQL = "WITH doomed AS (SELECT id FROM slot_holds WHERE id = :hold_id FOR UPDATE),\n" + _RELEASE_SQL
+
+# SKIP LOCKED: workers sweeping at the same time take different batches, and
+# a hold being confirmed right now is left to the webhook
+RELEASE_EXPIRED_SQL = """WITH doomed AS (
+    SELECT id FROM slot_holds
+    WHERE expires_at < now()
+    ORDER BY expires_at
+    LIMIT :batch
+    FOR UPDATE SKIP LOCKED
+),
+""" + _RELEASE_SQL
+
+
+class SlotHoldService:
+    """Seats held for the length of a Stripe Checkout Session.
+
+    create_hold takes the seats straight away with a short transaction (no
+    lock is kept while the customer pays); confirm converts the hold into a
+    booking when checkout.session.completed arrives; holds that are never
+    paid are released by the sweeper, or at once on checkout.session.expired.
+    """
+
+    @staticmethod
+    async def _member_id(db: AsyncSession, club: Club, email: str, name: str) -> Tuple[uuid.UUID, bool]:
+        """The club member for a checkout email (created as a free member if new), and whether it was created"""
+        email = (email or "").strip().lower()
+        if not email:
+            raise ValueError("A customer email is required")
+        inserted = await db.execute(
+            pg_insert(ClubMember)
+            .values(id=uuid.uuid4(), club_id=club.id, email=email, display_name=name or email,
+                    member_tier="free", status="active")
+            .on_conflict_do_nothing(index_elements=["club_id", "email"])
+        )
+        result = await db.execute(
+            select(ClubMember.id).where(and_(ClubMember.club_id == club.id, ClubMember.email == email))
+        )
+        return result.scalar_one(), inserted.rowcount > 0
+
+    @staticmethod
+    async def create_hold(
+        db: AsyncSession, club: Club, service: BookingService, start: datetime, customer_email: str,
+        customer_name: str, amount: Decimal, notes: str = None, checkout_expires_at: datetime = None
+    ) -> SlotHold:
+        """Take a seat on the service's slot at `start` until the checkout expires (plus grace).
+
+        Raises SlotUnavailable if the slot is full or not bookable. Commits.
+        """
+        checkout_expires_at = checkout_expires_at or datetime.now(timezone.utc) + timedelta(minutes=settings.SLOT_HOLD_MINUTES)
+        try:
+            member_id, new_member = await SlotHoldService._member_id(db, club, customer_email, customer_name)
+            reserved = await AvailabilityService.reserve_at(db, service, start)
+            hold = SlotHold(
+                id=uuid.uuid4(),
+                slot_id=uuid.UUID(reserved["slot_id"]),
+                service_id=service.id,
+                club_id=club.id,
+                member_id=member_id,
+                seats=1,
+                amount=amount,
+                notes=notes or None,
+                expires_at=checkout_expires_at + timedelta(seconds=settings.SLOT_HOLD_GRACE_SECONDS),
+            )
+            db.add(hold)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        if new_member:
+            await invalidation_bus.publish("club_members", club_id=str(club.id))
+        return hold
+
+    @staticmethod
+    async def attach_session(
+        db: AsyncSession, hold_id: uuid.UUID, checkout_session_id: str, checkout_expires_at: datetime = None
+    ) -> None:
+        """Record the hold's Checkout Session, and move its expiry to match the session's if given"""
+        values = {"checkout_session_id": checkout_session_id}
+        if checkout_expires_at is not None:
+            values["expires_at"] = checkout_expires_at + timedelta(seconds=settings.SLOT_HOLD_GRACE_SECONDS)
+        await db.execute(update(SlotHold).where(SlotHold.id == hold_id).values(**values))
+        await db.commit()
+
+    @staticmethod
+    async def confirm(db: AsyncSession, hold_id: uuid.UUID, payment_intent_id: Optional[str]) -> Optional[uuid.UUID]:
+        """Convert a paid hold into a confirmed booking; None if the hold is gone. Commits."""
+        result = await db.execute(
+            text(CONFIRM_SQL),
+            {"hold_id": hold_id, "booking_id": str(uuid.uuid4()), "payment_intent_id": payment_intent_id}
+        )
+        row = result.first()
+        await db.commit()
+        if row is None:
+            return None
+        booking_id, club_id = row
+        await invalidation_bus.publish("bookings", club_id=str(club_id))
+        return booking_id
+
+    @staticmethod
+    def hold_id_from_session(session: dict) -> Optional[uuid.UUID]:
+        """The hold a Checkout Session was created for; None for sessions that aren't ours (no or foreign reference)"""
+        hold_id = session.get("client_reference_id") or (session.get("metadata") or {}).get("hold_id")
+        if not hold_id:
+            return None
+        try:
+            return uuid.UUID(str(hold_id))
+        except ValueError:
+            logger.warning(f"Checkout {session.get('id')} has a non-hold reference {hold_id!r}; skipping hold handling")
+            return None
+
+    @staticmethod
+    async def confirm_checkout(db: AsyncSession, club: Club, session: dict) -> Optional[uuid.UUID]:
+        """Book a completed service checkout: convert its hold, or book afresh if the hold lapsed.
+
+        Returns the booking id, or None if the slot filled up after the hold
+        expired (the payment then needs refunding) or the session isn't a
+        service booking.
+        """
+        metadata = session.get("metadata") or {}
+        payment_intent_id = session.get("payment_intent")
+        hold_id = SlotHoldService.hold_id_from_session(session)
+        if hold_id is None:
+            return None
+
+        booking_id = await SlotHoldService.confirm(db, hold_id, payment_intent_id)
+        if booking_id is not None:
+            logger.info(f"Hold {hold_id} converted to booking {booking_id} for club {club.slug}")
+            return booking_id
+
+        # Webhook retry: already converted
+        if payment_intent_id:
+            result = await db.execute(select(Booking.id).where(Booking.stripe_payment_intent_id == payment_intent_id))
+            booking_id = result.scalar()
+            if booking_id is not None:
+                return booking_id
+
+        # Paid after the hold was swept: take the seat now if it's still free
+        try:
+            service = await AvailabilityService.get_service(db, uuid.UUID(metadata["service_id"]), club.id)
+            if service is None:
+                raise SlotUnavailable("Service no longer offered")
+            member_id, new_member = await SlotHoldService._member_id(
+                db, club, session.get("customer_email") or (session.get("customer_details") or {}).get("email"),
+                metadata.get("customer_name")
+            )
+            reserved = await AvailabilityService.reserve_at(db, service, datetime.fromisoformat(metadata["booking_datetime"]))
+            booking = Booking(
+                id=uuid.uuid4(),
+                club_id=club.id,
+                member_id=member_id,
+                service_id=service.id,
+                slot_id=uuid.UUID(reserved["slot_id"]),
+                status="confirmed",
+                notes=metadata.get("notes") or None,
+                amount=Decimal(session.get("amount_total") or 0) / 100,
+                payment_status="paid",
+                stripe_payment_intent_id=payment_intent_id,
+            )
+            db.add(booking)
+            await db.commit()
+            await invalidation_bus.publish("bookings", club_id=str(club.id))
+            if new_member:
+                await invalidation_bus.publish("club_members", club_id=str(club.id))
+            logger.warning(f"Hold {hold_id} had lapsed; booked slot {reserved['slot_id']} directly")
+            return booking.id
+        except (SlotUnavailable, KeyError, ValueError) as e:
+            await db.rollback()
+            logger.error(f"❌ Paid checkout {session.get('id')} for club {club.slug} could not be booked "
+                         f"({e}); payment {payment_intent_id} needs a refund")
+            return None
+
+    @staticmethod
+    async def release(db: AsyncSession, hold_id: uuid.UUID) -> bool:
+        """Drop a hold and give its seats back (checkout failed or expired). Commits."""
+        result = await db.execute(text(RELEASE_HOLD_SQL), {"hold_id": hold_id})
+        released = result.scalar() or 0
+        await db.commit()
+        return released > 0
+
+    @staticmethod
+    async def release_expired(db: AsyncSession, batch: int = None) -> int:
+        """Release one batch of expired holds; returns how many. Commits."""
+        result = await db.execute(text(RELEASE_EXPIRED_SQL), {"batch": batch or settings.SLOT_HOLD_SWEEP_BATCH})
+        released = result.scalar() or 0
+        await db.commit()
+        return released
+
+
+class HoldSweeper:
+    """Background task releasing expired holds in batches, every SLOT_HOLD_SWEEP_SECONDS"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        total = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                released = await SlotHoldService.release_expired(db)
+                total += released
+                if released < settings.SLOT_HOLD_SWEEP_BATCH:
+                    break
+        if total:
+            logger.info(f"Released {total} expired slot holds")
+        return total
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Slot hold sweep failed: {e}")
+            await asyncio.sleep(settings.SLOT_HOLD_SWEEP_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+hold_sweeper = HoldSweeper()
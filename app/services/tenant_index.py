@@ -0,0 +1,150 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.db.database import AsyncSessionLocal
+from app.models.club import Club
+
+logger = logging.getLogger(__name__)
+
+# Subdomains of the platform domain that are never club slugs
+RESERVED_SUBDOMAINS = {"www", "api", "app", "admin", "static", "mail"}
+
+# Rows are re-read this far behind the watermark, since updated_at is the
+# writing transaction's start time and may commit after a later one
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+class Tenant(NamedTuple):
+    club_id: str
+    slug: str
+    custom_domain: Optional[str]
+
+
+def normalize_host(host: str) -> str:
+    """Lowercase, drop the port and any trailing dot"""
+    host = host.strip().lower()
+    if host.startswith("["):  # IPv6 literal
+        return host.split("]")[0] + "]"
+    return host.split(":")[0].rstrip(".")
+
+
+class TenantIndex:
+    """In-memory host -> club index used by TenantMiddleware.
+
+    Loaded in full at startup, then kept current incrementally: ClubService
+    updates it directly on writes in this worker, and a background refresh
+    reads only clubs whose updated_at moved since the last pass. The refresh
+    runs every TENANT_INDEX_REFRESH_SECONDS, or immediately when another
+    worker announces a club change on the invalidation bus.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, Tenant] = {}
+        self._by_slug: Dict[str, Tenant] = {}
+        self._by_domain: Dict[str, Tenant] = {}
+        self._watermark: Optional[datetime] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_requested = asyncio.Event()
+        self.loaded = False
+
+    def resolve(self, host: str) -> Optional[Tenant]:
+        """Map a Host header to a club, or None for platform/unknown hosts"""
+        host = normalize_host(host)
+        platform_domain = settings.PLATFORM_DOMAIN.lower()
+        if host == platform_domain:
+            return None
+        if host.endswith("." + platform_domain):
+            subdomain = host[: -len(platform_domain) - 1]
+            if "." in subdomain or subdomain in RESERVED_SUBDOMAINS:
+                return None
+            return self._by_slug.get(subdomain)
+        tenant = self._by_domain.get(host)
+        if tenant is None and host.startswith("www."):
+            tenant = self._by_domain.get(host[4:])
+        return tenant
+
+    def upsert(self, club: Club) -> None:
+        if club.deleted_at is not None:
+            self.remove(club.id)
+            return
+        self.remove(club.id)
+        domain = normalize_host(club.custom_domain).removeprefix("www.") if club.custom_domain else None
+        tenant = Tenant(club_id=str(club.id), slug=club.slug, custom_domain=domain)
+        self._by_id[tenant.club_id] = tenant
+        self._by_slug[tenant.slug] = tenant
+        if domain:
+            self._by_domain[domain] = tenant
+
+    def remove(self, club_id) -> None:
+        tenant = self._by_id.pop(str(club_id), None)
+        if tenant is None:
+            return
+        if self._by_slug.get(tenant.slug) is tenant:
+            del self._by_slug[tenant.slug]
+        if tenant.custom_domain and self._by_domain.get(tenant.custom_domain) is tenant:
+            del self._by_domain[tenant.custom_domain]
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Apply clubs changed since the last refresh (all clubs on the first call)"""
+        query = select(Club.id, Club.slug, Club.custom_domain, Club.deleted_at, Club.updated_at)
+        if self._watermark is not None:
+            query = query.where(Club.updated_at > self._watermark - REFRESH_OVERLAP)
+        else:
+            query = query.where(Club.deleted_at.is_(None))
+
+        rows = (await db.execute(query)).all()
+        for row in rows:
+            self.upsert(row)
+            if self._watermark is None or row.updated_at > self._watermark:
+                self._watermark = row.updated_at
+        if not self.loaded:
+            self.loaded = True
+            logger.info(f"Tenant index loaded: {len(self._by_id)} clubs, {len(self._by_domain)} custom domains")
+        return len(rows)
+
+    def request_refresh(self) -> None:
+        """Wake the background refresh now instead of at the next interval"""
+        self._refresh_requested.set()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            self._refresh_requested.clear()
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.refresh(db)
+            except Exception as e:
+                logger.warning(f"Tenant index refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=settings.TENANT_INDEX_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Load the index and keep refreshing it in the background"""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+tenant_index = TenantIndex()
+
+# Club changes in other workers trigger an incremental refresh right away
+invalidation_bus.subscribe("club", lambda data: tenant_index.request_refresh())
+invalidation_bus.on_reset(tenant_index.request_refresh)
@@ -29,8 +29,16 @@ else:
     STRIPE_CONNECT_REDIRECT_URI = os.getenv("STRIPE_CONNECT_REDIRECT_URI_TEST") or os.getenv("STRIPE_CONNECT_REDIRECT_URI")
     print(f"🟢 STRIPE MODE: TEST - Using test keys")
 
+# Optional API host override, e.g. a local stripe-mock for load tests (http://localhost:12111)
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE")
+
 # v1 endpoints use global stripe
 stripe.api_key = STRIPE_SECRET_KEY
+if STRIPE_API_BASE:
+    stripe.api_base = STRIPE_API_BASE
 
 # v2 endpoints use a client instance
-stripe_client = StripeClient(STRIPE_SECRET_KEY)
+if STRIPE_API_BASE:
+    stripe_client = StripeClient(STRIPE_SECRET_KEY, base_addresses={"api": STRIPE_API_BASE})
+else:
+    stripe_client = StripeClient(STRIPE_SECRET_KEY)
@@ -0,0 +1,188 @@
+"""Chat fan-out benchmark.
+
+hub (default) runs in-process against a ChatHub with fake sockets, so it
+needs no database or server: --connections sockets on one channel, --messages
+messages delivered to all of them. Reports deliveries per second, memory per
+connection (tracemalloc, queue + sender task) and checks that one stalled
+consumer is dropped once its send queue fills while everyone else still gets
+every message.
+
+ws drives a running server over real WebSockets: --connections members'
+sockets on one channel, one of them posting --messages messages, reporting
+received messages per second and end-to-end latency. It needs the websockets
+package, a member session token (--token, the ezclub_member cookie) and a
+server with RATE_LIMIT_CHAT_MESSAGES raised or RATE_LIMIT_ENABLED=false.
+
+    python -m benchmarks.chat_fanout
+    python -m benchmarks.chat_fanout --connections 5000 --messages 200 --json benchmarks/results/chat_hub.json
+    python -m benchmarks.chat_fanout ws --url ws://localhost:8000 --club bench-club-0 --channel <id> --token <token>
+
+Needs ENCRYPTION_KEY in the environment (.env), like the app itself.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.chat_hub import ChatHub
+
+CHANNEL = "bench-channel"
+
+
+class FakeSocket:
+    """Counts what it is sent; a stalled one never finishes a send"""
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.received = 0
+        self.closed_with = None
+        self._never = asyncio.Event()
+
+    async def send_text(self, text: str) -> None:
+        if self.stalled:
+            await self._never.wait()
+        self.received += 1
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_with = code
+
+
+async def run_hub(connections: int, messages: int) -> dict:
+    hub = ChatHub()
+    settings.CHAT_MAX_CONNECTIONS = max(settings.CHAT_MAX_CONNECTIONS, connections + 1)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sockets = [FakeSocket() for _ in range(connections)]
+    conns = [hub.connect(socket, CHANNEL, str(i)) for i, socket in enumerate(sockets)]
+    for conn in conns:
+        conn.start()
+    await asyncio.sleep(0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    per_connection = sum(s.size_diff for s in after.compare_to(before, "filename")) / connections
+
+    stalled = FakeSocket(stalled=True)
+    stalled_conn = hub.connect(stalled, CHANNEL, "stalled")
+    stalled_conn.start()
+
+    event = {"type": "message", "channel_id": CHANNEL, "author": "Bench", "content": "x" * 200}
+    expected = connections * messages
+    started = time.perf_counter()
+    for i in range(messages):
+        hub.deliver(CHANNEL, dict(event, id=str(i)))
+        # Let the senders drain, as the loop would between incoming messages
+        await asyncio.sleep(0)
+    while sum(s.received for s in sockets) < expected:
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0)
+
+    for conn in conns + [stalled_conn]:
+        await hub.disconnect(conn)
+
+    return {
+        "connections": connections,
+        "messages": messages,
+        "deliveries_per_s": round(expected / elapsed),
+        "elapsed_s": round(elapsed, 3),
+        "bytes_per_connection": round(per_connection),
+        "stalled_dropped": stalled.closed_with is not None,
+        "all_delivered": all(s.received == messages for s in sockets),
+    }
+
+
+async def run_ws(args) -> dict:
+    import websockets
+
+    url = f"{args.url.rstrip('/')}/community/{args.club}/chat/{args.channel}/ws"
+    headers = {"Cookie": f"ezclub_member={args.token}"}
+    latencies = []
+    received = 0
+    done = asyncio.Event()
+    expected = args.connections * args.messages
+
+    async def open_socket():
+        try:
+            return await websockets.connect(url, additional_headers=headers, max_queue=None)
+        except TypeError:  # websockets < 14
+            return await websockets.connect(url, extra_headers=headers, max_queue=None)
+
+    async def listen(socket):
+        nonlocal received
+        async for raw in socket:
+            data = json.loads(raw)
+            if data.get("type") != "message" or not data["content"].startswith("bench "):
+                continue
+            latencies.append((time.time() - float(data["content"][6:])) * 1000)
+            received += 1
+            if received >= expected:
+                done.set()
+
+    sockets = await asyncio.gather(*(open_socket() for _ in range(args.connections)))
+    listeners = [asyncio.create_task(listen(s)) for s in sockets]
+    await asyncio.sleep(0.5)
+
+    started = time.perf_counter()
+    for _ in range(args.messages):
+        await sockets[0].send(json.dumps({"content": f"bench {time.time()}"}))
+        await asyncio.sleep(args.interval)
+    try:
+        await asyncio.wait_for(done.wait(), timeout=30)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - started
+
+    for task in listeners:
+        task.cancel()
+    await asyncio.gather(*(s.close() for s in sockets), return_exceptions=True)
+
+    latencies.sort()
+    return {
+        "connections": args.connections,
+        "messages": args.messages,
+        "received": received,
+        "expected": expected,
+        "received_per_s": round(received / elapsed),
+        "p50_ms": round(latencies[len(latencies) // 2], 2) if latencies else None,
+        "p99_ms": round(latencies[max(0, int(len(latencies) * 0.99) - 1)], 2) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", nargs="?", choices=("hub", "ws"), default="hub")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--url", default="ws://localhost:8000", help="ws mode: server base URL")
+    parser.add_argument("--club", default="bench-club-0", help="ws mode: club slug")
+    parser.add_argument("--channel", help="ws mode: channel id")
+    parser.add_argument("--token", help="ws mode: member session token")
+    parser.add_argument("--interval", type=float, default=0.01, help="ws mode: seconds between posts")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.mode == "ws":
+        if not (args.channel and args.token):
+            parser.error("ws mode needs --channel and --token")
+        results = asyncio.run(run_ws(args))
+        print(f"ws   {results['connections']} sockets x {results['messages']} messages: "
+              f"{results['received']}/{results['expected']} received, {results['received_per_s']}/s, "
+              f"p50 {results['p50_ms']} ms  p99 {results['p99_ms']} ms")
+    else:
+        results = asyncio.run(run_hub(args.connections, args.messages))
+        print(f"hub  {results['connections']} sockets x {results['messages']} messages: "
+              f"{results['deliveries_per_s']:,} deliveries/s, {results['bytes_per_connection']:,} bytes/connection, "
+              f"stalled consumer dropped: {results['stalled_dropped']}, all delivered: {results['all_delivered']}")
+        assert results["stalled_dropped"] and results["all_delivered"], "backpressure check failed"
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Chat history paging benchmark.
+
+Fills a throwaway channel in bench-club-0 with --messages messages spread
+over a year (one in ten a reply), then reads it back a page at a time:
+
+  keyset  ChatService.history - WHERE (created_at, id) < cursor, a range scan
+          of ix_chat_messages_channel_id_created_at_id
+  offset  the same query with OFFSET n, at a few depths, for comparison
+
+and prints per-page latency near the newest and oldest messages plus the
+plan of the deepest keyset page. Keyset pages should cost the same at any
+depth; OFFSET pages grow with it.
+
+    python -m benchmarks.chat_history
+    python -m benchmarks.chat_history --messages 500000 --page 50 --json benchmarks/results/chat_history.json
+
+Needs DATABASE_URL pointing at a migrated database and the bench clubs and
+members from benchmarks.seed.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import and_, delete, insert, select, text
+
+from app.db.database import AsyncSessionLocal, engine
+from app.models.chat import ChatChannel, ChatMessage
+from app.models.club import Club
+from app.models.user import ClubMember
+from app.services.chat_service import ChatService
+
+BATCH = 10_000
+
+# The deepest keyset page's WHERE/ORDER BY, without the primary-key joins
+EXPLAIN_SQL = """
+EXPLAIN SELECT id FROM chat_messages
+WHERE channel_id = :channel_id AND is_deleted = false AND (created_at, id) < (:created_at, :id)
+ORDER BY created_at DESC, id DESC
+LIMIT :limit
+"""
+
+
+async def fill_channel(messages: int) -> uuid.UUID:
+    async with AsyncSessionLocal() as db:
+        club_id = (await db.execute(select(Club.id).where(Club.slug == "bench-club-0"))).scalar_one()
+        member_ids = (await db.execute(select(ClubMember.id).where(ClubMember.club_id == club_id))).scalars().all()
+        channel = ChatChannel(id=uuid.uuid4(), club_id=club_id, name="History bench", channel_type="public")
+        db.add(channel)
+        await db.flush()
+
+        started = datetime.now(timezone.utc) - timedelta(days=365)
+        step = timedelta(days=365) / messages
+        ids = []
+        for offset in range(0, messages, BATCH):
+            rows = []
+            for n in range(offset, min(offset + BATCH, messages)):
+                message_id = uuid.uuid4()
+                rows.append({
+                    "id": message_id,
+                    "channel_id": channel.id,
+                    "member_id": random.choice(member_ids),
+                    "content": f"Bench message {n}",
+                    "message_type": "text",
+                    "is_deleted": n % 50 == 0,
+                    "reply_to_message_id": random.choice(ids) if ids and n % 10 == 0 else None,
+                    "created_at": started + step * n,
+                })
+                ids.append(message_id)
+            await db.execute(insert(ChatMessage), rows)
+        await db.commit()
+        await db.execute(text("ANALYZE chat_messages"))
+        return channel.id
+
+
+async def timed(coro) -> tuple:
+    started = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def run(args) -> dict:
+    channel_id = await fill_channel(args.messages)
+    try:
+        keyset = []
+        cursor = deepest = None
+        async with AsyncSessionLocal() as db:
+            while True:
+                page, ms = await timed(ChatService.history(db, channel_id, before=cursor, limit=args.page))
+                keyset.append(ms)
+                deepest = cursor or deepest
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+
+            explain = []
+            if deepest:
+                created_at, message_id = ChatService.decode_cursor(deepest)
+                explain = (await db.execute(text(EXPLAIN_SQL), {
+                    "channel_id": channel_id, "created_at": created_at, "id": message_id, "limit": args.page
+                })).scalars().all()
+
+            offset = {}
+            pages = len(keyset)
+            for depth in (0, pages // 4, pages // 2, pages - 1):
+                query = (
+                    ChatService._messages_query()
+                    .where(and_(ChatMessage.channel_id == channel_id, ChatMessage.is_deleted == False))
+                    .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                    .offset(depth * args.page).limit(args.page)
+                )
+                samples = [(await timed(db.execute(query)))[1] for _ in range(3)]
+                offset[f"page_{depth}"] = round(statistics.median(samples), 2)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(ChatChannel).where(ChatChannel.id == channel_id))
+            await db.commit()
+        await engine.dispose()
+
+    head, tail = keyset[:10], keyset[-10:]
+    results = {
+        "messages": args.messages,
+        "page": args.page,
+        "pages": len(keyset),
+        "keyset_first_pages_ms": round(statistics.median(head), 2),
+        "keyset_last_pages_ms": round(statistics.median(tail), 2),
+        "keyset_total_s": round(sum(keyset) / 1000, 2),
+        "offset_ms": offset,
+        "plan": explain,
+    }
+    print(f"keyset {results['pages']} pages of {args.page}: first pages {results['keyset_first_pages_ms']} ms, "
+          f"last pages {results['keyset_last_pages_ms']} ms, whole channel {results['keyset_total_s']} s")
+    print("offset " + "  ".join(f"{k} {v} ms" for k, v in offset.items()))
+    print("\n".join(explain))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
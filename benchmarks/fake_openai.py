@@ -0,0 +1,57 @@
+"""Minimal stand-in for the OpenAI chat completions API, for load tests.
+
+Answers POST /v1/chat/completions with a canned reply after --latency-ms,
+so AI chat load tests measure our side instead of OpenAI's.
+
+    python -m benchmarks.fake_openai --port 8099 --latency-ms 400
+
+Start the app with OPENAI_BASE_URL=http://127.0.0.1:8099/v1 to use it.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+LATENCY_SECONDS = 0.4
+
+
+async def chat_completions(request: Request) -> JSONResponse:
+    body = await request.json()
+    await asyncio.sleep(LATENCY_SECONDS)
+    prompt_tokens = sum(len(m.get("content", "").split()) for m in body.get("messages", []))
+    return JSONResponse({
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-3.5-turbo"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "Thanks for asking! Our next open session is tomorrow at 10am."},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 14, "total_tokens": prompt_tokens + 14},
+    })
+
+
+app = Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
+
+
+def main():
+    global LATENCY_SECONDS
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=400)
+    args = parser.parse_args()
+    LATENCY_SECONDS = args.latency_ms / 1000
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
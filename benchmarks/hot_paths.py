@@ -0,0 +1,172 @@
+"""Micro-benchmarks for the small functions that run on every request.
+
+Each case is timed pytest-benchmark style: the loop count is calibrated so
+one round takes at least --min-round-time, then --rounds rounds are run and
+the per-call min/median/mean/stddev reported. Fixtures are fixed values, so
+numbers are comparable between runs on the same machine.
+
+    python -m benchmarks.hot_paths
+    python -m benchmarks.hot_paths -k slug -k encrypt             # substring filter, repeatable
+    python -m benchmarks.hot_paths --save main                     # store benchmarks/baselines/hot_paths-main.json
+    python -m benchmarks.hot_paths --compare main --fail-over 10   # exit 1 if any median regressed >10%
+
+Needs ENCRYPTION_KEY in the environment (.env), like the app itself.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import timeit
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+from app.core.security import EncryptionService
+from app.models.club import Club
+from app.schemas.club import ClubResponse
+from app.services.club_service import ClubService
+from benchmarks.template_render import dashboard_context, make_env, members_context, render_dashboard
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+SLUGS = ["bench-club", "My Awesome Club!!", "  --Über Fitness__Studio 2025--  ", "a" * 100]
+
+
+def make_club() -> Club:
+    created = datetime(2025, 1, 15, 9, 30)
+    return Club(
+        id=uuid.UUID("00000000-0000-4000-8000-000000000001"),
+        name="Bench Club",
+        slug="bench-club",
+        description="A vibrant community for passionate members",
+        primary_color="#0075c4",
+        secondary_color="#0267C1",
+        logo_url=None,
+        custom_domain=None,
+        features={"enable_bookings": True, "enable_chat": True, "enable_donations": True},
+        stripe_account_id="acct_bench000001",
+        stripe_onboarding_complete=True,
+        ai_enabled=True,
+        subscription_status="active",
+        subscription_plan="pro",
+        subscription_ends_at=None,
+        created_at=created,
+        updated_at=created,
+    )
+
+
+def club_template_data(club: Club) -> dict:
+    # Mirrors the club_data dict built in club_dashboard (app/routes/web.py)
+    return {
+        "id": str(club.id),
+        "name": club.name,
+        "slug": club.slug,
+        "description": club.description or "A vibrant community for passionate members",
+        "primary_color": club.primary_color,
+        "secondary_color": club.secondary_color,
+        "logo_url": club.logo_url,
+        "features": {
+            "enable_bookings": club.features.get("enable_bookings", True),
+            "enable_chat": club.features.get("enable_chat", True),
+            "enable_donations": club.features.get("enable_donations", True)
+        },
+        "enable_bookings": club.features.get("enable_bookings", True),
+        "enable_chat": club.features.get("enable_chat", True),
+        "enable_ai": club.ai_enabled,
+        "enable_donations": club.features.get("enable_donations", True),
+        "subscription_status": club.subscription_status,
+        "subscription_plan": club.subscription_plan,
+        "created_at": club.created_at
+    }
+
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    club = make_club()
+    encryption = EncryptionService()
+    secret = "sk-" + "x" * 48
+    token = encryption.encrypt(secret)
+    env = make_env(production=True)
+    dashboard = dashboard_context()
+    members = members_context(50)
+
+    cases = {f"validate_slug[{slug.strip()[:20]}]": (lambda slug=slug: ClubService.validate_slug(slug)) for slug in SLUGS}
+    cases.update({
+        "ClubResponse.from_orm": lambda: ClubResponse.from_orm(club),
+        "ClubResponse.model_validate": lambda: ClubResponse.model_validate(club),
+        "EncryptionService.encrypt": lambda: encryption.encrypt(secret),
+        "EncryptionService.decrypt": lambda: encryption.decrypt(token),
+        "club_data dict": lambda: club_template_data(club),
+        "render club_dashboard.html": lambda: render_dashboard(env, dashboard),
+        "render club_members.html[50]": lambda: env.get_template("club_members.html").render(members),
+    })
+    return cases
+
+
+def bench(fn: Callable[[], object], rounds: int, min_round_time: float) -> dict:
+    timer = timeit.Timer(fn)
+    loops = 1
+    while True:
+        if timer.timeit(loops) >= min_round_time:
+            break
+        loops *= 2
+    # Per-call times in microseconds
+    samples = [t / loops * 1e6 for t in timer.repeat(repeat=rounds, number=loops)]
+    return {
+        "loops": loops,
+        "rounds": rounds,
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "stddev_us": round(statistics.stdev(samples), 3) if rounds > 1 else 0.0,
+        "ops_per_sec": round(1e6 / statistics.median(samples)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keywords", action="append", help="only cases containing this substring")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--min-round-time", type=float, default=0.05, help="seconds")
+    parser.add_argument("--save", metavar="NAME", help="write results to benchmarks/baselines/hot_paths-NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare medians with benchmarks/baselines/hot_paths-NAME.json")
+    parser.add_argument("--fail-over", type=float, metavar="PCT", help="with --compare: exit 1 if a median regressed by more than PCT%%")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    if args.keywords:
+        cases = {name: fn for name, fn in cases.items() if any(k.lower() in name.lower() for k in args.keywords)}
+
+    baseline = {}
+    if args.compare:
+        baseline = json.loads((BASELINES_DIR / f"hot_paths-{args.compare}.json").read_text())["cases"]
+
+    results = {}
+    regressions = []
+    for name, fn in cases.items():
+        stats = results[name] = bench(fn, args.rounds, args.min_round_time)
+        line = (f"{name:<36} min {stats['min_us']:>10.3f} us  median {stats['median_us']:>10.3f} us  "
+                f"stddev {stats['stddev_us']:>8.3f}  {stats['ops_per_sec']:>10} ops/s")
+        base = baseline.get(name)
+        if base:
+            change = (stats["median_us"] - base["median_us"]) / base["median_us"] * 100
+            line += f"  {change:>+7.1f}%"
+            if args.fail_over is not None and change > args.fail_over:
+                regressions.append(f"{name}: {change:+.1f}%")
+        print(line)
+
+    report = {"meta": {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0]}, "cases": results}
+    if args.save:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        (BASELINES_DIR / f"hot_paths-{args.save}.json").write_text(json.dumps(report, indent=2))
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if regressions:
+        sys.exit("Regressed over threshold:\n  " + "\n  ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
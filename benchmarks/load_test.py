@@ -0,0 +1,283 @@
+"""End-to-end load test for the core tenant flows.
+
+Drives a running app over HTTP with a fixed number of concurrent asyncio
+workers per scenario and reports throughput and latency percentiles.
+
+Setup (once):
+    alembic upgrade head
+    python -m benchmarks.seed --clubs 20 --members 500     # re-seed to free the held slots
+    docker run --rm -p 12111:12111 stripe/stripe-mock      # for checkout_service
+    python -m benchmarks.fake_openai --port 8099            # for ai_chat
+
+Run the app against them with rate limiting off (every request comes from one
+IP, so the per-IP limits would turn most of them into 429s), e.g.:
+    RATE_LIMIT_ENABLED=false STRIPE_API_BASE=http://localhost:12111 OPENAI_BASE_URL=http://127.0.0.1:8099/v1 \\
+        uvicorn main:app --workers 2 --port 8000
+
+Then:
+    python -m benchmarks.load_test                              # every scenario, 20s each
+    python -m benchmarks.load_test -s club_dashboard -s members_list --duration 60 --concurrency 50
+    python -m benchmarks.load_test --save-baseline main          # store benchmarks/baselines/main.json
+    python -m benchmarks.load_test --compare main                # diff against a stored baseline
+
+webhook_burst signs its events with STRIPE_WEBHOOK_SECRET_TEST (or
+--webhook-secret), which must match the app's secret.
+
+429s are counted apart from errors (rate_limited) and left out of req/s and
+the latency percentiles; a non-zero rate_limited means the app was run with
+its limits on.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+# benchmarks.seed's service: hourly slots 06:00-22:00 UTC, 60 days ahead
+BENCH_OPEN_HOURS = (6, 22)
+BENCH_BOOKING_DAYS = 28
+
+
+def bench_service_id(slug: str) -> uuid.UUID:
+    # Same as benchmarks.seed.bench_service_id (not imported: this script needs no app settings)
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"https://bench.invalid/{slug}/service")
+
+
+class Context:
+    """Shared state for scenario functions"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.clubs = [f"bench-club-{i}" for i in range(args.clubs)]
+        self.webhook_secret = args.webhook_secret
+        self.counter = itertools.count()
+
+    def club(self) -> str:
+        return self.clubs[next(self.counter) % len(self.clubs)]
+
+
+Scenario = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+LANDING_PAGES = ["/", "/features", "/about", "/contact", "/beta"]
+
+
+async def landing(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(LANDING_PAGES[next(ctx.counter) % len(LANDING_PAGES)])
+
+
+async def club_dashboard(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(f"/community/{ctx.club()}/")
+
+
+async def members_list(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(f"/community/{ctx.club()}/members")
+
+
+async def member_join(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.post("/api/v1/members/join", json={
+        "club_slug": ctx.club(),
+        "email": f"load-{uuid.uuid4().hex[:12]}@loadtest.test",
+        "first_name": "Load",
+        "last_name": "Test",
+    })
+
+
+def bench_slot(n: int) -> str:
+    """The n-th bookable slot of the seeded service, spread over the next BENCH_BOOKING_DAYS days"""
+    hours = BENCH_OPEN_HOURS[1] - BENCH_OPEN_HOURS[0]
+    tomorrow = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    day, hour = divmod(n % (hours * BENCH_BOOKING_DAYS), hours)
+    return (tomorrow + timedelta(days=day, hours=BENCH_OPEN_HOURS[0] + hour)).isoformat()
+
+
+async def checkout_service(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    n = next(ctx.counter)
+    slug = ctx.clubs[n % len(ctx.clubs)]
+    return await client.post("/stripe/checkout/service", json={
+        "club_slug": slug,
+        "service_id": str(bench_service_id(slug)),
+        "customer_email": f"buyer-{n % 500}@loadtest.test",
+        "customer_name": "Load Test",
+        "booking_datetime": bench_slot(n),
+    })
+
+
+def sign_webhook(payload: bytes, secret: str) -> str:
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+async def webhook_burst(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    event = {
+        "id": f"evt_{uuid.uuid4().hex[:24]}",
+        "object": "event",
+        "type": "checkout.session.completed",
+        "data": {"object": {
+            "id": f"cs_test_{uuid.uuid4().hex[:24]}",
+            "object": "checkout.session",
+            "payment_intent": f"pi_{uuid.uuid4().hex[:24]}",
+            "payment_status": "paid",
+            "amount_total": 7500,
+            "metadata": {"club_slug": ctx.club()},
+        }},
+    }
+    payload = json.dumps(event).encode()
+    return await client.post("/webhooks/stripe", content=payload, headers={
+        "Content-Type": "application/json",
+        "Stripe-Signature": sign_webhook(payload, ctx.webhook_secret),
+    })
+
+
+async def ai_chat(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.post("/api/v1/ai/chat", json={
+        "club_slug": ctx.club(),
+        "message": "When is the next open session?",
+        "chat_history": [],
+    })
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "landing": landing,
+    "club_dashboard": club_dashboard,
+    "members_list": members_list,
+    "member_join": member_join,
+    "checkout_service": checkout_service,
+    "webhook_burst": webhook_burst,
+    "ai_chat": ai_chat,
+}
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+async def run_scenario(name: str, scenario: Scenario, args: argparse.Namespace) -> dict:
+    ctx = Context(args)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits,
+                                 headers={"Accept-Encoding": "gzip, br"}) as client:
+        for _ in range(args.warmup):
+            await scenario(client, ctx)
+
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await scenario(client, ctx)
+                    key = str(response.status_code)
+                except httpx.HTTPError as e:
+                    key = type(e).__name__
+                if key != "429":
+                    latencies.append((time.perf_counter() - started) * 1000)
+                statuses[key] = statuses.get(key, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    requests = sum(statuses.values())
+    rate_limited = statuses.get("429", 0)
+    errors = sum(count for key, count in statuses.items() if not key.startswith(("2", "3", "429")))
+    return {
+        "requests": requests,
+        "rps": round((requests - rate_limited) / elapsed, 1),
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "rate_limited": round(rate_limited / requests, 4) if requests else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "statuses": statuses,
+    }
+
+
+def print_result(name: str, result: dict) -> None:
+    print(f"{name:<18} {result['requests']:>7} req  {result['rps']:>8.1f} req/s  "
+          f"p50 {result['p50_ms']:>8.1f} ms  p90 {result['p90_ms']:>8.1f} ms  p99 {result['p99_ms']:>8.1f} ms  "
+          f"errors {result['error_rate'] * 100:>5.1f}%  429 {result.get('rate_limited', 0) * 100:>5.1f}%  "
+          f"{result['statuses']}")
+
+
+def compare(results: dict, baseline: dict) -> None:
+    print(f"\nvs baseline ({baseline['meta']['created_at']}, concurrency {baseline['meta']['concurrency']}):")
+    for name, result in results.items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            print(f"{name:<18} (no baseline)")
+            continue
+
+        def delta(key):
+            return (result[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+
+        print(f"{name:<18} req/s {delta('rps'):>+7.1f}%   p50 {delta('p50_ms'):>+7.1f}%   p99 {delta('p99_ms'):>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; default: all")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests before each scenario")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--clubs", type=int, default=20, help="bench-club-* slugs created by benchmarks.seed")
+    parser.add_argument("--webhook-secret", default=os.getenv("STRIPE_WEBHOOK_SECRET_TEST", ""))
+    parser.add_argument("--save-baseline", metavar="NAME", help="write results to benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare with benchmarks/baselines/NAME.json")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    if "webhook_burst" in names and not args.webhook_secret:
+        sys.exit("webhook_burst needs --webhook-secret or STRIPE_WEBHOOK_SECRET_TEST")
+
+    results = {}
+    for name in names:
+        results[name] = asyncio.run(run_scenario(name, SCENARIOS[name], args))
+        print_result(name, results[name])
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "base_url": args.base_url,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "clubs": args.clubs,
+        },
+        "scenarios": results,
+    }
+    if args.compare:
+        compare(results, json.loads((BASELINES_DIR / f"{args.compare}.json").read_text()))
+    if args.save_baseline:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        (BASELINES_DIR / f"{args.save_baseline}.json").write_text(json.dumps(report, indent=2))
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
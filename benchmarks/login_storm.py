@@ -0,0 +1,92 @@
+"""Event-loop lag during a login storm.
+
+Runs --logins concurrent bcrypt verifications (what POST /user/login does)
+while a ticker task measures how late a 10ms sleep wakes up - the delay every
+other request on the worker would see. Compares verifying inline on the loop
+with the PasswordHasher process pool.
+
+    python -m benchmarks.login_storm
+    python -m benchmarks.login_storm --logins 200 --workers 4 --json benchmarks/results/login_storm.json
+
+Needs ENCRYPTION_KEY in the environment (.env), like the app itself.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from app.core.password_hashing import PasswordHasher
+from app.core.security import get_password_hash, verify_password
+
+TICK_SECONDS = 0.01
+
+
+async def measure_lag(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+
+
+async def storm(mode: str, logins: int, workers: int, hashed: str) -> dict:
+    hasher = PasswordHasher(workers=workers, max_pending=64)
+    if mode == "pool":
+        hasher.start()
+        await hasher.verify("warm-up", hashed)
+
+    async def login() -> bool:
+        if mode == "inline":
+            ok = verify_password("correct horse", hashed)
+            await asyncio.sleep(0)  # let the ticker see each blocking stretch
+            return ok
+        return await hasher.verify("correct horse", hashed)
+
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    await asyncio.sleep(TICK_SECONDS * 5)  # idle baseline ticks
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    hasher.shutdown()
+
+    assert all(results)
+    lags.sort()
+    return {
+        "logins": logins,
+        "wall_s": round(elapsed, 2),
+        "logins_per_s": round(logins / elapsed, 1),
+        "ticks": len(lags),
+        "lag_p50_ms": round(lags[len(lags) // 2], 2),
+        "lag_p99_ms": round(lags[max(0, int(len(lags) * 0.99) - 1)], 2),
+        "lag_max_ms": round(lags[-1], 2),
+        "lag_mean_ms": round(statistics.fmean(lags), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2, help="pool processes")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    hashed = get_password_hash("correct horse")
+    results = {}
+    for mode in ("inline", "pool"):
+        stats = results[mode] = asyncio.run(storm(mode, args.logins, args.workers, hashed))
+        print(f"{mode:<7} {stats['logins']} logins in {stats['wall_s']:>6.2f}s ({stats['logins_per_s']:>5.1f}/s)  "
+              f"loop lag p50 {stats['lag_p50_ms']:>8.2f} ms  p99 {stats['lag_p99_ms']:>8.2f} ms  "
+              f"max {stats['lag_max_ms']:>8.2f} ms")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Seed a local Postgres with benchmark clubs, members and booking services.
+
+Creates clubs bench-club-0 .. bench-club-{N-1}, each with a fake Stripe
+account id (for stripe-mock), a fake OpenAI key (for benchmarks.fake_openai),
+one booking service open 06:00-22:00 UTC every day (hourly slots, room for
+1000 per slot, so load_test's checkout_service books real slots) and
+--members members. Re-running replaces the previous
+benchmark data; nothing outside the bench-club-* slugs is touched.
+
+    python -m benchmarks.seed --clubs 20 --members 500
+
+Needs DATABASE_URL pointing at a migrated database (alembic upgrade head).
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import time as wall_time
+
+from sqlalchemy import delete, insert, select
+
+from app.db.database import AsyncSessionLocal, engine
+from app.models.booking import AvailabilityRule, BookingService
+from app.models.club import Club
+from app.models.user import ClubMember
+
+SLUG_PREFIX = "bench-club-"
+TIERS = ["free", "basic", "premium", "vip"]
+
+# Opening hours of the bench service, which load_test's checkout_service books into
+OPEN_HOURS = (6, 22)
+
+
+def bench_service_id(slug: str) -> uuid.UUID:
+    """Fixed id of a bench club's service, so load_test can book it without a lookup"""
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"https://bench.invalid/{slug}/service")
+
+
+async def seed(clubs: int, members: int) -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        old_ids = (await db.execute(select(Club.id).where(Club.slug.like(f"{SLUG_PREFIX}%")))).scalars().all()
+        if old_ids:
+            await db.execute(delete(BookingService).where(BookingService.club_id.in_(old_ids)))
+            await db.execute(delete(ClubMember).where(ClubMember.club_id.in_(old_ids)))
+            await db.execute(delete(Club).where(Club.id.in_(old_ids)))
+
+        for i in range(clubs):
+            club = Club(
+                id=uuid.uuid4(),
+                name=f"Bench Club {i}",
+                slug=f"{SLUG_PREFIX}{i}",
+                description="Load test club",
+                stripe_account_id=f"acct_bench{i:06d}",
+                features={"enable_bookings": True, "enable_chat": True, "enable_donations": True},
+            )
+            club.openai_api_key = "sk-bench-fake"
+            db.add(club)
+            await db.flush()
+
+            service = BookingService(
+                id=bench_service_id(club.slug),
+                club_id=club.id,
+                name="Personal Training",
+                description="60 minute session",
+                duration_minutes=60,
+                price=75,
+                is_active=True,
+                min_advance_hours=0,
+                max_advance_days=60,
+                max_participants=1000,
+            )
+            db.add(service)
+            db.add_all([
+                AvailabilityRule(
+                    service_id=service.id,
+                    weekday=weekday,
+                    start_time=wall_time(OPEN_HOURS[0]),
+                    end_time=wall_time(OPEN_HOURS[1]),
+                    timezone="UTC",
+                )
+                for weekday in range(7)
+            ])
+            if members:
+                await db.execute(insert(ClubMember), [
+                    {
+                        "id": uuid.uuid4(),
+                        "club_id": club.id,
+                        "email": f"member{m}@bench-club-{i}.test",
+                        "display_name": f"Member {m}",
+                        "member_tier": TIERS[m % len(TIERS)],
+                        "status": "active",
+                    }
+                    for m in range(members)
+                ])
+        await db.commit()
+    await engine.dispose()
+    print(f"Seeded {clubs} clubs x {members} members in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clubs", type=int, default=20)
+    parser.add_argument("--members", type=int, default=500, help="members per club")
+    args = parser.parse_args()
+    asyncio.run(seed(args.clubs, args.members))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Booking slot contention benchmark.
+
+Fires --attempts concurrent reservations at one slot of capacity --capacity
+and checks that exactly --capacity succeed. Two strategies are compared:
+
+  atomic  AvailabilityService.reserve - one conditional UPDATE ... RETURNING
+  naive   read current_bookings, check it against max_capacity, then write
+          (what a straightforward implementation does); every attempt that
+          passes the check is a customer told "you're booked"
+
+    python -m benchmarks.slot_contention
+    python -m benchmarks.slot_contention --attempts 500 --capacity 10 --rounds 5 --json benchmarks/results/slots.json
+
+Needs DATABASE_URL pointing at a migrated database and the bench clubs from
+benchmarks.seed. Connections come from the app's pool (5 + 10 overflow), so
+attempts beyond that queue for a connection, as requests would.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import AsyncSessionLocal, engine
+from app.models.booking import BookingService, BookingSlot
+from app.models.club import Club
+from app.services.availability_service import AvailabilityService, SlotUnavailable
+
+
+async def make_slot(capacity: int):
+    async with AsyncSessionLocal() as db:
+        club_id = (await db.execute(select(Club.id).where(Club.slug == "bench-club-0"))).scalar_one()
+        service = BookingService(club_id=club_id, name="Contention bench", duration_minutes=60, price=0, max_participants=capacity)
+        db.add(service)
+        await db.flush()
+        await AvailabilityService.create_slots(db, service, [datetime.now(timezone.utc) + timedelta(days=1)], capacity)
+        await db.commit()
+        slot_id = (await db.execute(select(BookingSlot.id).where(BookingSlot.service_id == service.id))).scalar_one()
+        return service.id, slot_id
+
+
+async def atomic_attempt(slot_id) -> str:
+    async with AsyncSessionLocal() as db:
+        try:
+            await AvailabilityService.reserve(db, slot_id)
+            await db.commit()
+            return "booked"
+        except SlotUnavailable:
+            await db.rollback()
+            return "full"
+
+
+async def naive_attempt(slot_id) -> str:
+    async with AsyncSessionLocal() as db:
+        slot = (await db.execute(select(BookingSlot).where(BookingSlot.id == slot_id))).scalar_one()
+        if slot.current_bookings >= slot.max_capacity:
+            return "full"
+        await asyncio.sleep(0)  # whatever the handler does between the check and the write
+        try:
+            await db.execute(
+                update(BookingSlot).where(BookingSlot.id == slot_id)
+                .values(current_bookings=BookingSlot.current_bookings + 1)
+            )
+            await db.commit()
+        except IntegrityError:
+            # ck_booking_slots_capacity caught it - but the customer already passed the check
+            await db.rollback()
+            return "booked_then_rejected"
+        return "booked"
+
+
+async def run_round(strategy: str, attempts: int, capacity: int) -> dict:
+    service_id, slot_id = await make_slot(capacity)
+    attempt = atomic_attempt if strategy == "atomic" else naive_attempt
+    latencies = []
+
+    async def timed():
+        started = time.perf_counter()
+        outcome = await attempt(slot_id)
+        latencies.append((time.perf_counter() - started) * 1000)
+        return outcome
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(timed() for _ in range(attempts)))
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        final = (await db.execute(select(BookingSlot.current_bookings).where(BookingSlot.id == slot_id))).scalar_one()
+        await db.execute(delete(BookingService).where(BookingService.id == service_id))
+        await db.commit()
+
+    told_booked = outcomes.count("booked") + outcomes.count("booked_then_rejected")
+    latencies.sort()
+    return {
+        "told_booked": told_booked,
+        "stored_bookings": final,
+        "overbooked": max(0, told_booked - capacity),
+        "rejected_at_write": outcomes.count("booked_then_rejected"),
+        "attempts_per_s": round(attempts / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p99_ms": round(latencies[max(0, int(len(latencies) * 0.99) - 1)], 2),
+    }
+
+
+async def run(args) -> dict:
+    results = {}
+    for strategy in ("naive", "atomic"):
+        rounds = [await run_round(strategy, args.attempts, args.capacity) for _ in range(args.rounds)]
+        results[strategy] = rounds
+        worst = max(r["overbooked"] for r in rounds)
+        print(f"{strategy:<7} {args.rounds} rounds x {args.attempts} attempts on capacity {args.capacity}: "
+              f"told booked {[r['told_booked'] for r in rounds]}  stored {[r['stored_bookings'] for r in rounds]}  "
+              f"worst overbooking {worst}  p99 {max(r['p99_ms'] for r in rounds):.1f} ms")
+    await engine.dispose()
+    assert all(r["told_booked"] == args.capacity == r["stored_bookings"] for r in results["atomic"]), "atomic strategy overbooked"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=200, help="concurrent reservations per round")
+    parser.add_argument("--capacity", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
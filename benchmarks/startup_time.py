@@ -0,0 +1,91 @@
+"""Worker startup time benchmark.
+
+Measures, in fresh interpreter processes, how long a worker takes to import
+the app and run its startup handlers - i.e. the cost paid on every uvicorn
+worker start, restart and scale-out.
+
+    python -m benchmarks.startup_time                 # schema check path (default)
+    python -m benchmarks.startup_time --create-all    # legacy create_all path, for comparison
+    python -m benchmarks.startup_time --runs 10 --json benchmarks/results/startup.json
+
+Needs the same environment as the app (.env / DATABASE_URL).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Runs inside a fresh interpreter so import caches don't skew the numbers
+CHILD_SCRIPT = """
+import asyncio, json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def run_startup():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(run_startup())
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t2 - t1) * 1000}))
+"""
+
+
+def run_once(create_all: bool) -> dict:
+    env = dict(os.environ)
+    env["DB_CREATE_ALL"] = "true" if create_all else "false"
+    env.setdefault("DEBUG", "false")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # The app prints banners on import; the measurement is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "min": round(min(samples), 1),
+        "median": round(statistics.median(samples), 1),
+        "max": round(max(samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--create-all", action="store_true", help="measure the DB_CREATE_ALL startup path")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once(args.create_all) for _ in range(args.runs)]
+    results = {
+        "mode": "create_all" if args.create_all else "schema_check",
+        "runs": args.runs,
+        "import_ms": summarize([r["import_ms"] for r in runs]),
+        "startup_ms": summarize([r["startup_ms"] for r in runs]),
+        "total_ms": summarize([r["import_ms"] + r["startup_ms"] for r in runs]),
+    }
+
+    print(f"Startup ({results['mode']}, {args.runs} runs)")
+    for key in ("import_ms", "startup_ms", "total_ms"):
+        stats = results[key]
+        print(f"  {key:<11} min {stats['min']:>8} ms  median {stats['median']:>8} ms  max {stats['max']:>8} ms")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
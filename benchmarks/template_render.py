@@ -0,0 +1,210 @@
+"""Template render benchmark for the owner dashboard and members list.
+
+Renders club_dashboard.html and club_members.html with fixed fixture data,
+comparing the development setup (auto-reload: a stat() per render) with the
+production setup (no auto-reload, bytecode cache, precompiled templates).
+The dashboard is measured twice: rendering every panel, and with the
+slow-changing panels already in the fragment cache.
+
+    python -m benchmarks.template_render
+    python -m benchmarks.template_render --iterations 2000 --members 500 --json benchmarks/results/render.json
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from starlette.requests import Request
+
+from app.core.templates import TEMPLATES_DIR
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup
+
+
+def make_request() -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "https",
+        "server": ("ezclub.app", 443),
+        "path": "/community/bench-club/",
+        "query_string": b"",
+        "headers": [(b"host", b"ezclub.app")],
+    })
+
+
+def dashboard_context() -> dict:
+    created = datetime(2025, 1, 15, 9, 30)
+    return {
+        "request": make_request(),
+        "club": {
+            "id": str(uuid.uuid4()),
+            "name": "Bench Club",
+            "slug": "bench-club",
+            "description": "A vibrant community for passionate members",
+            "primary_color": "#0075c4",
+            "secondary_color": "#0267C1",
+            "logo_url": None,
+            "features": {"enable_bookings": True, "enable_chat": True, "enable_donations": True},
+            "enable_bookings": True,
+            "enable_chat": True,
+            "enable_ai": False,
+            "enable_donations": True,
+            "subscription_status": "active",
+            "subscription_plan": "premium",
+            "created_at": created,
+        },
+        "owner": {"username": "ClubOwner", "avatar_url": None},
+        "total_members": 1250,
+        "active_members": 870,
+        "total_revenue": 18450,
+        "unread_notifications": 3,
+        "recent_messages": 12,
+        "avg_session_time": "4m 32s",
+        "new_members_this_month": 64,
+        "conversion_rate": 69.6,
+        "revenue_chart_labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+        "revenue_chart_data": [1200, 1900, 3000, 5000, 2000, 18450],
+        "current_time": "10:30 AM",
+    }
+
+
+# Panel template -> the context it is rendered with (see club_dashboard in app/routes/web.py)
+def dashboard_panels(club: dict) -> dict:
+    return {
+        "dashboard_tiers_panel.html": {"membership_tiers": [
+            {"name": "Basic", "price": 29, "interval": "month", "member_count": 875, "percentage": 70},
+            {"name": "Premium", "price": 59, "interval": "month", "member_count": 312, "percentage": 25},
+            {"name": "VIP", "price": 99, "interval": "month", "member_count": 63, "percentage": 5},
+        ]},
+        "dashboard_activity_panel.html": {"recent_activities": [
+            {"icon": "fa-user-plus", "description": f"Member {i} joined", "timestamp": "Today", "amount": None}
+            for i in range(2)
+        ]},
+        "dashboard_bookings_panel.html": {"club": club, "upcoming_bookings": [
+            {"member_name": f"Member {i}", "service_name": "Personal Training",
+             "date_time": "March 03, 10:00 AM", "amount": 75}
+            for i in range(5)
+        ]},
+        "dashboard_members_panel.html": {"recent_members": [
+            {"name": f"Member {i}", "avatar_url": None, "joined_date": "March 01, 2025", "tier": "premium"}
+            for i in range(5)
+        ]},
+        "dashboard_notifications_panel.html": {"notifications": [
+            {"icon": "fa-bell", "message": "Dashboard loaded", "timestamp": "Now"}
+            for _ in range(3)
+        ]},
+    }
+
+
+def render_dashboard(env: Environment, context: dict, cached_fragments: Optional[dict] = None) -> str:
+    fragments = cached_fragments
+    if fragments is None:
+        fragments = {
+            name.removeprefix("dashboard_").removesuffix("_panel.html"): Markup(env.get_template(name).render(panel))
+            for name, panel in dashboard_panels(context["club"]).items()
+        }
+    return env.get_template("club_dashboard.html").render({**context, "fragments": fragments})
+
+
+def members_context(member_count: int) -> dict:
+    tiers = ["free", "basic", "premium", "vip"]
+    joined = datetime(2025, 1, 1)
+    members = []
+    for i in range(member_count):
+        created_at = joined + timedelta(hours=i)
+        members.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            email=f"member{i}@example.com",
+            display_name=f"Member {i}",
+            phone=None,
+            member_tier=tiers[i % len(tiers)],
+            status="active",
+            created_at=created_at,
+            formatted_joined_date=created_at.strftime("%b %d, %Y"),
+            formatted_joined_month=created_at.strftime("%B %Y"),
+        ))
+    by_tier = {tier: [m for m in members if m.member_tier == tier] for tier in tiers}
+    return {
+        "request": make_request(),
+        "club": SimpleNamespace(name="Bench Club", slug="bench-club", primary_color="#0075c4", secondary_color="#0267C1"),
+        "members": members,
+        "members_by_tier": by_tier,
+        "total_members": member_count,
+        "active_members": member_count,
+        "free_count": len(by_tier["free"]),
+        "basic_count": len(by_tier["basic"]),
+        "premium_count": len(by_tier["premium"]),
+        "vip_count": len(by_tier["vip"]),
+    }
+
+
+def make_env(production: bool) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=not production,
+        bytecode_cache=FileSystemBytecodeCache() if production else None,
+    )
+
+
+def bench(render: Callable[[], str], iterations: int) -> dict:
+    started = time.perf_counter()
+    render()
+    first_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "first_render_ms": round(first_ms, 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--members", type=int, default=200, help="members rendered on club_members.html")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    dashboard = dashboard_context()
+    members = members_context(args.members)
+    results = {}
+    for mode in ("development", "production"):
+        env = make_env(production=mode == "production")
+        # Rendered once up front, as a warm fragment cache would hold them
+        cached_fragments = {
+            name.removeprefix("dashboard_").removesuffix("_panel.html"): Markup(env.get_template(name).render(panel))
+            for name, panel in dashboard_panels(dashboard["club"]).items()
+        }
+        cases = {
+            # get_template on every render, like TemplateResponse does
+            "club_dashboard.html": lambda: render_dashboard(env, dashboard),
+            "club_dashboard.html (fragments cached)": lambda: render_dashboard(env, dashboard, cached_fragments),
+            "club_members.html": lambda: env.get_template("club_members.html").render(members),
+        }
+        for name, render in cases.items():
+            stats = bench(render, args.iterations)
+            results[f"{name} [{mode}]"] = stats
+            print(f"{name:<40} {mode:<12} first {stats['first_render_ms']:>8.3f} ms  "
+                  f"mean {stats['mean_ms']:>7.3f} ms  p50 {stats['p50_ms']:>7.3f} ms  p95 {stats['p95_ms']:>7.3f} ms")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
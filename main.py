@@ -1,8 +1,12 @@
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
-from app.db.database import init_db
+from app.core.config import settings
+from app.db.database import init_db, check_schema_revision
+from app.core.invalidation import invalidation_bus
+from app.core.password_hashing import password_hasher
+from app.services.slot_hold_service import hold_sweeper
+from app.services.chat_hub import chat_bus
 import uvicorn
 
 # Create FastAPI app
@@ -12,14 +16,46 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Compress HTML/JSON/CSV responses (gzip, or brotli when installed)
+if settings.COMPRESSION_ENABLED:
+    from app.middleware.compression import CompressionMiddleware
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Per-route latency, status and DB query metrics, scraped at /metrics
+if settings.METRICS_ENABLED:
+    from app.db.database import engine
+    from app.middleware.metrics import MetricsMiddleware, instrument_engine
+    instrument_engine(engine.sync_engine)
+    app.add_middleware(MetricsMiddleware)
+
+# Per-request query budgets and N+1 detection (logs in dev, off in production by default)
+from app.db.query_budget import budget_mode
+if budget_mode() != "off":
+    from app.db.database import engine
+    from app.db.query_budget import install_query_tracking
+    from app.middleware.query_budget import QueryBudgetMiddleware
+    install_query_tracking(engine.sync_engine)
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Resolve custom domains / club subdomains to /community/{slug} from an in-memory index
+if settings.TENANT_ROUTING_ENABLED:
+    from app.middleware.tenant import TenantMiddleware
+    from app.services.tenant_index import tenant_index
+    app.add_middleware(TenantMiddleware, index=tenant_index)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Setup templates
-templates = Jinja2Templates(directory="templates")
+# Shared templates environment
+from app.core.templates import templates, warm_templates
 
 # Include routes
-from app.routes import web, api, ai, admin, users, contact
+from app.routes import web, api, ai, admin, users, contact, chat
 # NEW: Stripe routes
 from app.routes import stripe_connect, stripe_payments, stripe_webhooks
 
@@ -46,10 +82,47 @@ app.include_router(stripe_webhooks.router)
 # Contact form router
 app.include_router(contact.router)
 
+# Community chat sockets
+app.include_router(chat.router)
+
+# Prometheus metrics
+if settings.METRICS_ENABLED:
+    from app.routes import metrics
+    app.include_router(metrics.router)
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    await init_db()
+    """Verify the database schema (or create tables in dev) and precompile templates"""
+    # Fork the bcrypt workers before any DB connections or background tasks exist
+    password_hasher.start()
+    warm_templates()
+    
+    if settings.DB_CREATE_ALL:
+        await init_db()
+    elif settings.DB_SCHEMA_CHECK:
+        await check_schema_revision()
+    
+    if settings.INVALIDATION_BUS_ENABLED:
+        invalidation_bus.start()
+        chat_bus.start()
+    
+    if settings.TENANT_ROUTING_ENABLED:
+        tenant_index.start()
+    
+    hold_sweeper.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    password_hasher.shutdown()
+    await hold_sweeper.stop()
+    
+    if settings.TENANT_ROUTING_ENABLED:
+        await tenant_index.stop()
+    
+    if settings.INVALIDATION_BUS_ENABLED:
+        await chat_bus.stop()
+        await invalidation_bus.stop()
 
 @app.get("/health")
 async def health_check():
@@ -12,6 +12,8 @@ source venv/bin/activate
 # Set environment variables
 export PYTHONPATH=/home/adminuser/mymain
 export ENVIRONMENT=production
+# Booking catalogs live in Postgres, so workers no longer need to share memory
+export WEB_CONCURRENCY=${WEB_CONCURRENCY:-2}
 
 # Start the application
-exec uvicorn main:app --host 0.0.0.0 --port 8000 --workers 1
+exec uvicorn main:app --host 0.0.0.0 --port 8000 --workers $WEB_CONCURRENCY